@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Measure batch planning throughput (queries per second) against the number of worker processes."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from src.batch_planning import plan_many
+from src.world import World
+
+def main():
+    config = Config()
+    world = World.load(config.WORLD_FILE)
+    config.MAP_SIZE = world.size
+    obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+    rng = np.random.default_rng(0)
+    free = np.argwhere(obstacle_map == 0)
+    # Short trips around the start keep a single query in the millisecond range
+    starts = free[rng.integers(len(free), size=256)]
+    goals = np.clip(starts + rng.integers(-40, 41, size=starts.shape), 0, np.array(world.size) - 1)
+    reachable = obstacle_map[goals[:, 0], goals[:, 1]] == 0
+    starts, goals = starts[reachable][:64], goals[reachable][:64]
+    queries = [(tuple(map(int, s)), tuple(map(int, g))) for s, g in zip(starts, goals)]
+
+    print(f"{os.cpu_count()} CPUs, {len(queries)} queries")
+    print(f"{'workers':>8} {'queries/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in [1, 2, 4, 8]:
+        start = time.perf_counter()
+        found = sum(1 for _, path in plan_many(queries, obstacle_map, config, workers=workers) if path)
+        rate = len(queries) / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.1f} {rate / baseline:>8.2f}  ({found} paths)")
+
+if __name__ == "__main__":
+    main()
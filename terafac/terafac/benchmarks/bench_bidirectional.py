@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Compare expansions and runtime of unidirectional and bidirectional A* on long queries."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from src.anytime_planning import AnytimePlanner
+from src.bidirectional_search import BidirectionalPlanner
+from src.grid_search import GridGraph
+from src.path_planning import PathPlanner
+from src.world import World
+from src.world_generator import maze
+
+def timed(plan):
+    start = time.perf_counter()
+    path = plan()
+    return path, time.perf_counter() - start
+
+def main():
+    config = Config()
+    config.ANYTIME_INITIAL_EPSILON = 1.0  # Plain A* on the same array-backed state
+    cases = [
+        ("default corners", World.load(config.WORLD_FILE), (50, 50), (750, 550)),
+        ("default sides", World.load(config.WORLD_FILE), (30, 300), (770, 300)),
+        ("maze seed 1", maze((800, 600), seed=1), (26, 26), (770, 570)),
+        ("maze seed 2", maze((800, 600), seed=2), (26, 26), (770, 570)),
+    ]
+    print(f"{'case':>16} {'astar exp':>10} {'astar s':>8} {'array exp':>10} {'array s':>8} {'bidir exp':>10} {'bidir s':>8}")
+    for name, world, start, goal in cases:
+        config.MAP_SIZE = world.size
+        obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+        graph = GridGraph(obstacle_map, config.DIAGONAL_MOVEMENT)
+
+        original = PathPlanner(config)
+        _, original_time = timed(lambda: original.plan_path_astar(start, goal, obstacle_map))
+        unidirectional = AnytimePlanner(config)
+        _, array_time = timed(lambda: unidirectional.plan(start, goal, obstacle_map, graph=graph))
+        bidirectional = BidirectionalPlanner(config)
+        _, bidir_time = timed(lambda: bidirectional.plan(start, goal, obstacle_map, graph))
+        print(f"{name:>16} {original.last_expansions:>10} {original_time:>8.2f} "
+              f"{unidirectional.last_expansions:>10} {array_time:>8.2f} "
+              f"{bidirectional.last_expansions:>10} {bidir_time:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Measure multi-robot planning time and makespan as the number of robots grows."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from src.multi_robot import MultiRobotPlanner, makespan
+from src.tour_planning import downsample
+from src.world import World
+
+def random_cells(blocked, count, rng, resolution):
+    """Distinct free cells, returned as pixel centers."""
+    free = np.argwhere(~blocked)
+    chosen = free[rng.choice(len(free), size=count, replace=False)]
+    return [(int(x) * resolution + resolution // 2, int(y) * resolution + resolution // 2) for x, y in chosen]
+
+def main():
+    config = Config()
+    world = World.load(config.WORLD_FILE)
+    obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8), inflate=config.ROBOT_RADIUS)
+    blocked = downsample(obstacle_map, config.MULTI_ROBOT_RESOLUTION)
+    planner = MultiRobotPlanner(config)
+    rng = np.random.default_rng(0)
+
+    print(f"{'robots':>7} {'method':>12} {'time s':>8} {'makespan':>9} {'sum cost':>9}")
+    for count in [2, 4, 8, 16, 32]:
+        starts = random_cells(blocked, count, rng, config.MULTI_ROBOT_RESOLUTION)
+        goals = random_cells(blocked, count, rng, config.MULTI_ROBOT_RESOLUTION)
+        methods = ["prioritized", "cbs"] if count <= 8 else ["prioritized"]
+        for method in methods:
+            start = time.perf_counter()
+            paths = planner.plan(starts, goals, obstacle_map, method)
+            elapsed = time.perf_counter() - start
+            if paths is None:
+                print(f"{count:>7} {method:>12} {elapsed:>8.2f} {'failed':>9}")
+                continue
+            print(f"{count:>7} {method:>12} {elapsed:>8.2f} {makespan(paths):>9} {sum(len(p) - 1 for p in paths):>9}")
+
+if __name__ == "__main__":
+    main()
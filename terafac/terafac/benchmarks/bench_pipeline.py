@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Compare steps per second of the serial and pipelined navigation loops.
+
+Requires a running simulator (python simulator.py).
+"""
+import os
+import sys
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.autonomous_robot import AutonomousRobot
+
+def run_mode(pipelined, max_steps):
+    """Run one navigation episode from the reset position and return steps per second."""
+    robot = AutonomousRobot()
+    requests.post(f"{robot.config.SIMULATOR_URL}/reset", timeout=5)
+    robot.goal_position = (robot.config.GOAL_MARGIN, robot.config.GOAL_MARGIN)
+    if pipelined:
+        robot.navigate_to_goal_pipelined(max_steps=max_steps)
+    else:
+        robot.navigate_to_goal(max_steps=max_steps)
+    return robot.instrumentation.snapshot()["histograms"]["steps_per_second"]["mean"]
+
+def main():
+    max_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    serial = run_mode(False, max_steps)
+    pipelined = run_mode(True, max_steps)
+    print(f"serial:    {serial:.2f} steps/s")
+    print(f"pipelined: {pipelined:.2f} steps/s ({pipelined / serial:.2f}x)" if serial else f"pipelined: {pipelined:.2f} steps/s")
+
+if __name__ == "__main__":
+    main()
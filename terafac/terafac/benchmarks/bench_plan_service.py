@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Measure /plan throughput and tail latency under concurrent clients, against per-client planners."""
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulator
+from src.instrumentation import HdrHistogram
+from src.visibility_graph import VisibilityGraphPlanner
+
+def free_points(count, rng):
+    """Random points that are clear of the grown obstacles."""
+    points = []
+    while len(points) < count:
+        x, y = (int(v) for v in rng.integers(30, 770, size=2))
+        y = min(y, 570)
+        if not any(ox - 10 <= x <= ox + w + 10 and oy - 10 <= y <= oy + h + 10
+                   for ox, oy, w, h in simulator.obstacle_array):
+            points.append({"x": x, "y": y})
+    return points
+
+def make_routes(clients, requests, hot_routes, hot_share, rng):
+    """Per client, a list of routes: `hot_share` of them drawn from a small shared set."""
+    points = free_points(2 * hot_routes + 2 * clients * requests, rng)
+    hot = [(points[2 * i], points[2 * i + 1]) for i in range(hot_routes)]
+    cold = iter(points[2 * hot_routes:])
+    return [[hot[rng.integers(hot_routes)] if rng.random() < hot_share else (next(cold), next(cold))
+             for _ in range(requests)] for _ in range(clients)]
+
+def run_clients(routes, max_pending):
+    """Send every client's routes to /plan from its own thread; returns (seconds, histogram, status counts)."""
+    simulator.plan_service.clear()
+    simulator.plan_service.max_pending = max_pending
+    latency = HdrHistogram()
+    status = {}
+    lock = threading.Lock()
+
+    def client(client_routes):
+        http = simulator.app.test_client()
+        for start, end in client_routes:
+            t0 = time.perf_counter()
+            code = http.post('/plan', json={"start": start, "end": end}).status_code
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latency.record(elapsed)
+                status[code] = status.get(code, 0) + 1
+
+    threads = [threading.Thread(target=client, args=(r,)) for r in routes]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latency, status
+
+def main():
+    rng = np.random.default_rng(0)
+
+    # What every thin client pays today before its first query
+    start = time.perf_counter()
+    planner = VisibilityGraphPlanner.from_world(simulator.world, inflate=simulator.ROBOT_SIZE, border=20)
+    planner.adjacency()
+    build = time.perf_counter() - start
+    size = planner.blocking.nbytes + planner.adjacency().nbytes
+    print(f"per-client planner build: {1e3 * build:.1f} ms, {size / 1024:.0f} KiB of visibility matrices")
+
+    print(f"{'clients':>7} {'hot':>5} {'queue':>5} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'p999 ms':>8} {'hits':>6} {'joined':>6} {'429':>5}")
+    for clients, hot_share, max_pending in [(1, 0.0, 32), (8, 0.0, 32), (8, 0.8, 32),
+                                            (32, 0.8, 32), (32, 0.0, 4)]:
+        routes = make_routes(clients, 50, hot_routes=16, hot_share=hot_share, rng=rng)
+        before = dict(simulator.plan_service.stats)
+        elapsed, latency, status = run_clients(routes, max_pending)
+        stats = {k: v - before[k] for k, v in simulator.plan_service.stats.items()}
+        summary = latency.summary()
+        print(f"{clients:>7} {hot_share:>5.1f} {max_pending:>5} {summary['count'] / elapsed:>8.0f} "
+              f"{1e3 * summary['p50']:>7.2f} {1e3 * summary['p99']:>7.2f} {1e3 * summary['p999']:>8.2f} "
+              f"{stats['cache_hits']:>6} {stats['coalesced']:>6} {status.get(429, 0):>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare roadmap (PRM), visibility-graph and grid A* query latency on generated worlds.
+
+"prm ms" is a query the PRM has not seen before. "cached ms" repeats the
+same (start, goal) pairs, which the PRM answers from its result cache.
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from src.path_planning import PathPlanner
+from src.prm import PRMPlanner
+from src.visibility_graph import VisibilityGraphPlanner
+from src.world import World
+from src.world_generator import random_rectangles
+
+def random_free_cells(obstacle_map, count, rng):
+    """Pick random free cells of a map."""
+    free = np.argwhere(obstacle_map == 0)
+    return [tuple(int(v) for v in free[i]) for i in rng.integers(len(free), size=count)]
+
+def main():
+    config = Config()
+    rng = np.random.default_rng(0)
+    worlds = {
+        "default": World.load(config.WORLD_FILE),
+        "random 2000x1500": random_rectangles((2000, 1500), 150, seed=0),
+    }
+    print(f"{'world':>18} {'build s':>8} {'prm ms':>8} {'cached ms':>10} {'vis build s':>12} {'vis ms':>8} {'astar ms':>9}")
+    for name, world in worlds.items():
+        config.MAP_SIZE = world.size
+        obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+        queries = list(zip(random_free_cells(obstacle_map, 20, rng), random_free_cells(obstacle_map, 20, rng)))
+
+        prm = PRMPlanner(config)
+        start = time.perf_counter()
+        prm.build(obstacle_map)
+        build = time.perf_counter() - start
+
+        # Distinct pairs, each one a result cache miss
+        start = time.perf_counter()
+        for a, b in queries:
+            prm.plan(a, b, obstacle_map)
+        first = (time.perf_counter() - start) / len(queries)
+        # The same pairs again, all answered from the result cache
+        start = time.perf_counter()
+        for a, b in queries:
+            prm.plan(a, b, obstacle_map)
+        repeat = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        visibility = VisibilityGraphPlanner.from_world(world, config.ROBOT_RADIUS)
+        vis_build = time.perf_counter() - start
+        start = time.perf_counter()
+        for a, b in queries:
+            visibility.plan(a, b)
+        vis = (time.perf_counter() - start) / len(queries)
+
+        astar = PathPlanner(config)
+        start = time.perf_counter()
+        for a, b in queries[:3]:
+            astar.plan_path_astar(a, b, obstacle_map)
+        grid = (time.perf_counter() - start) / 3
+        print(f"{name:>18} {build:>8.2f} {first * 1000:>8.2f} {repeat * 1000:>10.4f} "
+              f"{vis_build:>12.2f} {vis * 1000:>8.2f} {grid * 1000:>9.1f}")
+    print("cached ms applies only to repeated (start, goal) pairs; new queries cost prm ms")
+
+if __name__ == "__main__":
+    main()
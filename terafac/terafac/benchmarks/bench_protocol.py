@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare JSON and binary control messages: encode/decode cost, bytes per message and request time."""
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import protocol
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+STATE = {"x": 412.37, "y": 287.5, "orientation": -45, "moving": True}
+MOVE = {"dx": 12.5, "dy": -7.25}
+
+def codecs():
+    """(name, encode move, decode move, encode pose result, decode pose result) per encoding."""
+    result = {"success": True, "position": STATE}
+    yield ("json",
+           lambda: json.dumps(MOVE).encode(), lambda data: json.loads(data),
+           lambda: json.dumps(result).encode(), lambda data: json.loads(data))
+    if msgpack is not None:
+        yield ("msgpack",
+               lambda: msgpack.packb(MOVE), lambda data: msgpack.unpackb(data),
+               lambda: msgpack.packb(result), lambda data: msgpack.unpackb(data))
+    yield ("struct",
+           lambda: protocol.encode_move(MOVE["dx"], MOVE["dy"]), protocol.decode_move,
+           lambda: protocol.encode_move_result(True, STATE), protocol.decode_move_result)
+
+def per_call(function, number=100000):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+def main():
+    print(f"{'encoding':>8} {'move B':>7} {'result B':>9} {'enc us':>7} {'dec us':>7}")
+    for name, encode_move, decode_move, encode_result, decode_result in codecs():
+        move, result = encode_move(), encode_result()
+        encode_time = per_call(encode_move) + per_call(encode_result)
+        decode_time = per_call(lambda: decode_move(move)) + per_call(lambda: decode_result(result))
+        print(f"{name:>8} {len(move):>7} {len(result):>9} {1e6 * encode_time:>7.2f} {1e6 * decode_time:>7.2f}")
+    if msgpack is None:
+        print("(msgpack is not installed)")
+
+    # Whole /move_rel requests through the Flask app, without the network
+    import simulator
+    client = simulator.app.test_client()
+    binary_headers = {"Content-Type": protocol.BINARY_MIME, "Accept": protocol.BINARY_MIME}
+    requests = 2000
+    for name, send in (
+        ("json", lambda i: client.post('/move_rel', json={"dx": 1 - 2 * (i % 2), "dy": 0}).get_json()),
+        ("struct", lambda i: protocol.decode_move_result(
+            client.post('/move_rel', data=protocol.encode_move(1 - 2 * (i % 2), 0), headers=binary_headers).data)),
+    ):
+        client.post('/reset')
+        start = time.perf_counter()
+        for i in range(requests):
+            send(i)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8} /move_rel: {1e6 * elapsed / requests:.1f} us per request")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded navigation episode against the current planner and vision code.
+
+Record an episode with a running simulator:
+    ROBOT_RECORD_PATH=episode.log python src/autonomous_robot.py
+then time the robot's own stages without network or sleeps:
+    python benchmarks/bench_replay.py episode.log
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.autonomous_robot import AutonomousRobot
+from src.transport import ReplayExhausted, ReplayTransport
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+    random.seed(0)  # Same goal corner and escape moves on every run
+    robot = AutonomousRobot()
+    robot.robot_controller.transport = ReplayTransport(sys.argv[1])
+    started = time.perf_counter()
+    try:
+        robot.navigate_to_goal()
+    except ReplayExhausted as e:
+        print(f"Episode ended: {e}")
+    elapsed = time.perf_counter() - started
+
+    print(f"Replayed in {elapsed:.3f} s")
+    print(f"{'stage':>12} {'count':>7} {'mean ms':>9} {'p90 ms':>9} {'total ms':>9}")
+    for name, summary in sorted(robot.instrumentation.snapshot()["histograms"].items()):
+        if name in ("steps_per_second", "plan_expansions"):
+            continue  # Not durations
+        print(f"{name:>12} {summary['count']:>7} {1000 * summary['mean']:>9.3f} "
+              f"{1000 * summary['p90']:>9.3f} {1000 * summary['sum']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
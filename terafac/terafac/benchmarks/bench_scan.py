@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Measure ray-casting throughput (rays per second) as the obstacle count grows."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.raycast import cast_rays, ray_angles
+
+def random_rects(count, size, rng):
+    """Generate random rectangles inside a map of the given size."""
+    xy = rng.uniform(0, 1, (count, 2)) * np.array(size)
+    wh = rng.uniform(5, 40, (count, 2))
+    return np.hstack([xy, wh])
+
+def main():
+    rng = np.random.default_rng(0)
+    size = (800, 600)
+    angles = ray_angles(360)
+    print(f"{'obstacles':>10} {'rays/s':>14} {'scan ms':>10}")
+    for count in [10, 21, 100, 1000, 10000]:
+        rects = random_rects(count, size, rng)
+        repeats = max(5, 20000 // count)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            cast_rays((400, 300), angles, rects, 300.0, size)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{count:>10} {len(angles) / elapsed:>14,.0f} {elapsed * 1000:>10.3f}")
+
+if __name__ == "__main__":
+    main()
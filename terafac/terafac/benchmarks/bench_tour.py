@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Measure distance-matrix and tour planning time as the number of goals grows."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from src.tour_planning import TourPlanner, nearest_neighbor_tour, tour_length, two_opt
+from src.world import World
+
+def main():
+    config = Config()
+    world = World.load(config.WORLD_FILE)
+    obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8), inflate=config.ROBOT_RADIUS)
+    free = np.argwhere(obstacle_map == 0)
+    rng = np.random.default_rng(0)
+    planner = TourPlanner(config)
+
+    print(f"resolution {config.TOUR_RESOLUTION} px")
+    print(f"{'goals':>6} {'matrix s':>9} {'order ms':>9} {'greedy':>9} {'2-opt':>9}")
+    for count in [5, 10, 25, 50, 100, 200]:
+        goals = [tuple(int(v) for v in free[i]) for i in rng.integers(len(free), size=count)]
+        points = [world.start] + goals
+        start = time.perf_counter()
+        matrix, _ = planner.distance_matrix(points, obstacle_map)
+        matrix_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        greedy = nearest_neighbor_tour(matrix)
+        improved = two_opt(greedy, matrix)
+        order_time = time.perf_counter() - start
+        print(f"{count:>6} {matrix_time:>9.2f} {order_time * 1000:>9.1f} "
+              f"{tour_length(greedy, matrix):>9.0f} {tour_length(improved, matrix):>9.0f}")
+
+if __name__ == "__main__":
+    main()
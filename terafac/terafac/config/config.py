@@ -1,11 +1,16 @@
 import os
 
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Config:
     # Simulator settings
     SIMULATOR_URL = os.getenv("SIMULATOR_URL", "http://localhost:5000")
+    ROBOT_RECORD_PATH = os.getenv("ROBOT_RECORD_PATH")  # Log every simulator exchange here, None to disable
+    ROBOT_REPLAY_PATH = os.getenv("ROBOT_REPLAY_PATH")  # Serve responses from this log instead of the simulator
 
     # Map settings
-    MAP_SIZE = (800, 600)  # (width, height)
+    MAP_SIZE = (800, 600)  # (width, height), replaced by the loaded world's size
+    WORLD_FILE = os.getenv("WORLD_FILE", os.path.join(_PROJECT_ROOT, "worlds", "default.json"))
 
     # Robot settings
     GOAL_MARGIN = 100  # Distance from the corner when setting the goal
@@ -19,3 +24,72 @@ class Config:
 
     # Path planning settings
     DIAGONAL_MOVEMENT = True  # Allow diagonal movement in A*
+    PLANNING_RESOLUTION = int(os.getenv("PLANNING_RESOLUTION", "1"))  # Pixels per grid planner cell
+    GOAL_TOLERANCE = 10  # A blocked start or goal snaps to a free cell within this many pixels
+    PLANNER_MODE = os.getenv("PLANNER_MODE", "astar")  # "astar", "bidirectional", "anytime", "prm" or "visibility"
+
+    # Anytime (ARA*) settings
+    PLANNING_TIME_BUDGET = 0.05  # Seconds a plan may keep improving per control step
+    ANYTIME_INITIAL_EPSILON = 3.0  # Heuristic inflation of the first, quickest path
+    ANYTIME_EPSILON_STEP = 0.5  # Inflation removed after each improvement
+
+    # Roadmap (PRM) settings
+    PRM_SAMPLES = 2000  # Free-space points sampled for the roadmap
+    PRM_NEIGHBORS = 10  # Nearest neighbors each point tries to connect to
+    PRM_CONNECTION_RADIUS = 120  # Longest roadmap edge in pixels
+    PRM_SEED = 0  # Sampling seed, so a world always gets the same roadmap
+    PRM_QUERY_CACHE_SIZE = 256  # Recent start/goal queries answered from memory
+
+    # Multi-goal tour settings
+    TOUR_RESOLUTION = 5  # Pixels per cell of the grid used for the distance matrix
+
+    # Multi-robot settings
+    MULTI_ROBOT_RESOLUTION = 20  # Pixels per cell; at least the robot diameter so robots in different cells never touch
+    MULTI_ROBOT_MAX_TIME = 600  # Time steps a single robot's plan may take
+    CBS_MAX_NODES = 2000  # Conflict-based search gives up after this many nodes
+
+    # Instrumentation settings
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1") == "1"
+    METRICS_WINDOW = 1024  # Number of recent samples kept per histogram
+    METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH")  # .json or .prom, None to disable
+    PROFILE_PLANNER = os.getenv("PROFILE_PLANNER", "0") == "1"  # Sample the planner's stack
+    PROFILE_INTERVAL = 0.001  # Seconds between profiler samples
+
+    # Pipelining settings
+    PIPELINED_NAVIGATION = os.getenv("PIPELINED_NAVIGATION", "0") == "1"  # Overlap sense, plan and act
+
+    # Path following settings
+    PATH_FOLLOWING = os.getenv("PATH_FOLLOWING", "0") == "1"  # Keep the plan and replan only on demand
+    REPLAN_DEVIATION_TOLERANCE = 15  # Replan when the robot is further than this from its path
+
+    # Adaptive step settings
+    ADAPTIVE_STEP_SIZE = os.getenv("ADAPTIVE_STEP_SIZE", "0") == "1"  # Size moves by clearance (path following only)
+    ROBOT_RADIUS = 8  # Matches the simulator's robot size
+    MIN_STEP_SIZE = 10  # Shortest move, used right next to obstacles
+    MAX_STEP_SIZE = 80  # Longest move, used in open space
+    CLEARANCE_STEP_GAIN = 2.0  # Step length per pixel of free space around the robot
+    PATH_STRAIGHTNESS = 0.97  # Minimum straight-line / along-path distance ratio for a single move
+
+    # Artifact cache settings; opt-in because the cache writes under the user's home directory
+    ARTIFACT_CACHE_ENABLED = os.getenv("ARTIFACT_CACHE_ENABLED", "0") == "1"
+    ARTIFACT_CACHE_DIR = os.getenv(
+        "ARTIFACT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "terafac", "artifacts")
+    )
+    ARTIFACT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used artifacts are evicted beyond this
+
+    # Dynamic world settings
+    DYNAMIC_WORLD = os.getenv("DYNAMIC_WORLD", "0") == "1"  # Follow the simulator's obstacle change feed
+    WORLD_SYNC_STEPS = 10  # Navigation steps between change feed reads
+
+    # Occupancy grid settings
+    TILED_OCCUPANCY_GRID = os.getenv("TILED_OCCUPANCY_GRID", "0") == "1"  # Bit-packed tiles instead of a dense array
+    OCCUPANCY_TILE_SIZE = 64  # Cells per tile side, multiple of 8
+
+    # Probabilistic mapping settings
+    PROBABILISTIC_MAPPING = os.getenv("PROBABILISTIC_MAPPING", "0") == "1"  # Fuse frames into a log-odds map
+    CAMERA_VIEW_RADIUS = 150  # Half-size of the square window observed per frame
+    LOG_ODDS_HIT = 0.85  # Added to cells observed as occupied
+    LOG_ODDS_MISS = -0.4  # Added to cells observed as free
+    LOG_ODDS_MIN = -2.0  # Clamp so cells can change state again quickly
+    LOG_ODDS_MAX = 3.5
+    LOG_ODDS_THRESHOLD = 0.0  # Cells above this are occupied in the binary view
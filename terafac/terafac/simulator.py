@@ -4,18 +4,33 @@ Simple Robot Simulator with Web UI
 Provides HTTP endpoints for robot control and a web interface to visualize the robot.
 """
 
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, jsonify, request, render_template_string, g
 import json
 import threading
 import time
 import math
 
+from src.instrumentation import HdrHistogram
+from src.navigation_jobs import NavigationJobManager
+from src.plan_service import Overloaded, PlanService
+from src.protocol import BINARY_MIME, decode_move, encode_move_result, encode_pose
+from src.raycast import cast_rays, ray_angles
+from src.trajectory import TRAJECTORY_DTYPE, TrajectoryRecorder, to_npy
+from src.visibility_graph import VisibilityGraphPlanner
+from src.world import World
+from config.config import Config
+
 app = Flask(__name__)
 
+# Map and obstacles, loaded from a world file (see worlds/ and src/world_generator.py)
+world = World.load(Config.WORLD_FILE)
+MAP_SIZE = world.size
+obstacles = world.obstacles
+
 # Robot state
 robot_state = {
-    "x": 400,
-    "y": 300,
+    "x": world.start[0],
+    "y": world.start[1],
     "orientation": 0,
     "moving": False
 }
@@ -24,50 +39,121 @@ robot_state = {
 navigation_state = {
     "start_point": None,
     "end_point": None,
-    "is_navigating": False,
     "path": []
 }
 
-# Map and obstacles - redesigned with better spacing for robot navigation
-MAP_SIZE = (800, 600)
-obstacles = [
-    # Top row - with gaps
-    {"x": 100, "y": 80, "width": 50, "height": 60},
-    {"x": 200, "y": 80, "width": 50, "height": 60},
-    {"x": 300, "y": 80, "width": 50, "height": 60},
-    {"x": 450, "y": 80, "width": 50, "height": 60},
-    {"x": 550, "y": 80, "width": 50, "height": 60},
-    {"x": 650, "y": 80, "width": 50, "height": 60},
-
-    # Middle-left section
-    {"x": 80, "y": 200, "width": 60, "height": 50},
-    {"x": 80, "y": 300, "width": 60, "height": 50},
-
-    # Center obstacles - creating corridors
-    {"x": 250, "y": 220, "width": 50, "height": 80},
-    {"x": 350, "y": 180, "width": 50, "height": 60},
-    {"x": 450, "y": 220, "width": 50, "height": 80},
-    {"x": 550, "y": 180, "width": 50, "height": 60},
-
-    # Middle-right section
-    {"x": 660, "y": 200, "width": 60, "height": 50},
-    {"x": 660, "y": 300, "width": 60, "height": 50},
-
-    # Bottom row - with gaps
-    {"x": 100, "y": 460, "width": 50, "height": 60},
-    {"x": 200, "y": 460, "width": 50, "height": 60},
-    {"x": 350, "y": 460, "width": 50, "height": 60},
-    {"x": 450, "y": 460, "width": 50, "height": 60},
-    {"x": 600, "y": 460, "width": 50, "height": 60},
-
-    # Additional strategic obstacles
-    {"x": 180, "y": 320, "width": 40, "height": 50},
-    {"x": 520, "y": 320, "width": 40, "height": 50},
-]
-
-# Movement history for trail
-movement_history = []
-max_history = 100
+# Obstacles as an (M, 4) array for the range sensor, replaced whenever an obstacle changes
+obstacle_array = world.obstacle_array()
+world_lock = threading.Lock()  # Guards changes to the world and the navigation planner
+
+# Range sensor defaults
+SCAN_RAYS = 360
+SCAN_MAX_RANGE = 300.0
+MAX_SCAN_RAYS = 4096
+
+# Navigation planner: a visibility graph over the obstacle corners, grown by
+# the robot radius and kept 20 px inside the map edges, built once at startup
+ROBOT_SIZE = 8
+NAVIGATION_STEP = 20  # Maximum distance between consecutive navigation path points
+NAVIGATION_CACHE_SIZE = 256
+navigation_planner = VisibilityGraphPlanner.from_world(world, inflate=ROBOT_SIZE, border=20)
+navigation_planner.adjacency()
+
+# Path queries from /plan and /start_navigation share one worker pool, one
+# result cache and coalescing of identical queries; beyond PLAN_QUEUE_SIZE
+# distinct queued queries, /plan answers 429
+PLAN_WORKERS = 4
+PLAN_QUEUE_SIZE = 32
+
+# Trajectory of every pose change, kept in a fixed-size ring buffer
+TRAJECTORY_CAPACITY = 100000
+trajectory = TrajectoryRecorder(TRAJECTORY_CAPACITY)
+
+# Simulator metrics
+metrics_lock = threading.Lock()
+simulator_metrics = {
+    "started_at": time.time(),
+    "routes": {},  # route -> {"latency": HdrHistogram, "status": {code: count}}
+    "collision_rejections": 0,
+}
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record handler latency and status code per route."""
+    start = g.pop("request_start", None)
+    if start is None or request.endpoint == "get_metrics":
+        return response
+    elapsed = time.perf_counter() - start
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    with metrics_lock:
+        route_metrics = simulator_metrics["routes"].get(route)
+        if route_metrics is None:
+            route_metrics = simulator_metrics["routes"][route] = {
+                "latency": HdrHistogram(),
+                "status": {},
+            }
+        status = route_metrics["status"]
+        status[response.status_code] = status.get(response.status_code, 0) + 1
+    route_metrics["latency"].record(elapsed)
+    return response
+
+def increment_metric(name, amount=1):
+    """Increase a simulation counter."""
+    with metrics_lock:
+        simulator_metrics[name] += amount
+
+def collect_metrics():
+    """Gather request and simulation metrics as plain Python data."""
+    uptime = time.time() - simulator_metrics["started_at"]
+    with metrics_lock:
+        routes = dict(simulator_metrics["routes"])
+        counters = {
+            "collision_rejections": simulator_metrics["collision_rejections"],
+        }
+    route_data = {}
+    for route, route_metrics in routes.items():
+        summary = route_metrics["latency"].summary()
+        summary["rate_per_second"] = summary["count"] / uptime if uptime > 0 else 0.0
+        summary["status"] = dict(route_metrics["status"])
+        route_data[route] = summary
+    with plan_service.lock:
+        counters["navigation_cache_hits"] = plan_service.stats["cache_hits"]
+        counters["plan_requests_coalesced"] = plan_service.stats["coalesced"]
+        counters["plan_requests_rejected"] = plan_service.stats["rejected"]
+    counters["plan_queue_depth"] = plan_service.pending()
+    counters["active_navigation_threads"] = navigation_jobs.active_threads()
+    counters["movement_history_length"] = len(trajectory)
+    return {"uptime_seconds": uptime, "routes": route_data, "simulation": counters}
+
+def format_prometheus(data):
+    """Render collected metrics in the Prometheus text exposition format."""
+    lines = [
+        "# TYPE simulator_uptime_seconds gauge",
+        f"simulator_uptime_seconds {data['uptime_seconds']}",
+        "# TYPE simulator_request_duration_seconds summary",
+    ]
+    for route, summary in sorted(data["routes"].items()):
+        for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"), ("0.999", "p999")):
+            lines.append(f'simulator_request_duration_seconds{{route="{route}",quantile="{quantile}"}} {summary[key]}')
+        lines.append(f'simulator_request_duration_seconds_sum{{route="{route}"}} {summary["sum"]}')
+        lines.append(f'simulator_request_duration_seconds_count{{route="{route}"}} {summary["count"]}')
+    lines.append("# TYPE simulator_requests_total counter")
+    for route, summary in sorted(data["routes"].items()):
+        for code, count in sorted(summary["status"].items()):
+            lines.append(f'simulator_requests_total{{route="{route}",code="{code}"}} {count}')
+    lines.append("# TYPE simulator_collision_rejections_total counter")
+    lines.append(f"simulator_collision_rejections_total {data['simulation']['collision_rejections']}")
+    for name in ("navigation_cache_hits", "plan_requests_coalesced", "plan_requests_rejected"):
+        lines.append(f"# TYPE simulator_{name}_total counter")
+        lines.append(f"simulator_{name}_total {data['simulation'][name]}")
+    for name in ("plan_queue_depth", "active_navigation_threads", "movement_history_length"):
+        lines.append(f"# TYPE simulator_{name} gauge")
+        lines.append(f"simulator_{name} {data['simulation'][name]}")
+    return "\n".join(lines) + "\n"
 
 def generate_camera_image():
     """Generate a simulated camera image with obstacles."""
@@ -75,9 +161,17 @@ def generate_camera_image():
     # This can be enhanced later with actual image processing
     return b"Camera image placeholder"
 
+def record_pose(command, collision=False):
+    """Append the robot's current pose to the trajectory"""
+    trajectory.record(time.time(), robot_state["x"], robot_state["y"], robot_state["orientation"], command, collision)
+
+def wants_binary():
+    """Whether the client prefers binary control messages over JSON (Accept header)."""
+    return request.accept_mimetypes.best_match(['application/json', BINARY_MIME]) == BINARY_MIME
+
 def check_point_collision(x, y):
     """Check if a point collides with any obstacle"""
-    robot_size = 8  # Robot radius (reduced for smaller robot)
+    robot_size = ROBOT_SIZE  # Robot radius (reduced for smaller robot)
     for obstacle in obstacles:
         if (x - robot_size < obstacle["x"] + obstacle["width"] and
             x + robot_size > obstacle["x"] and
@@ -86,116 +180,113 @@ def check_point_collision(x, y):
             return True
     return False
 
-def calculate_path(start, end):
-    """Calculate a simple path from start to end avoiding obstacles"""
+def densify_path(waypoints, step):
+    """Split the segments between waypoints so consecutive points are at most `step` apart."""
     path = []
-    current_x, current_y = start["x"], start["y"]
-    target_x, target_y = end["x"], end["y"]
-
-    step_size = 20
-    max_steps = 100
-
-    for _ in range(max_steps):
-        # Calculate direction to target
-        dx = target_x - current_x
-        dy = target_y - current_y
-        distance = math.sqrt(dx*dx + dy*dy)
-
-        if distance < step_size:
-            # Close enough to target
-            path.append({"x": target_x, "y": target_y})
-            break
-
-        # Normalize direction
-        dx = dx / distance * step_size
-        dy = dy / distance * step_size
-
-        # Try direct path first
-        next_x = current_x + dx
-        next_y = current_y + dy
-
-        if not check_point_collision(next_x, next_y):
-            # Direct path is clear
-            current_x, current_y = next_x, next_y
-            path.append({"x": current_x, "y": current_y})
-        else:
-            # Try to go around obstacle
-            # Try perpendicular directions
-            for angle_offset in [90, -90, 45, -45, 135, -135]:
-                angle = math.atan2(dy, dx) + math.radians(angle_offset)
-                test_x = current_x + step_size * math.cos(angle)
-                test_y = current_y + step_size * math.sin(angle)
-
-                if (test_x > 20 and test_x < MAP_SIZE[0] - 20 and
-                    test_y > 20 and test_y < MAP_SIZE[1] - 20 and
-                    not check_point_collision(test_x, test_y)):
-                    current_x, current_y = test_x, test_y
-                    path.append({"x": current_x, "y": current_y})
-                    break
-            else:
-                # If no direction works, try smaller step
-                for smaller_step in [10, 5]:
-                    test_x = current_x + dx * smaller_step / step_size
-                    test_y = current_y + dy * smaller_step / step_size
-                    if not check_point_collision(test_x, test_y):
-                        current_x, current_y = test_x, test_y
-                        path.append({"x": current_x, "y": current_y})
-                        break
-
+    for (x0, y0), (x1, y1) in zip(waypoints[:-1], waypoints[1:]):
+        pieces = max(1, int(math.ceil(math.hypot(x1 - x0, y1 - y0) / step)))
+        for i in range(1, pieces + 1):
+            path.append({"x": x0 + (x1 - x0) * i / pieces, "y": y0 + (y1 - y0) * i / pieces})
     return path
 
-def navigate_to_target():
-    """Navigate robot along the calculated path"""
-    if not navigation_state["path"]:
-        return
+def plan_route(cells):
+    """Plan between pixel cells (start x, start y, end x, end y) on the current world; runs on a plan worker"""
+    with world_lock:
+        waypoints = navigation_planner.plan(cells[:2], cells[2:])
+    return densify_path(waypoints, NAVIGATION_STEP)
 
-    for point in navigation_state["path"]:
-        if not navigation_state["is_navigating"]:
-            break
+plan_service = PlanService(plan_route, PLAN_WORKERS, PLAN_QUEUE_SIZE, NAVIGATION_CACHE_SIZE)
 
-        # Move robot to next point
-        target_x, target_y = point["x"], point["y"]
-        current_x, current_y = robot_state["x"], robot_state["y"]
+def submit_path(start, end):
+    """
+    Queue a path query on the plan service and return its Future.
 
-        # Calculate movement
-        dx = target_x - current_x
-        dy = target_y - current_y
-        distance = math.sqrt(dx*dx + dy*dy)
+    Start and end are snapped to whole pixels and queries are keyed by the
+    world version and those pixels, so repeated or concurrent requests for
+    the same route share one plan.
 
-        if distance > 5:  # Only move if not already close
-            # Limit movement speed
-            max_move = 25
-            if distance > max_move:
-                dx = dx / distance * max_move
-                dy = dy / distance * max_move
+    Raises:
+        Overloaded: If the plan queue is full
+    """
+    cells = (int(round(start["x"])), int(round(start["y"])), int(round(end["x"])), int(round(end["y"])))
+    return plan_service.submit((world.version,) + cells, cells)
 
-            # Update robot position
-            new_x = current_x + dx
-            new_y = current_y + dy
+def calculate_path(start, end):
+    """
+    Calculate the shortest collision-free path from start to end.
 
-            # Keep within bounds and check collision
-            new_x = max(20, min(MAP_SIZE[0] - 20, new_x))
-            new_y = max(20, min(MAP_SIZE[1] - 20, new_y))
+    Returns:
+        list: Points {"x", "y"} after the start, or [] if no path exists
+    """
+    return submit_path(start, end).result()
+
+def apply_obstacle_change(op, obstacle_id=None, obstacle=None):
+    """Change the world and patch the range sensor and navigation planner to match"""
+    global obstacle_array
+    with world_lock:
+        if op == "add":
+            obstacle_id = world.next_id
+        change = world.apply_change({"op": op, "id": obstacle_id, "new": obstacle})
+        navigation_planner.apply_change(change)
+        obstacle_array = world.obstacle_array()
+    plan_service.clear()
+    return change
+
+def parse_obstacle(data):
+    """Read x, y, width and height from a request body; None if they are missing or invalid"""
+    try:
+        obstacle = {k: float(data[k]) for k in ("x", "y", "width", "height")}
+    except (KeyError, TypeError, ValueError):
+        return None
+    if obstacle["width"] <= 0 or obstacle["height"] <= 0:
+        return None
+    return {k: int(v) if v.is_integer() else v for k, v in obstacle.items()}
+
+def step_toward(point):
+    """Move the robot one simulation tick toward a navigation path point"""
+    target_x, target_y = point["x"], point["y"]
+    current_x, current_y = robot_state["x"], robot_state["y"]
+
+    # Calculate movement
+    dx = target_x - current_x
+    dy = target_y - current_y
+    distance = math.sqrt(dx*dx + dy*dy)
+
+    if distance > 5:  # Only move if not already close
+        # Limit movement speed
+        max_move = 25
+        if distance > max_move:
+            dx = dx / distance * max_move
+            dy = dy / distance * max_move
 
-            if not check_point_collision(new_x, new_y):
-                robot_state["x"] = new_x
-                robot_state["y"] = new_y
-                robot_state["moving"] = True
+        # Update robot position
+        new_x = current_x + dx
+        new_y = current_y + dy
 
-                # Calculate orientation
-                if abs(dx) > 0.1 or abs(dy) > 0.1:
-                    robot_state["orientation"] = int(math.degrees(math.atan2(dy, dx)))
+        # Keep within bounds and check collision
+        new_x = max(20, min(MAP_SIZE[0] - 20, new_x))
+        new_y = max(20, min(MAP_SIZE[1] - 20, new_y))
 
-                # Add to movement history
-                movement_history.append((new_x, new_y))
-                if len(movement_history) > max_history:
-                    movement_history.pop(0)
+        if not check_point_collision(new_x, new_y):
+            robot_state["x"] = new_x
+            robot_state["y"] = new_y
+            robot_state["moving"] = True
+
+            # Calculate orientation
+            if abs(dx) > 0.1 or abs(dy) > 0.1:
+                robot_state["orientation"] = int(math.degrees(math.atan2(dy, dx)))
 
-        time.sleep(0.1)  # Control movement speed
+            record_pose("navigate")
+        else:
+            record_pose("navigate", collision=True)
 
-    # Navigation complete
-    robot_state["moving"] = False
-    navigation_state["is_navigating"] = False
+def finish_navigation(job):
+    """Stop the robot once a navigation job ends, unless a newer job took over"""
+    if navigation_jobs.status() is job:
+        robot_state["moving"] = False
+
+# Navigation jobs: one mover thread at a time, preempted by each new request
+navigation_jobs = NavigationJobManager(step_toward, tick=0.1, on_finish=finish_navigation)
 
 @app.route('/')
 def index():
@@ -250,46 +341,17 @@ def index():
     <body>
         <h1>Robot Navigation Simulator</h1>
         <div class="container">
-            <div class="map-container" style="width: 800px; height: 600px; cursor: crosshair;" onclick="handleMapClick(event)">
+            <div class="map-container" style="width: {{ map_size[0] }}px; height: {{ map_size[1] }}px; cursor: crosshair;" onclick="handleMapClick(event)">
                 <div id="robot" class="robot"></div>
                 <div id="goal" class="goal" style="display: none;"></div>
                 <div id="start-point" class="start-point" style="display: none;"></div>
                 <div id="end-point" class="end-point" style="display: none;"></div>
                 <div id="trail-container"></div>
                 <div id="path-container"></div>
-                <!-- Green rectangular obstacles with better spacing for navigation -->
-                <!-- Top row -->
-                <div class="obstacle" style="left: 100px; top: 80px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 200px; top: 80px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 300px; top: 80px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 450px; top: 80px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 550px; top: 80px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 650px; top: 80px; width: 50px; height: 60px;"></div>
-
-                <!-- Middle-left section -->
-                <div class="obstacle" style="left: 80px; top: 200px; width: 60px; height: 50px;"></div>
-                <div class="obstacle" style="left: 80px; top: 300px; width: 60px; height: 50px;"></div>
-
-                <!-- Center obstacles - creating corridors -->
-                <div class="obstacle" style="left: 250px; top: 220px; width: 50px; height: 80px;"></div>
-                <div class="obstacle" style="left: 350px; top: 180px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 450px; top: 220px; width: 50px; height: 80px;"></div>
-                <div class="obstacle" style="left: 550px; top: 180px; width: 50px; height: 60px;"></div>
-
-                <!-- Middle-right section -->
-                <div class="obstacle" style="left: 660px; top: 200px; width: 60px; height: 50px;"></div>
-                <div class="obstacle" style="left: 660px; top: 300px; width: 60px; height: 50px;"></div>
-
-                <!-- Bottom row -->
-                <div class="obstacle" style="left: 100px; top: 460px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 200px; top: 460px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 350px; top: 460px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 450px; top: 460px; width: 50px; height: 60px;"></div>
-                <div class="obstacle" style="left: 600px; top: 460px; width: 50px; height: 60px;"></div>
-
-                <!-- Additional strategic obstacles -->
-                <div class="obstacle" style="left: 180px; top: 320px; width: 40px; height: 50px;"></div>
-                <div class="obstacle" style="left: 520px; top: 320px; width: 40px; height: 50px;"></div>
+                <!-- Green rectangular obstacles from the loaded world -->
+                {% for obstacle in obstacles %}
+                <div class="obstacle" style="left: {{ obstacle.x }}px; top: {{ obstacle.y }}px; width: {{ obstacle.width }}px; height: {{ obstacle.height }}px;"></div>
+                {% endfor %}
             </div>
             <div class="info-panel">
                 <div class="status">
@@ -472,11 +534,13 @@ def index():
     </body>
     </html>
     """
-    return render_template_string(html_template)
+    return render_template_string(html_template, obstacles=obstacles, map_size=MAP_SIZE)
 
 @app.route('/position')
 def get_position():
-    """Get current robot position and orientation."""
+    """Get current robot position and orientation (binary if the client accepts it)."""
+    if wants_binary():
+        return encode_pose(robot_state), 200, {'Content-Type': BINARY_MIME}
     return jsonify(robot_state)
 
 @app.route('/capture')
@@ -485,13 +549,117 @@ def capture_image():
     image_data = generate_camera_image()
     return image_data, 200, {'Content-Type': 'text/plain'}
 
+@app.route('/scan')
+def scan():
+    """
+    Cast evenly spaced rays from the robot and return their lengths.
+
+    The body is a little-endian float32 array, one distance per ray starting at
+    angle 0 in world coordinates. The origin the rays were cast from is
+    returned in the X-Scan-Origin header.
+    """
+    try:
+        num_rays = int(request.args.get('rays', SCAN_RAYS))
+        max_range = float(request.args.get('max_range', SCAN_MAX_RANGE))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid scan parameters"}), 400
+    if not 0 < num_rays <= MAX_SCAN_RAYS or max_range <= 0:
+        return jsonify({"success": False, "error": "Invalid scan parameters"}), 400
+
+    origin = (robot_state["x"], robot_state["y"])
+    distances = cast_rays(origin, ray_angles(num_rays), obstacle_array, max_range, MAP_SIZE)
+    headers = {
+        'Content-Type': 'application/octet-stream',
+        'X-Scan-Origin': f"{origin[0]},{origin[1]}",
+        'X-Scan-Max-Range': str(max_range),
+    }
+    return distances.astype('<f4').tobytes(), 200, headers
+
+@app.route('/trajectory')
+def get_trajectory():
+    """
+    Return recorded poses by sequence number (?start=&stop=).
+
+    With ?format=npy the body is a .npy file, otherwise the raw little-endian
+    records (see src/trajectory.py for the layout). The sequence number of
+    the first record returned is in the X-Trajectory-Start header.
+    """
+    try:
+        start = int(request.args['start']) if 'start' in request.args else None
+        stop = int(request.args['stop']) if 'stop' in request.args else None
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid trajectory range"}), 400
+    first, records = trajectory.range(start, stop)
+    headers = {
+        'Content-Type': 'application/octet-stream',
+        'X-Trajectory-Start': str(first),
+        'X-Trajectory-Total': str(trajectory.total),
+        'X-Trajectory-Dtype': json.dumps(TRAJECTORY_DTYPE.descr),
+    }
+    if request.args.get('format') == 'npy':
+        headers['Content-Disposition'] = 'attachment; filename=trajectory.npy'
+        return to_npy(records), 200, headers
+    return records.tobytes(), 200, headers
+
+@app.route('/obstacles')
+def list_obstacles():
+    """Return every obstacle with its id and the current world version."""
+    with world_lock:
+        listed = [dict(o, id=i) for i, o in zip(world.ids, world.obstacles)]
+        return jsonify({"version": world.version, "obstacles": listed})
+
+@app.route('/obstacles', methods=['POST'])
+def add_obstacle():
+    """Add an obstacle {x, y, width, height}."""
+    obstacle = parse_obstacle(request.get_json(silent=True))
+    if obstacle is None:
+        return jsonify({"success": False, "error": "Invalid obstacle"}), 400
+    change = apply_obstacle_change("add", obstacle=obstacle)
+    return jsonify({"success": True, "id": change["id"], "version": change["version"]}), 201
+
+@app.route('/obstacles/<int:obstacle_id>', methods=['PUT', 'DELETE'])
+def change_obstacle(obstacle_id):
+    """Move or resize an obstacle (PUT {x, y, width, height}) or remove it (DELETE)."""
+    obstacle = None
+    if request.method == 'PUT':
+        obstacle = parse_obstacle(request.get_json(silent=True))
+        if obstacle is None:
+            return jsonify({"success": False, "error": "Invalid obstacle"}), 400
+    try:
+        change = apply_obstacle_change("update" if obstacle else "remove", obstacle_id, obstacle)
+    except KeyError:
+        return jsonify({"success": False, "error": "No such obstacle"}), 404
+    return jsonify({"success": True, "id": obstacle_id, "version": change["version"]})
+
+@app.route('/obstacles/changes')
+def obstacle_changes():
+    """
+    Return the obstacle changes made after world version ?since=V, oldest first.
+
+    Answers 410 if the change log no longer reaches back to V; the client
+    should then read /obstacles in full.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid version"}), 400
+    with world_lock:
+        changes = world.changes_since(since)
+        version = world.version
+    if changes is None:
+        return jsonify({"success": False, "error": "Changes are no longer available", "version": version}), 410
+    return jsonify({"version": version, "changes": changes})
+
 @app.route('/move_rel', methods=['POST'])
 def move_relative():
-    """Move robot by relative distances."""
+    """Move robot by relative distances, given as JSON or as a binary control message."""
     try:
-        data = request.get_json()
-        dx = data.get('dx', 0)
-        dy = data.get('dy', 0)
+        if request.mimetype == BINARY_MIME:
+            dx, dy = decode_move(request.get_data())
+        else:
+            data = request.get_json()
+            dx = data.get('dx', 0)
+            dy = data.get('dy', 0)
         
         # Update robot position
         new_x = robot_state["x"] + dx
@@ -503,7 +671,7 @@ def move_relative():
         
         # Check for collisions with obstacles
         collision = False
-        robot_size = 8  # Robot radius (reduced for smaller robot)
+        robot_size = ROBOT_SIZE  # Robot radius (reduced for smaller robot)
         for obstacle in obstacles:
             # Check if robot overlaps with rectangular obstacle
             if (new_x - robot_size < obstacle["x"] + obstacle["width"] and
@@ -518,14 +686,11 @@ def move_relative():
             robot_state["y"] = new_y
             robot_state["moving"] = True
             
-            # Add to movement history
-            movement_history.append((new_x, new_y))
-            if len(movement_history) > max_history:
-                movement_history.pop(0)
-            
             # Calculate orientation based on movement
             if abs(dx) > 0.1 or abs(dy) > 0.1:
                 robot_state["orientation"] = int(math.degrees(math.atan2(dy, dx)))
+
+            record_pose("move_rel")
             
             # Stop moving after a short delay
             def stop_moving():
@@ -534,8 +699,14 @@ def move_relative():
             
             threading.Thread(target=stop_moving).start()
             
+            if wants_binary():
+                return encode_move_result(True, robot_state), 200, {'Content-Type': BINARY_MIME}
             return jsonify({"success": True, "position": robot_state})
         else:
+            increment_metric("collision_rejections")
+            record_pose("move_rel", collision=True)
+            if wants_binary():
+                return encode_move_result(False, robot_state), 400, {'Content-Type': BINARY_MIME}
             return jsonify({"success": False, "error": "Collision detected"}), 400
             
     except Exception as e:
@@ -546,8 +717,8 @@ def set_position():
     """Set robot to specific position."""
     try:
         data = request.get_json()
-        x = data.get('x', 400)
-        y = data.get('y', 300)
+        x = data.get('x', world.start[0])
+        y = data.get('y', world.start[1])
 
         # Keep robot within bounds
         x = max(20, min(MAP_SIZE[0] - 20, x))
@@ -557,6 +728,7 @@ def set_position():
         robot_state["y"] = y
         robot_state["orientation"] = 0
         robot_state["moving"] = False
+        record_pose("set_position")
 
         return jsonify({"success": True, "position": robot_state})
     except Exception as e:
@@ -570,39 +742,79 @@ def start_navigation():
         start = data.get('start')
         end = data.get('end')
 
+        try:
+            path = calculate_path(start, end)
+        except Overloaded as e:
+            return jsonify({"success": False, "error": str(e)}), 429, {"Retry-After": str(e.retry_after)}
+        if not path:
+            return jsonify({"success": False, "error": "No collision-free path"}), 400
+
         navigation_state["start_point"] = start
         navigation_state["end_point"] = end
-        navigation_state["is_navigating"] = True
-
-        # Calculate simple path (A* algorithm would be better, but this is a simple implementation)
-        path = calculate_path(start, end)
         navigation_state["path"] = path
 
-        # Start navigation in a separate thread
-        import threading
-        threading.Thread(target=navigate_to_target, daemon=True).start()
+        # Follow the path on the job manager's mover thread, preempting any earlier job
+        job = navigation_jobs.start(path)
 
-        return jsonify({"success": True, "path": path})
+        return jsonify({"success": True, "job_id": job.job_id, "path": path})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/plan', methods=['POST'])
+def plan():
+    """Plan a path from start to end without moving the robot; 429 with Retry-After when overloaded."""
+    data = request.get_json(silent=True) or {}
+    try:
+        start = {"x": float(data["start"]["x"]), "y": float(data["start"]["y"])}
+        end = {"x": float(data["end"]["x"]), "y": float(data["end"]["y"])}
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"success": False, "error": "start and end need x and y"}), 400
+    version = world.version
+    try:
+        path = submit_path(start, end).result()
+    except Overloaded as e:
+        return jsonify({"success": False, "error": str(e)}), 429, {"Retry-After": str(e.retry_after)}
+    if not path:
+        return jsonify({"success": False, "error": "No collision-free path", "version": version}), 400
+    return jsonify({"success": True, "path": path, "version": version})
+
 @app.route('/stop_navigation', methods=['POST'])
 def stop_navigation():
     """Stop current navigation."""
-    navigation_state["is_navigating"] = False
+    navigation_jobs.cancel(wait=True)
     navigation_state["path"] = []
     robot_state["moving"] = False
     return jsonify({"success": True})
 
+@app.route('/navigation_status')
+def navigation_status():
+    """Report the status and progress of a navigation job (?job_id=N, default the latest)."""
+    job_id = request.args.get('job_id', type=int)
+    job = navigation_jobs.status(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "No such navigation job"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/metrics')
+def get_metrics():
+    """Report request latency and simulation metrics (JSON, or Prometheus text with ?format=prometheus)."""
+    data = collect_metrics()
+    wants_text = request.args.get('format') == 'prometheus' or (
+        'format' not in request.args and
+        request.accept_mimetypes.best_match(['application/json', 'text/plain']) == 'text/plain'
+    )
+    if wants_text:
+        return format_prometheus(data), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+    return jsonify(data)
+
 @app.route('/reset', methods=['POST'])
 def reset_robot():
-    """Reset robot to center position."""
-    robot_state["x"] = 400
-    robot_state["y"] = 300
+    """Reset robot to the world's start position."""
+    navigation_jobs.cancel(wait=True)
+    robot_state["x"], robot_state["y"] = world.start
     robot_state["orientation"] = 0
     robot_state["moving"] = False
-    movement_history.clear()
-    navigation_state["is_navigating"] = False
+    record_pose("reset")
     navigation_state["path"] = []
     return jsonify({"success": True})
 
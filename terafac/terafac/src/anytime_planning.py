@@ -0,0 +1,115 @@
+import heapq
+import math
+import time
+
+from src.grid_search import GridGraph, ReverseFlood
+
+
+class AnytimePlanner:
+    """
+    Anytime Repairing A* (ARA*) with a deadline.
+
+    A first path is found quickly with the heuristic inflated by epsilon,
+    which bounds its cost to epsilon times the optimum. While time remains,
+    epsilon is lowered and the search is repaired rather than restarted:
+    g values and parents are kept, and only states whose g improved after
+    they were expanded (the INCONS list) are put back on the open list.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.last_expansions = 0
+        self.last_epsilon = None  # Suboptimality bound of the returned path
+        self.last_status = None  # "optimal", "deadline", "unreachable" or "invalid"
+
+    def plan(self, start, goal, obstacle_map, deadline=None, graph=None):
+        """
+        Plan a path, improving it until it is optimal or the deadline passes.
+
+        The deadline only cuts improvement short: the search always runs
+        until it has a first path or has proven the goal unreachable.
+
+        Args:
+            start (tuple): Start cell
+            goal (tuple): Goal cell
+            obstacle_map (numpy.ndarray): The obstacle map
+            deadline (float): time.perf_counter() value to stop at, None for no limit
+            graph (GridGraph): Prebuilt graph of obstacle_map, to skip rebuilding it
+
+        Returns:
+            list: Cells from start to goal of the best path found, or [] if none
+        """
+        config = self.config
+        if graph is None:
+            graph = GridGraph(obstacle_map, config.DIAGONAL_MOVEMENT)
+        self.last_expansions = 0
+        self.last_epsilon = None
+        if not graph.is_free(start) or not graph.is_free(goal):
+            self.last_status = "invalid"
+            return []
+
+        start_index, goal_index = graph.index(start), graph.index(goal)
+        heuristic = graph.heuristic_to(goal)
+        blocked, moves = graph.blocked, graph.moves
+        g = [math.inf] * graph.size
+        parent = [-1] * graph.size
+        closed = [False] * graph.size
+        g[start_index] = 0.0
+        flood = ReverseFlood(graph, goal, start)
+
+        epsilon = config.ANYTIME_INITIAL_EPSILON
+        open_set = [(epsilon * heuristic(start_index), start_index)]
+        incons = []
+        best_path = []
+        while True:
+            # ImprovePath: expand until the goal's key is the smallest on the open list
+            while open_set and g[goal_index] > open_set[0][0]:
+                key, index = heapq.heappop(open_set)
+                if closed[index] or key > g[index] + epsilon * heuristic(index) + 1e-9:
+                    continue  # Already expanded or superseded by a better entry
+                closed[index] = True
+                self.last_expansions += 1
+                if self.last_expansions % 256 == 0:
+                    if deadline is not None and time.perf_counter() > deadline and best_path:
+                        self.last_status = "deadline"
+                        return best_path
+                    flood.advance(512)
+                    if flood.exhausted:
+                        print("Goal is unreachable: its region was flooded without meeting the start")
+                        self.last_status = "unreachable"
+                        return []
+                base = g[index]
+                for offset, cost in moves:
+                    neighbor = index + offset
+                    if blocked[neighbor]:
+                        continue
+                    tentative = base + cost
+                    if tentative < g[neighbor]:
+                        g[neighbor] = tentative
+                        parent[neighbor] = index
+                        if closed[neighbor]:
+                            incons.append(neighbor)
+                        else:
+                            heapq.heappush(open_set, (tentative + epsilon * heuristic(neighbor), neighbor))
+
+            if g[goal_index] == math.inf:
+                print("No path found using ARA*")
+                self.last_status = "unreachable"
+                return []
+            best_path = graph.path(parent, goal_index)
+            self.last_epsilon = epsilon
+            if epsilon <= 1.0:
+                self.last_status = "optimal"
+                return best_path
+            if deadline is not None and time.perf_counter() > deadline:
+                self.last_status = "deadline"
+                return best_path
+
+            # Lower epsilon and repair: re-key open and inconsistent states, forget closed
+            epsilon = max(1.0, epsilon - config.ANYTIME_EPSILON_STEP)
+            pending = {index for _, index in open_set if not closed[index]}
+            pending.update(incons)
+            open_set = [(g[i] + epsilon * heuristic(i), i) for i in pending]
+            heapq.heapify(open_set)
+            incons = []
+            closed = [False] * graph.size
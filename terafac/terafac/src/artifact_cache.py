@@ -0,0 +1,105 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+
+def world_key(obstacle_map, robot_radius, resolution):
+    """
+    Hash the obstacle layout together with the parameters derived grids depend on.
+
+    Args:
+        obstacle_map (numpy.ndarray): Map with non-zero obstacle cells
+        robot_radius (float): Robot radius used for inflation
+        resolution (float): Grid resolution in pixels per cell
+
+    Returns:
+        str: Hex digest identifying the world
+    """
+    occupancy = np.asarray(obstacle_map) != 0
+    digest = hashlib.sha256()
+    digest.update(repr((occupancy.shape, float(robot_radius), float(resolution))).encode())
+    digest.update(np.packbits(occupancy).tobytes())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Persistent cache of derived planning grids stored as .npy files.
+
+    Arrays are written atomically (temporary file plus rename) and handed back
+    as read-only memory maps, so separate worker processes share a single copy
+    through the OS page cache. The least recently used files are evicted once
+    the directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, key):
+        """Return the file used for an artifact."""
+        return os.path.join(self.directory, f"{name}-{key}.npy")
+
+    def load(self, name, key):
+        """Map a cached artifact read-only, or return None if it is not cached."""
+        path = self.path(name, key)
+        try:
+            array = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return array
+
+    def store(self, name, key, array):
+        """Write an artifact atomically and return it mapped read-only."""
+        path = self.path(name, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="r")
+
+    def get_or_compute(self, name, key, compute):
+        """Return the cached artifact, computing and storing it on a miss."""
+        array = self.load(name, key)
+        if array is None:
+            array = self.store(name, key, compute())
+        return array
+
+    def evict(self, keep=None):
+        """Remove least recently used artifacts until the cache fits in max_bytes."""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".npy"):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -9,18 +9,51 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.robot_controller import RobotController
+from src.transport import ReplayExhausted, transport_from_config
 from src.computer_vision import ComputerVision
 from src.path_planning import PathPlanner
+from src.instrumentation import Instrumentation
+from src.pipeline import PipelinedNavigator
+from src.path_follower import PathFollower
+from src.clearance import ClearanceStepPolicy, distance_transform
+from src.artifact_cache import ArtifactCache, world_key
+from src.occupancy_grid import OccupancyGrid, LogOddsGrid
+from src.world import World
+from src.tour_planning import TourPlanner
 from config.config import Config
 
 class AutonomousRobot:
     def __init__(self):
         self.config = Config()
-        self.robot_controller = RobotController(self.config.SIMULATOR_URL)
-        self.computer_vision = ComputerVision(self.config)
-        self.path_planner = PathPlanner(self.config)
-        self.obstacle_map = np.zeros(self.config.MAP_SIZE, dtype=np.uint8)
+        self.world = World.load(self.config.WORLD_FILE)
+        self.config.MAP_SIZE = self.world.size
+        self.robot_controller = RobotController(self.config.SIMULATOR_URL, transport_from_config(self.config))
+        self.computer_vision = ComputerVision(self.config, self.world)
+        self.artifact_cache = None
+        if self.config.ARTIFACT_CACHE_ENABLED:
+            self.artifact_cache = ArtifactCache(self.config.ARTIFACT_CACHE_DIR, self.config.ARTIFACT_CACHE_MAX_BYTES)
+        self.path_planner = PathPlanner(self.config, self.artifact_cache, self.world)
+        self.occupancy = None  # Log-odds map fused from observations, if enabled
+        if self.config.PROBABILISTIC_MAPPING:
+            self.occupancy = LogOddsGrid.from_config(self.config)
+            self.obstacle_map = self.occupancy.binary  # Thresholded view used for planning
+        elif self.config.TILED_OCCUPANCY_GRID:
+            self.obstacle_map = OccupancyGrid(self.config.MAP_SIZE, self.config.OCCUPANCY_TILE_SIZE)
+        else:
+            self.obstacle_map = np.zeros(self.config.MAP_SIZE, dtype=np.uint8)
+        self.map_version = 0  # Bumped whenever detection changes the obstacle map
         self.goal_position = None
+        self.instrumentation = Instrumentation(
+            enabled=self.config.INSTRUMENTATION_ENABLED,
+            window=self.config.METRICS_WINDOW,
+            profile_stages=("plan",) if self.config.PROFILE_PLANNER else (),
+            profile_interval=self.config.PROFILE_INTERVAL
+        )
+        self.path_follower = PathFollower(
+            self.config, self.path_planner, self.instrumentation, ClearanceStepPolicy(self.config)
+        )
+        self.clearance = None
+        self.clearance_version = None
 
     def set_goal_position(self):
         """Set the goal position dynamically near one of the corners."""
@@ -36,53 +69,187 @@ class AutonomousRobot:
         self.goal_position = random.choice(corners)
         print(f"Goal position set to: {self.goal_position}")
 
-    def navigate_to_goal(self):
-        """Navigate the robot to the goal position while avoiding obstacles."""
+    def clearance_field(self):
+        """Return the distance-to-obstacle field for the current map, recomputing it when the map changes."""
+        if self.clearance_version != self.map_version:
+            with self.instrumentation.span("clearance"):
+                if self.artifact_cache is not None:
+                    key = world_key(self.obstacle_map, self.config.ROBOT_RADIUS, 1)
+                    self.clearance = self.artifact_cache.get_or_compute(
+                        "clearance", key, lambda: distance_transform(self.obstacle_map)
+                    )
+                else:
+                    self.clearance = distance_transform(self.obstacle_map)
+            self.clearance_version = self.map_version
+        return self.clearance
+
+    def max_step_size(self):
+        """Return the longest single move the motion policy may request."""
+        return self.config.MAX_STEP_SIZE if self.config.ADAPTIVE_STEP_SIZE else self.config.STEP_SIZE
+
+    def update_obstacle_map(self, image):
+        """Detect obstacles in an image and bump the map version if the map changed."""
+        if isinstance(self.obstacle_map, OccupancyGrid):
+            target = self.occupancy if self.occupancy is not None else self.obstacle_map
+            obstacles = self.computer_vision.detect_obstacles(
+                image, target, self.robot_controller.current_position
+            )
+            changed = bool(self.obstacle_map.clear_dirty())
+        else:
+            obstacles = self.computer_vision.detect_obstacles(image, self.obstacle_map)
+            changed = self.computer_vision.map_changed
+        if changed:
+            self.map_version += 1
+        return obstacles
+
+    def sync_world(self):
+        """
+        Apply obstacle changes published by the simulator since the last sync.
+
+        The world, the obstacle map and the planners are patched in place for
+        just the changed obstacles. If the simulator's change log no longer
+        reaches back to our version, the difference to a full snapshot of the
+        obstacles is applied instead.
+
+        Returns:
+            int: Number of changes applied
+        """
+        feed = self.robot_controller.get_obstacle_changes(self.world.version)
+        if feed is None:
+            return 0
+        changes = feed["changes"]
+        if changes is None:
+            snapshot = self.robot_controller.get_obstacles()
+            if snapshot is None:
+                return 0
+            changes = self.world.changes_to(snapshot["obstacles"], snapshot["version"])
+            if not changes:
+                self.world.version = snapshot["version"]
+        if not changes:
+            return 0
+        with self.instrumentation.span("sync"):
+            target = self.occupancy if self.occupancy is not None else self.obstacle_map
+            recorded, regions = self.computer_vision.apply_changes(changes, target)
+            previous = self.map_version
+            self.map_version += 1
+            self.path_planner.apply_map_changes(recorded, regions, self.obstacle_map, previous, self.map_version)
+        self.instrumentation.increment("world_changes", len(recorded))
+        return len(recorded)
+
+    def random_escape(self):
+        """Move in a random direction to get unstuck."""
+        self.instrumentation.increment("random_escapes")
+        angle = random.uniform(0, 360)
+        dx = 30 * math.cos(math.radians(angle))
+        dy = 30 * math.sin(math.radians(angle))
+        with self.instrumentation.span("move"):
+            return self.robot_controller.move_robot_relative(dx, dy)
+
+    def start_navigation(self):
+        """Initialize the robot position and goal. Returns False if the position is unavailable."""
         print("Starting navigation...")
         self.robot_controller.get_robot_position()  # Initialize the current position
         print(f"Initial position: {self.robot_controller.current_position}")
-        self.set_goal_position()  # Set the goal position
+        if self.goal_position is None:
+            self.set_goal_position()  # Set the goal position
 
         # Check if position was retrieved successfully
         if self.robot_controller.current_position is None:
             print("Failed to get initial robot position!")
+            return False
+        return True
+
+    def finish_navigation(self, step_count, elapsed):
+        """Report the outcome of a navigation run and export metrics."""
+        steps_per_second = step_count / elapsed if elapsed > 0 else 0.0
+        self.instrumentation.observe("steps_per_second", steps_per_second)
+        print(f"Navigation finished after {step_count} steps ({steps_per_second:.2f} steps/s). "
+              f"Collisions: {self.robot_controller.collision_count}")
+        if self.config.PATH_FOLLOWING:
+            follower = self.path_follower
+            total = follower.replans + follower.replans_avoided
+            print(f"Replans: {follower.replans}, avoided: {follower.replans_avoided}"
+                  + (f" ({100.0 * follower.replans_avoided / total:.1f}%)" if total else ""))
+        if self.config.METRICS_EXPORT_PATH:
+            self.instrumentation.export(self.config.METRICS_EXPORT_PATH)
+            print(f"Metrics written to {self.config.METRICS_EXPORT_PATH}")
+        return steps_per_second
+
+    def navigate_to_goal_pipelined(self, max_steps=None):
+        """Navigate to the goal with capture, planning and movement running concurrently."""
+        if not self.start_navigation():
+            return
+        started = time.perf_counter()
+        step_count = PipelinedNavigator(self).run(max_steps)
+        self.finish_navigation(step_count, time.perf_counter() - started)
+
+    def navigate_to_goal(self, max_steps=None):
+        """Navigate the robot to the goal position while avoiding obstacles."""
+        if not self.start_navigation():
             return
 
         # Main navigation loop
+        metrics = self.instrumentation
+        started = time.perf_counter()
         step_count = 0
+        move_failed = False
         while np.linalg.norm(np.array(self.robot_controller.current_position) - np.array(self.goal_position)) > 10:
+            if max_steps is not None and step_count >= max_steps:
+                break
             step_count += 1
+            metrics.increment("steps")
             print(f"Step {step_count}: Current position: {self.robot_controller.current_position}, Goal: {self.goal_position}")
 
             # Capture an image
-            image = self.robot_controller.capture_image()
+            with metrics.span("capture"):
+                image = self.robot_controller.capture_image()
             if image is None:
                 print("Failed to capture image. Retrying...")
-                time.sleep(1)
+                metrics.increment("http_retries")
+                self.robot_controller.sleep(1)
                 continue
 
+            if self.config.DYNAMIC_WORLD and (step_count - 1) % self.config.WORLD_SYNC_STEPS == 0:
+                self.sync_world()
+
             # Detect obstacles and update the obstacle map
-            obstacles = self.computer_vision.detect_obstacles(image, self.obstacle_map)
+            with metrics.span("detect"):
+                obstacles = self.update_obstacle_map(image)
             print(f"Detected {len(obstacles)} obstacles")
 
-            # Plan a path using A*
-            path = self.path_planner.plan_path_astar(
-                self.robot_controller.current_position,
-                self.goal_position,
-                self.obstacle_map
-            )
+            if self.config.PATH_FOLLOWING:
+                # Keep following the current plan unless it has become unusable
+                next_waypoint = self.path_follower.next_waypoint(
+                    self.robot_controller.current_position,
+                    self.goal_position,
+                    self.obstacle_map,
+                    self.map_version,
+                    move_failed,
+                    self.clearance_field() if self.config.ADAPTIVE_STEP_SIZE else None
+                )
+                move_failed = False
+                if next_waypoint is None:
+                    print("No path found. Trying to move randomly...")
+                    self.random_escape()
+                    continue
+            else:
+                # Plan a path using A*
+                with metrics.span("plan"):
+                    path = self.path_planner.plan_path(
+                        self.robot_controller.current_position,
+                        self.goal_position,
+                        self.obstacle_map,
+                        self.map_version
+                    )
+                metrics.observe("plan_expansions", self.path_planner.last_expansions)
 
-            if not path or len(path) < 2:
-                print("No path found. Trying to move randomly...")
-                # Try to move in a random direction with larger steps
-                angle = random.uniform(0, 360)
-                dx = 30 * math.cos(math.radians(angle))
-                dy = 30 * math.sin(math.radians(angle))
-                self.robot_controller.move_robot_relative(dx, dy)
-                continue
+                if not path or len(path) < 2:
+                    print("No path found. Trying to move randomly...")
+                    self.random_escape()
+                    continue
 
-            # Move to the next waypoint in the path
-            next_waypoint = path[1]
+                # Move to the next waypoint in the path
+                next_waypoint = path[1]
 
             # Calculate the direction and distance to the next waypoint
             dx = next_waypoint[0] - self.robot_controller.current_position[0]
@@ -91,29 +258,61 @@ class AutonomousRobot:
 
             # Normalize and scale the movement
             if distance > 0:
-                dx = dx / distance * min(distance, self.config.STEP_SIZE)
-                dy = dy / distance * min(distance, self.config.STEP_SIZE)
+                dx = dx / distance * min(distance, self.max_step_size())
+                dy = dy / distance * min(distance, self.max_step_size())
 
                 # Move towards the waypoint
                 print(f"Moving by dx={dx:.2f}, dy={dy:.2f}")
-                if not self.robot_controller.move_robot_relative(dx, dy):
+                with metrics.span("move"):
+                    moved = self.robot_controller.move_robot_relative(dx, dy)
+                if not moved:
                     print("Move failed, trying random direction")
+                    metrics.increment("failed_moves")
+                    move_failed = True
                     # If the move failed, try to move in a different direction with larger steps
-                    angle = random.uniform(0, 360)
-                    dx = 30 * math.cos(math.radians(angle))
-                    dy = 30 * math.sin(math.radians(angle))
-                    self.robot_controller.move_robot_relative(dx, dy)
+                    self.random_escape()
                 else:
                     print(f"Move successful, new position: {self.robot_controller.current_position}")
 
             # Small delay to prevent overwhelming the server (reduced for faster movement)
-            time.sleep(0.05)
+            self.robot_controller.sleep(0.05)
+
+        self.finish_navigation(step_count, time.perf_counter() - started)
+
+    def navigate_tour(self, goals, max_steps=None):
+        """
+        Visit several goals in a short order.
+
+        The order is planned on the world's obstacles grown by the robot
+        radius, then each goal is navigated to in turn.
 
-        print(f"Reached the goal! Collisions: {self.robot_controller.collision_count}")
+        Returns:
+            list: The goals in the order they were visited
+        """
+        if not self.start_navigation():
+            return []
+        known_map = self.world.rasterize(np.zeros(self.config.MAP_SIZE, dtype=np.uint8), self.config.ROBOT_RADIUS)
+        order, _ = TourPlanner(self.config).plan_tour(self.robot_controller.current_position, goals, known_map)
+        print(f"Tour order: {order}")
+        for goal in order:
+            self.goal_position = goal
+            self.path_follower.reset()
+            if self.config.PIPELINED_NAVIGATION:
+                self.navigate_to_goal_pipelined(max_steps)
+            else:
+                self.navigate_to_goal(max_steps)
+        return order
 
 def main():
     robot = AutonomousRobot()
-    robot.navigate_to_goal()
+    try:
+        if robot.config.PIPELINED_NAVIGATION:
+            robot.navigate_to_goal_pipelined()
+        else:
+            robot.navigate_to_goal()
+    except ReplayExhausted as e:
+        # A replayed log (ROBOT_REPLAY_PATH) has no responses left
+        print(f"Episode ended: {e}")
 
 if __name__ == "__main__":
     main()
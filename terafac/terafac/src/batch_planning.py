@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+
+from src.path_planning import PathPlanner
+
+# Per-process state of pool workers, set up once by _init_worker
+_worker = {}
+
+
+def share_arrays(arrays):
+    """
+    Copy arrays into shared memory blocks.
+
+    Returns:
+        tuple: (blocks, specs) where blocks must be closed and unlinked by the
+        owner and specs (name -> (block name, shape, dtype)) can be sent to
+        other processes to attach to the same memory
+    """
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_arrays(specs):
+    """Attach to arrays shared by share_arrays(); returns (blocks, arrays)."""
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+
+def _init_worker(config, specs, world):
+    blocks, arrays = attach_arrays(specs)
+    _worker["blocks"] = blocks  # Keep the mappings alive for the worker's lifetime
+    _worker["arrays"] = arrays
+    _worker["planner"] = PathPlanner(config, world=world)
+
+
+def _plan_chunk(chunk):
+    planner = _worker["planner"]
+    obstacle_map = _worker["arrays"]["obstacle_map"]
+    return [(index, planner.plan_path(start, goal, obstacle_map)) for index, start, goal in chunk]
+
+
+def plan_many(queries, obstacle_map, config, workers=None, chunk_size=4, arrays=None, world=None):
+    """
+    Plan many start/goal pairs against one map on a pool of processes.
+
+    The obstacle map (and any extra derived arrays) is copied into shared
+    memory once; workers attach to it when they start instead of receiving a
+    pickled copy with every task. Results are yielded as soon as their chunk
+    completes, so they arrive out of order.
+
+    Args:
+        queries (list): (start, goal) pairs
+        obstacle_map (numpy.ndarray): The obstacle map
+        config (Config): Planner configuration
+        workers (int): Number of processes, defaults to the CPU count
+        chunk_size (int): Queries sent to a worker per task
+        arrays (dict): Extra named arrays to share with the workers
+        world (World): Rectangle obstacles, needed when PLANNER_MODE is "visibility"
+
+    Yields:
+        tuple: (query index, path)
+    """
+    workers = workers or os.cpu_count() or 1
+    shared = {"obstacle_map": np.asarray(obstacle_map)}
+    shared.update(arrays or {})
+    blocks, specs = share_arrays(shared)
+    try:
+        indexed = [(i, tuple(start), tuple(goal)) for i, (start, goal) in enumerate(queries)]
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(config, specs, world)) as pool:
+            pending = {pool.submit(_plan_chunk, chunk) for chunk in chunks}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            finally:
+                # Stop queued work if the caller stops consuming results early
+                for future in pending:
+                    future.cancel()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
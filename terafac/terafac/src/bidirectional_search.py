@@ -0,0 +1,101 @@
+import heapq
+import math
+
+from src.grid_search import GridGraph
+
+
+class BidirectionalPlanner:
+    """
+    Bidirectional A* that meets in the middle.
+
+    A forward search from the start and a reverse search from the goal run
+    alternately, always advancing the smaller frontier. Both use the
+    balanced potentials p_f(v) = (h(v, goal) - h(start, v)) / 2 and
+    p_r(v) = -p_f(v), which keep them consistent with each other. mu is the
+    cost of the best start-goal path seen where the two searches touch, and
+    the search stops once the two smallest keys can no longer beat it:
+    key_f + key_r >= mu. An enclosed start or goal empties one frontier
+    quickly, which ends the search without sweeping the rest of the map.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.last_expansions = 0
+
+    def plan(self, start, goal, obstacle_map, graph=None):
+        """
+        Plan a shortest path.
+
+        Args:
+            start (tuple): Start cell
+            goal (tuple): Goal cell
+            obstacle_map (numpy.ndarray): The obstacle map
+            graph (GridGraph): Prebuilt graph of obstacle_map, to skip rebuilding it
+
+        Returns:
+            list: Cells from start to goal, or [] if no path exists
+        """
+        if graph is None:
+            graph = GridGraph(obstacle_map, self.config.DIAGONAL_MOVEMENT)
+        self.last_expansions = 0
+        if not graph.is_free(start) or not graph.is_free(goal):
+            return []
+        start_index, goal_index = graph.index(start), graph.index(goal)
+        if start_index == goal_index:
+            return [graph.cell(start_index)]
+
+        to_goal = graph.heuristic_to(goal)
+        to_start = graph.heuristic_to(start)
+
+        def forward_potential(index):
+            return (to_goal(index) - to_start(index)) / 2.0
+
+        blocked, moves = graph.blocked, graph.moves
+        g = ([math.inf] * graph.size, [math.inf] * graph.size)
+        parent = ([-1] * graph.size, [-1] * graph.size)
+        closed = ([False] * graph.size, [False] * graph.size)
+        sign = (1.0, -1.0)  # The reverse potential is the negated forward one
+        g[0][start_index] = 0.0
+        g[1][goal_index] = 0.0
+        open_sets = (
+            [(forward_potential(start_index), start_index)],
+            [(-forward_potential(goal_index), goal_index)],
+        )
+
+        mu, meeting = math.inf, -1
+        while open_sets[0] and open_sets[1]:
+            if open_sets[0][0][0] + open_sets[1][0][0] >= mu:
+                break
+            side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+            own_g, other_g = g[side], g[1 - side]
+            own_parent, own_closed = parent[side], closed[side]
+            open_set = open_sets[side]
+            potential = sign[side]
+
+            _, index = heapq.heappop(open_set)
+            if own_closed[index]:
+                continue
+            own_closed[index] = True
+            self.last_expansions += 1
+            base = own_g[index]
+            for offset, cost in moves:
+                neighbor = index + offset
+                if blocked[neighbor]:
+                    continue
+                tentative = base + cost
+                if tentative < own_g[neighbor]:
+                    own_g[neighbor] = tentative
+                    own_parent[neighbor] = index
+                    heapq.heappush(open_set, (tentative + potential * forward_potential(neighbor), neighbor))
+                    if tentative + other_g[neighbor] < mu:
+                        mu, meeting = tentative + other_g[neighbor], neighbor
+
+        if meeting < 0:
+            print("No path found using bidirectional A*")
+            return []
+        path = graph.path(parent[0], meeting)
+        index = parent[1][meeting]
+        while index >= 0:
+            path.append(graph.cell(index))
+            index = parent[1][index]
+        return path
@@ -0,0 +1,105 @@
+import numpy as np
+
+# Squared distance used for "no obstacle seen yet"; large enough to lose to any
+# real distance but small enough to keep the parabola intersections precise
+_FAR = 1e12
+
+
+def _lower_envelope_1d(f):
+    """
+    Exact 1D squared distance transform along the last axis.
+
+    Implements the lower envelope of parabolas from Felzenszwalb and
+    Huttenlocher, processing every row at once so the Python loop only runs
+    over the columns.
+    """
+    rows, n = f.shape
+    row_index = np.arange(rows)
+    v = np.zeros((rows, n), dtype=np.intp)  # Parabola locations in the envelope
+    z = np.empty((rows, n + 1))  # Boundaries between envelope parabolas
+    z[:, 0] = -np.inf
+    z[:, 1] = np.inf
+    k = np.zeros(rows, dtype=np.intp)
+
+    for q in range(1, n):
+        fq = f[:, q] + q * q
+        while True:
+            vk = v[row_index, k]
+            s = (fq - (f[row_index, vk] + vk * vk)) / (2 * (q - vk))
+            pop = s <= z[row_index, k]
+            if not pop.any():
+                break
+            k[pop] -= 1
+        k += 1
+        v[row_index, k] = q
+        z[row_index, k] = s
+        z[row_index, k + 1] = np.inf
+
+    d = np.empty_like(f)
+    k[:] = 0
+    for q in range(n):
+        while True:
+            advance = z[row_index, k + 1] < q
+            if not advance.any():
+                break
+            k[advance] += 1
+        vk = v[row_index, k]
+        d[:, q] = (q - vk) ** 2 + f[row_index, vk]
+    return d
+
+
+def distance_transform(obstacle_map):
+    """
+    Compute the Euclidean distance from every cell to the nearest obstacle.
+
+    Args:
+        obstacle_map (numpy.ndarray): Map with non-zero obstacle cells
+
+    Returns:
+        numpy.ndarray: float32 distances with the same shape, 0 on obstacles
+    """
+    f = np.where(np.asarray(obstacle_map) != 0, 0.0, _FAR)
+    f = _lower_envelope_1d(f)
+    f = _lower_envelope_1d(np.ascontiguousarray(f.T)).T
+    return np.sqrt(np.minimum(f, _FAR)).astype(np.float32)
+
+
+class ClearanceStepPolicy:
+    """Size each move from the local clearance and how straight the path ahead is."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def step_length(self, clearance, position):
+        """Return the allowed step length at a position given the clearance field."""
+        x = min(max(int(round(position[0])), 0), clearance.shape[0] - 1)
+        y = min(max(int(round(position[1])), 0), clearance.shape[1] - 1)
+        free_space = float(clearance[x, y]) - self.config.ROBOT_RADIUS
+        length = free_space * self.config.CLEARANCE_STEP_GAIN
+        return min(max(length, self.config.MIN_STEP_SIZE), self.config.MAX_STEP_SIZE)
+
+    def choose_target(self, path, arc_length, index, clearance, position):
+        """
+        Pick the path point to move to from path[index].
+
+        The target is the furthest point within the clearance-based step length
+        whose straight-line distance is still close to the distance along the
+        path, so long moves are only made where the path is nearly straight.
+
+        Returns:
+            int: Index of the target point in the path
+        """
+        length = self.step_length(clearance, position)
+        end = np.searchsorted(arc_length, arc_length[index] + length, side="right")
+        candidates = np.arange(index + 1, max(end, index + 2))
+        candidates = candidates[candidates < len(path)]
+        if len(candidates) == 0:
+            return len(path) - 1
+
+        chord = np.hypot(path[candidates, 0] - path[index, 0], path[candidates, 1] - path[index, 1])
+        arc = arc_length[candidates] - arc_length[index]
+        straight = chord >= self.config.PATH_STRAIGHTNESS * arc
+        # Use the furthest candidate that is reached along a nearly straight path
+        bent = np.flatnonzero(~straight)
+        usable = candidates[:bent[0]] if len(bent) else candidates
+        return int(usable[-1]) if len(usable) else int(candidates[0])
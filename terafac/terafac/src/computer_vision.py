@@ -1,49 +1,143 @@
 import numpy as np
 # import cv2  # Temporarily disabled
+from src.occupancy_grid import LogOddsGrid
+from src.raycast import ray_angles
+from src.world import World, obstacle_extent
 
 class ComputerVision:
-    def __init__(self, config):
+    def __init__(self, config, world=None):
         self.config = config
+        # For now, use the known obstacle layout of the world the simulator loads
+        self.world = world if world is not None else World.load(config.WORLD_FILE)
+        self.known_obstacles = self.world.centers()
+        self.map_changed = False  # Whether the last detect_obstacles() call marked any new cells
 
-    def detect_obstacles(self, image, obstacle_map):
+    def obstacle_extents(self):
+        """Return the area (x_start, x_end, y_start, y_end) covered by each known obstacle."""
+        return [
+            (int(np.floor(o["x"])), int(np.ceil(o["x"] + o["width"])),
+             int(np.floor(o["y"])), int(np.ceil(o["y"] + o["height"])))
+            for o in self.world.obstacles
+        ]
+
+    def detect_obstacles(self, image, obstacle_map, position=None):
         """
         Detect obstacles in the captured image and update the obstacle map.
 
         Args:
             image (numpy.ndarray): The captured image
-            obstacle_map (numpy.ndarray): The obstacle map to update
+            obstacle_map (numpy.ndarray, OccupancyGrid or LogOddsGrid): The obstacle map to update
+            position (tuple): Robot position, limits a LogOddsGrid update to the field of view
 
         Returns:
             list: List of obstacle positions [(x1, y1), (x2, y2), ...]
         """
-        # For now, return known obstacle positions from the simulator
-        # Updated positions for the new obstacle layout with better spacing
-        known_obstacles = [
-            # Top row centers
-            (125, 110), (225, 110), (325, 110), (475, 110), (575, 110), (675, 110),
-            # Middle-left section centers
-            (110, 225), (110, 325),
-            # Center obstacles centers
-            (275, 260), (375, 210), (475, 260), (575, 210),
-            # Middle-right section centers
-            (690, 225), (690, 325),
-            # Bottom row centers
-            (125, 490), (225, 490), (375, 490), (475, 490), (625, 490),
-            # Additional strategic obstacles centers
-            (200, 345), (540, 345)
-        ]
+        self.map_changed = False
+        if isinstance(obstacle_map, LogOddsGrid):
+            self.observe(obstacle_map, position)
+            return self.known_obstacles
 
         # Update obstacle map with known obstacles
-        for obs_x, obs_y in known_obstacles:
-            # Mark a smaller area around each obstacle center (since obstacles are smaller now)
-            x_start = max(0, obs_x - 25)
-            x_end = min(self.config.MAP_SIZE[0], obs_x + 25)
-            y_start = max(0, obs_y - 25)
-            y_end = min(self.config.MAP_SIZE[1], obs_y + 25)
-
-            for i in range(x_start, x_end):
-                for j in range(y_start, y_end):
-                    if i < obstacle_map.shape[0] and j < obstacle_map.shape[1]:
-                        obstacle_map[i, j] = 1
-
-        return known_obstacles
+        for x_start, x_end, y_start, y_end in self.obstacle_extents():
+            x_start = max(0, x_start)
+            x_end = min(self.config.MAP_SIZE[0], obstacle_map.shape[0], x_end)
+            y_start = max(0, y_start)
+            y_end = min(self.config.MAP_SIZE[1], obstacle_map.shape[1], y_end)
+
+            # Only write obstacles not already fully marked, so a change is seen without scanning the map
+            if x_start < x_end and y_start < y_end and not obstacle_map[x_start:x_end, y_start:y_end].all():
+                obstacle_map[x_start:x_end, y_start:y_end] = 1
+                self.map_changed = True
+
+        return self.known_obstacles
+
+    def apply_changes(self, changes, obstacle_map):
+        """
+        Apply obstacle changes from the simulator's change feed to the world and the map.
+
+        Only the pixels of the changed obstacles are touched: a removed or
+        moved obstacle's old area is cleared and redrawn from the obstacles
+        still overlapping it, and a new or moved obstacle's area is marked.
+        A LogOddsGrid is left to pick the changes up from later observations.
+
+        Args:
+            changes (list): Changes from the feed, oldest first
+            obstacle_map (numpy.ndarray, OccupancyGrid or LogOddsGrid): The obstacle map to patch
+
+        Returns:
+            tuple: (changes as recorded by the world, map regions that were touched)
+        """
+        recorded, regions = [], []
+        for change in changes:
+            change = self.world.apply_change(change)
+            recorded.append(change)
+            if change["old"] is not None:
+                regions.append(obstacle_extent(change["old"]))
+                if not isinstance(obstacle_map, LogOddsGrid):
+                    x_start, x_end, y_start, y_end = regions[-1]
+                    obstacle_map[max(0, x_start):max(0, x_end), max(0, y_start):max(0, y_end)] = 0
+                    self.world.rasterize_region(obstacle_map, regions[-1])
+            if change["new"] is not None:
+                regions.append(obstacle_extent(change["new"]))
+                if not isinstance(obstacle_map, LogOddsGrid):
+                    self.world.rasterize_region(obstacle_map, regions[-1])
+        self.known_obstacles = self.world.centers()
+        return recorded, regions
+
+    def field_of_view(self, position, shape):
+        """Return the window (x_start, x_end, y_start, y_end) observed from a position."""
+        if position is None:
+            return 0, shape[0], 0, shape[1]
+        view = self.config.CAMERA_VIEW_RADIUS
+        x, y = int(round(position[0])), int(round(position[1]))
+        return max(0, x - view), min(shape[0], x + view), max(0, y - view), min(shape[1], y + view)
+
+    def observe(self, log_odds_grid, position=None):
+        """
+        Fuse one frame into a log-odds grid, touching only the field of view.
+
+        Returns:
+            int: Number of tiles whose binary view changed
+        """
+        x_start, x_end, y_start, y_end = self.field_of_view(position, log_odds_grid.shape)
+        occupied = np.zeros((x_end - x_start, y_end - y_start), dtype=bool)
+        for ox0, ox1, oy0, oy1 in self.obstacle_extents():
+            ox0, ox1 = max(ox0, x_start), min(ox1, x_end)
+            oy0, oy1 = max(oy0, y_start), min(oy1, y_end)
+            if ox0 < ox1 and oy0 < oy1:
+                occupied[ox0 - x_start:ox1 - x_start, oy0 - y_start:oy1 - y_start] = True
+        return log_odds_grid.update(x_start, y_start, occupied)
+
+    def integrate_scan(self, obstacle_map, origin, max_range, distances):
+        """
+        Mark the end points of a range scan in the obstacle map.
+
+        Rays that reached max_range saw nothing and are ignored. For a
+        LogOddsGrid the cells along each ray are also observed as free.
+
+        Returns:
+            int: Number of rays that hit an obstacle
+        """
+        distances = np.asarray(distances, dtype=np.float32)
+        angles = ray_angles(len(distances))
+        hits = distances < max_range
+        cos, sin = np.cos(angles), np.sin(angles)
+        width, height = obstacle_map.shape
+
+        # Step just past the measured distance so the end point lands inside the obstacle
+        hit_x = np.floor(origin[0] + (distances[hits] + 0.5) * cos[hits]).astype(np.intp)
+        hit_y = np.floor(origin[1] + (distances[hits] + 0.5) * sin[hits]).astype(np.intp)
+        inside = (hit_x >= 0) & (hit_x < width) & (hit_y >= 0) & (hit_y < height)
+        hit_x, hit_y = hit_x[inside], hit_y[inside]
+
+        if isinstance(obstacle_map, LogOddsGrid):
+            # Sample every ray at one pixel spacing up to just before its end point
+            steps = np.arange(int(np.ceil(min(float(distances.max(initial=0)), max_range))))
+            along = steps[None, :] < (distances[:, None] - 1.0)
+            free_x = np.floor(origin[0] + steps[None, :] * cos[:, None])[along].astype(np.intp)
+            free_y = np.floor(origin[1] + steps[None, :] * sin[:, None])[along].astype(np.intp)
+            keep = (free_x >= 0) & (free_x < width) & (free_y >= 0) & (free_y < height)
+            obstacle_map.update_cells(free_x[keep], free_y[keep], hit_x, hit_y)
+        else:
+            obstacle_map[hit_x, hit_y] = 1
+        return int(len(hit_x))
@@ -0,0 +1,121 @@
+import math
+from collections import deque
+import numpy as np
+
+_SQRT2 = math.sqrt(2.0)
+
+
+class GridGraph:
+    """
+    Flat, array-backed view of an obstacle map for grid searches.
+
+    Cells are addressed by a single integer into a map padded with a blocked
+    border, so neighbors are fixed offsets and need no bounds checks. Search
+    state (g values, parents) lives in flat lists of the same length rather
+    than in dictionaries keyed by tuples. Moves match PathPlanner.get_neighbors.
+    """
+
+    def __init__(self, obstacle_map, diagonal=True):
+        width, height = obstacle_map.shape
+        self.width = width
+        self.height = height
+        self.stride = height + 2
+        padded = np.ones((width + 2, height + 2), dtype=bool)
+        padded[1:-1, 1:-1] = np.asarray(obstacle_map) != 0
+        self.blocked = padded.ravel().tolist()
+        self.size = len(self.blocked)
+        s = self.stride
+        self.moves = [(s, 1.0), (-s, 1.0), (1, 1.0), (-1, 1.0)]
+        if diagonal:
+            self.moves += [(s + 1, _SQRT2), (s - 1, _SQRT2), (-s + 1, _SQRT2), (-s - 1, _SQRT2)]
+
+    def index(self, cell):
+        return (int(cell[0]) + 1) * self.stride + int(cell[1]) + 1
+
+    def update_region(self, obstacle_map, region):
+        """Copy cells in region (x_start, x_end, y_start, y_end) from a changed map, instead of rebuilding."""
+        x0, x1, y0, y1 = region
+        x0, x1 = max(x0, 0), min(x1, self.width)
+        y0, y1 = max(y0, 0), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        rows = (np.asarray(obstacle_map[x0:x1, y0:y1]) != 0).tolist()
+        for x, row in zip(range(x0, x1), rows):
+            start = self.index((x, y0))
+            self.blocked[start:start + y1 - y0] = row
+
+    def cell(self, index):
+        x, y = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def contains(self, cell):
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def is_free(self, cell):
+        return self.contains(cell) and not self.blocked[self.index(cell)]
+
+    def heuristic_to(self, goal):
+        """Return a function giving the Euclidean distance from a cell index to the goal."""
+        gx, gy = divmod(self.index(goal), self.stride)
+        stride = self.stride
+        hypot = math.hypot
+
+        def heuristic(index):
+            x, y = divmod(index, stride)
+            return hypot(x - gx, y - gy)
+        return heuristic
+
+    def path(self, parent, end):
+        """Follow parent links back from `end` and return the cells in forward order."""
+        cells = []
+        index = end
+        while index >= 0:
+            cells.append(self.cell(index))
+            index = parent[index]
+        cells.reverse()
+        return cells
+
+
+class ReverseFlood:
+    """
+    Breadth-first flood from the goal, advanced a few cells at a time.
+
+    Run alongside a forward search it proves a goal unreachable as soon as
+    the goal's own connected region is exhausted, which is cheap when the goal
+    is enclosed, instead of waiting for the forward search to sweep the
+    start's entire region.
+    """
+
+    def __init__(self, graph, goal, start):
+        self.graph = graph
+        self.start = graph.index(start)
+        goal = graph.index(goal)
+        self.seen = {goal}
+        self.frontier = deque([goal])
+        self.reached_start = goal == self.start
+
+    @property
+    def exhausted(self):
+        """True once the goal's region has been flooded without meeting the start."""
+        return not self.frontier and not self.reached_start
+
+    def advance(self, budget):
+        """Flood up to `budget` cells; does nothing once the start has been reached."""
+        if self.reached_start:
+            return
+        blocked = self.graph.blocked
+        moves = self.graph.moves
+        seen, frontier = self.seen, self.frontier
+        for _ in range(budget):
+            if not frontier:
+                return
+            index = frontier.popleft()
+            for offset, _ in moves:
+                neighbor = index + offset
+                if neighbor not in seen and not blocked[neighbor]:
+                    if neighbor == self.start:
+                        self.reached_start = True
+                        self.frontier.clear()
+                        return
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
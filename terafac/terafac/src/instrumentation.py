@@ -0,0 +1,268 @@
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque, Counter
+
+
+class RollingHistogram:
+    """Keep the most recent samples of a measurement for percentile queries."""
+
+    def __init__(self, window=1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        """Record a single sample."""
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p):
+        """Return the p-th percentile (0-100) of the samples in the window."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self):
+        """Summarize the lifetime totals and the rolling window percentiles."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": max(self.samples) if self.samples else 0.0,
+        }
+
+
+class HdrHistogram:
+    """
+    Log-linear bucketed histogram in the style of HdrHistogram.
+
+    Values are counted in units of `lowest`; each power-of-two range is split
+    into enough linear sub-buckets to keep the relative error below
+    10**-significant_digits. Recording is O(1) and memory stays fixed no
+    matter how many values are recorded.
+    """
+
+    def __init__(self, lowest=1e-6, highest=60.0, significant_digits=2):
+        self.unit = lowest
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_half = 1 << (self.sub_bucket_bits - 1)
+        self.max_units = int(highest / lowest)
+        self.counts = [0] * (self._index(self.max_units) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, units):
+        shift = max(0, units.bit_length() - self.sub_bucket_bits)
+        return self.sub_bucket_half * shift + (units >> shift)
+
+    def _bucket_value(self, index):
+        """Return the midpoint value of a bucket."""
+        shift = max(0, (index - 2 * self.sub_bucket_half) // self.sub_bucket_half + 1)
+        sub = index - self.sub_bucket_half * shift
+        return ((sub << shift) + ((1 << shift) - 1) / 2.0) * self.unit
+
+    def record(self, value):
+        """Record a single value, clamping it to the configured range."""
+        units = min(self.max_units, max(0, int(value / self.unit)))
+        index = self._index(units)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, p):
+        """Return the p-th percentile (0-100) of all recorded values."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Summarize the recorded values."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
+
+
+class SamplingProfiler:
+    """
+    Periodically sample the stack of one thread from a background thread.
+
+    Only the functions on the sampled stack are counted, so the cost on the
+    profiled thread is limited to the interpreter switching to the sampler.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id=None):
+        """Start sampling the given thread (defaults to the calling thread)."""
+        target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, target):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+                # Count each function once per sample so recursion is not inflated
+                if key not in seen:
+                    self.samples[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+    def top(self, n=10):
+        """Return the n functions seen on the most samples."""
+        return self.samples.most_common(n)
+
+
+class _Span:
+    """Context manager timing one stage with the monotonic clock."""
+
+    __slots__ = ("instrumentation", "name", "start", "profiler")
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.profiler = None
+
+    def __enter__(self):
+        profiler = self.instrumentation.profilers.get(self.name)
+        if profiler is not None:
+            profiler.start()
+            self.profiler = profiler
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.stop()
+        self.instrumentation.observe(self.name, elapsed)
+        return False
+
+
+class _NullSpan:
+    """Span used when instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """Collect stage timings, histograms and counters for the control loop."""
+
+    def __init__(self, enabled=True, window=1024, profile_stages=(), profile_interval=0.001):
+        self.enabled = enabled
+        self.window = window
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()  # Stages may be timed from several threads
+        self.profilers = {
+            stage: SamplingProfiler(profile_interval) for stage in profile_stages
+        } if enabled else {}
+
+    def span(self, name):
+        """Time the enclosed block and record it under the given stage name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, value):
+        """Record a value in the named rolling histogram."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1):
+        """Increase the named counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Return all collected metrics as plain Python data."""
+        return {
+            "histograms": {name: h.summary() for name, h in self.histograms.items()},
+            "counters": dict(self.counters),
+            "profiles": {
+                stage: profiler.top() for stage, profiler in self.profilers.items()
+            },
+        }
+
+    def to_json(self):
+        """Export the metrics as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="robot"):
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{prefix}_{name}"
+            summary = histogram.summary()
+            lines.append(f"# TYPE {metric} summary")
+            for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                lines.append(f'{metric}{{quantile="{quantile}"}} {summary[key]}')
+            lines.append(f"{metric}_sum {summary['sum']}")
+            lines.append(f"{metric}_count {summary['count']}")
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the metrics to a file, using Prometheus text for .prom files."""
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w") as f:
+            f.write(content)
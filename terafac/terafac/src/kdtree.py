@@ -0,0 +1,98 @@
+import heapq
+import numpy as np
+
+
+class KDTree:
+    """
+    Static k-d tree over 2D points for nearest-neighbor queries.
+
+    The tree is stored in flat arrays: every node owns a contiguous range of
+    the permuted point index and leaves of up to `leaf_size` points are
+    searched with a single vectorized distance computation.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+        self.split_dim = []
+        self.split_value = []
+        self.children = []  # (left, right) node ids, -1 for leaves
+        self.ranges = []  # (start, end) into self.order
+        if len(self.points):
+            self._build()
+        self.split_dim = np.array(self.split_dim, dtype=np.int8)
+        self.split_value = np.array(self.split_value)
+        self.children = np.array(self.children, dtype=np.int32).reshape(-1, 2)
+        self.ranges = np.array(self.ranges, dtype=np.int32).reshape(-1, 2)
+
+    def _new_node(self, start, end):
+        self.split_dim.append(-1)
+        self.split_value.append(0.0)
+        self.children.append([-1, -1])
+        self.ranges.append((start, end))
+        return len(self.ranges) - 1
+
+    def _build(self):
+        root = self._new_node(0, len(self.points))
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            start, end = self.ranges[node]
+            if end - start <= self.leaf_size:
+                continue
+            subset = self.points[self.order[start:end]]
+            dim = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+            mid = (end - start) // 2
+            partition = np.argpartition(subset[:, dim], mid)
+            self.order[start:end] = self.order[start:end][partition]
+            self.split_dim[node] = dim
+            self.split_value[node] = self.points[self.order[start + mid], dim]
+            left = self._new_node(start, start + mid)
+            right = self._new_node(start + mid, end)
+            self.children[node] = [left, right]
+            stack.extend((left, right))
+
+    def query(self, point, k=1, max_distance=np.inf):
+        """
+        Find the k nearest points to a query point.
+
+        Returns:
+            tuple: (distances, indices) sorted by distance, possibly fewer than k
+        """
+        if len(self.points) == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.intp)
+        px, py = float(point[0]), float(point[1])
+        best = []  # Max-heap of (-distance, index) holding the k best so far
+        bound = max_distance
+        stack = [(0, 0.0)]
+        while stack:
+            node, node_distance = stack.pop()
+            if node_distance > bound:
+                continue
+            dim = self.split_dim[node]
+            if dim < 0:
+                start, end = self.ranges[node]
+                ids = self.order[start:end]
+                candidates = self.points[ids]
+                distances = np.hypot(candidates[:, 0] - px, candidates[:, 1] - py)
+                for distance, index in zip(distances.tolist(), ids.tolist()):
+                    if distance > bound:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, index))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, index))
+                    if len(best) == k:
+                        bound = min(max_distance, -best[0][0])
+                continue
+            offset = (px if dim == 0 else py) - self.split_value[node]
+            near, far = self.children[node] if offset < 0 else self.children[node][::-1]
+            # Visit the near side first (pushed last)
+            stack.append((far, max(node_distance, abs(offset))))
+            stack.append((near, node_distance))
+
+        best.sort(reverse=True)
+        distances = np.array([-d for d, _ in best])
+        indices = np.array([i for _, i in best], dtype=np.intp)
+        return distances, indices
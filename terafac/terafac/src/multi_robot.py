@@ -0,0 +1,325 @@
+import heapq
+import itertools
+from collections import deque
+import numpy as np
+
+from src.tour_planning import downsample
+
+# Grid moves per time step: wait, 4 straight and 4 diagonal
+_MOVES = [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def crossing(a, b, rows):
+    """
+    The other diagonal of the square a diagonal move a -> b cuts through.
+
+    Two robots moving along both diagonals of the same square at once meet in
+    its middle. Returns the flat cells (c, d) of the other diagonal, or None
+    if the move is not diagonal.
+    """
+    ax, ay = divmod(a, rows)
+    bx, by = divmod(b, rows)
+    if ax == bx or ay == by:
+        return None
+    return (bx * rows + ay, ax * rows + by)
+
+
+class ReservationTable:
+    """
+    Space-time cells claimed by already planned robots.
+
+    Reservations are kept in hash sets of packed integers rather than an
+    (x, y, t) array: a vertex (cell, t) packs to t * cells + cell and a move
+    from one cell to another arriving at t packs to (t * cells + a) * cells + b.
+    Robots that have finished stay parked on their goal from then on.
+    """
+
+    def __init__(self, num_cells, rows):
+        self.num_cells = num_cells
+        self.rows = rows  # Grid rows, to find the cells a diagonal move crosses
+        self.vertices = set()
+        self.edges = set()
+        self.parked = {}  # cell -> time from which it is occupied forever
+        self.last_time = {}  # cell -> latest time it is reserved, for the goal test
+
+    def vertex_key(self, cell, t):
+        return t * self.num_cells + cell
+
+    def edge_key(self, a, b, t):
+        return (t * self.num_cells + a) * self.num_cells + b
+
+    def reserve_vertex(self, cell, t):
+        self.vertices.add(self.vertex_key(cell, t))
+        self.last_time[cell] = max(self.last_time.get(cell, -1), t)
+
+    def reserve_edge(self, a, b, t):
+        """
+        Forbid the moves that meet a robot moving a -> b arriving at t: from b
+        to a (a swap) and, for a diagonal move, along the other diagonal.
+        """
+        self.edges.add(self.edge_key(b, a, t))
+        cross = crossing(a, b, self.rows)
+        if cross is not None:
+            c, d = cross
+            self.edges.add(self.edge_key(c, d, t))
+            self.edges.add(self.edge_key(d, c, t))
+
+    def reserve_path(self, path, park=True):
+        """Reserve every cell of a path (one cell per time step), parking at its end."""
+        for t, cell in enumerate(path):
+            self.reserve_vertex(cell, t)
+            if t:
+                self.reserve_edge(path[t - 1], cell, t)
+        if park and path:
+            self.parked[path[-1]] = min(self.parked.get(path[-1], len(path) - 1), len(path) - 1)
+
+    def is_free(self, previous, cell, t):
+        """Whether a robot may move from `previous` into `cell` arriving at time t."""
+        if self.vertex_key(cell, t) in self.vertices:
+            return False
+        if cell in self.parked and t >= self.parked[cell]:
+            return False
+        return self.edge_key(previous, cell, t) not in self.edges
+
+    def free_after(self, cell, t):
+        """Whether a robot can stay on a cell from time t on."""
+        return self.last_time.get(cell, -1) < t and cell not in self.parked
+
+
+def step_distances(blocked, goal):
+    """Number of 8-connected moves from every cell to the goal, -1 where unreachable."""
+    cols, rows = blocked.shape
+    distance = np.full(blocked.shape, -1, dtype=np.int32)
+    if blocked[goal]:
+        return distance
+    distance[goal] = 0
+    queue = deque([goal])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in _MOVES[1:]:
+            nx, ny = x + dx, y + dy
+            if (0 <= nx < cols and 0 <= ny < rows and distance[nx, ny] < 0 and not blocked[nx, ny]
+                    and not (dx and dy and (blocked[nx, y] or blocked[x, ny]))):
+                distance[nx, ny] = distance[x, y] + 1
+                queue.append((nx, ny))
+    return distance
+
+
+def space_time_astar(blocked, start, goal, table, heuristic, max_time, avoid=None):
+    """
+    A* over (cell, time) avoiding the reservations in `table`.
+
+    Args:
+        blocked (numpy.ndarray): Boolean grid, True for blocked cells
+        start (tuple): Start cell
+        goal (tuple): Goal cell
+        table (ReservationTable): Reservations to avoid
+        heuristic (numpy.ndarray): Moves-to-goal per cell, from step_distances()
+        max_time (int): Time steps after which the search gives up
+        avoid (ReservationTable): Soft reservations; among equally short plans the
+            one crossing the fewest of them is preferred
+
+    Returns:
+        list: Flat cell index per time step, or None if no plan was found
+    """
+    cols, rows = blocked.shape
+    flat_blocked = blocked.ravel()
+    flat_heuristic = heuristic.ravel()
+    start_cell = start[0] * rows + start[1]
+    goal_cell = goal[0] * rows + goal[1]
+    if flat_heuristic[start_cell] < 0:
+        return None
+
+    num_cells = cols * rows
+    open_set = [(int(flat_heuristic[start_cell]), 0, 0, start_cell)]
+    came_from = {start_cell: None}  # Keyed by t * num_cells + cell
+    while open_set:
+        _, conflicts, t, cell = heapq.heappop(open_set)
+        if cell == goal_cell and table.free_after(cell, t):
+            path = []
+            key = t * num_cells + cell
+            while key is not None:
+                path.append(key % num_cells)
+                key = came_from[key]
+            path.reverse()
+            return path
+        if t >= max_time:
+            continue
+        x, y = divmod(cell, rows)
+        for dx, dy in _MOVES:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor = nx * rows + ny
+            if flat_blocked[neighbor] or (dx and dy and (flat_blocked[nx * rows + y] or flat_blocked[x * rows + ny])):
+                continue
+            key = (t + 1) * num_cells + neighbor
+            if key in came_from or not table.is_free(cell, neighbor, t + 1):
+                continue
+            came_from[key] = t * num_cells + cell
+            crossed = conflicts + (avoid is not None and not avoid.is_free(cell, neighbor, t + 1))
+            heapq.heappush(open_set, (t + 1 + int(flat_heuristic[neighbor]), crossed, t + 1, neighbor))
+    return None
+
+
+def find_conflict(paths, rows):
+    """
+    Return the first conflict between two paths, or None.
+
+    Paths are padded with their last cell; `rows` is the number of grid rows.
+    A conflict is (robot_a, robot_b, t, cell_a, cell_b): a vertex conflict if
+    both cells are equal, otherwise an edge conflict where robot_a moves from
+    cell_a to cell_b arriving at t and robot_b swaps with it or crosses the
+    same square along the other diagonal.
+    """
+    horizon = max(len(p) for p in paths)
+    for t in range(horizon):
+        at = [p[min(t, len(p) - 1)] for p in paths]
+        seen = {}
+        for robot, cell in enumerate(at):
+            if cell in seen:
+                return (seen[cell], robot, t, cell, cell)
+            seen[cell] = robot
+        if t == 0:
+            continue
+        before = [p[min(t - 1, len(p) - 1)] for p in paths]
+        moves = {(before[r], at[r]): r for r in range(len(paths)) if before[r] != at[r]}
+        for (a, b), robot in moves.items():
+            other = moves.get((b, a))
+            cross = crossing(a, b, rows)
+            if other is None and cross is not None:
+                other = moves.get(cross, moves.get(cross[::-1]))
+            if other is not None and other != robot:
+                return (robot, other, t, a, b)
+    return None
+
+
+class MultiRobotPlanner:
+    """
+    Plan collision-free paths for several robots sharing one map.
+
+    Robots move one cell (or wait) per time step on a grid of
+    MULTI_ROBOT_RESOLUTION pixel cells. Prioritized planning plans robots one
+    after another against a shared reservation table; conflict-based search
+    (CBS) finds sum-of-costs optimal plans for small teams.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.resolution = config.MULTI_ROBOT_RESOLUTION
+        self.blocked = None
+        self.nodes_expanded = 0  # CBS nodes of the most recent plan
+
+    def to_cell(self, point):
+        """Grid cell of a pixel position, moved to the nearest free cell if it is blocked."""
+        cell = (int(point[0]) // self.resolution, int(point[1]) // self.resolution)
+        if not self.blocked[cell]:
+            return cell
+        free = np.argwhere(~self.blocked)
+        nearest = free[np.argmin(np.hypot(free[:, 0] - cell[0], free[:, 1] - cell[1]))]
+        return (int(nearest[0]), int(nearest[1]))
+
+    def to_pixel(self, flat_cell):
+        x, y = divmod(int(flat_cell), self.blocked.shape[1])
+        half = self.resolution // 2
+        return (x * self.resolution + half, y * self.resolution + half)
+
+    def plan(self, starts, goals, obstacle_map, method="prioritized"):
+        """
+        Plan paths for all robots.
+
+        Args:
+            starts (list): Start position per robot in pixels
+            goals (list): Goal position per robot in pixels
+            obstacle_map (numpy.ndarray): Obstacle map, already grown by the robot radius
+            method (str): "prioritized" or "cbs"
+
+        Returns:
+            list: Per robot, one pixel position per time step, or None if planning failed
+        """
+        self.blocked = downsample(obstacle_map, self.resolution)
+        starts = [self.to_cell(s) for s in starts]
+        goals = [self.to_cell(g) for g in goals]
+        heuristics = [step_distances(self.blocked, g) for g in goals]
+        if method == "cbs":
+            paths = self.conflict_based_search(starts, goals, heuristics)
+        else:
+            paths = self.prioritized(starts, goals, heuristics)
+        if paths is None:
+            return None
+        return [[self.to_pixel(c) for c in path] for path in paths]
+
+    def prioritized(self, starts, goals, heuristics):
+        """Plan robots in order, each avoiding the ones planned before it."""
+        table = ReservationTable(self.blocked.size, self.blocked.shape[1])
+        paths = []
+        for start, goal, heuristic in zip(starts, goals, heuristics):
+            path = space_time_astar(self.blocked, start, goal, table, heuristic, self.config.MULTI_ROBOT_MAX_TIME)
+            if path is None:
+                return None
+            table.reserve_path(path)
+            paths.append(path)
+        return paths
+
+    def _constrained_path(self, start, goal, heuristic, constraints, others=()):
+        table = ReservationTable(self.blocked.size, self.blocked.shape[1])
+        for kind, t, a, b in constraints:
+            if kind == "vertex":
+                table.reserve_vertex(a, t)
+            else:
+                table.edges.add(table.edge_key(a, b, t))
+        # Prefer plans that keep out of the other robots' current paths
+        avoid = ReservationTable(self.blocked.size, self.blocked.shape[1])
+        for path in others:
+            avoid.reserve_path(path)
+        return space_time_astar(
+            self.blocked, start, goal, table, heuristic, self.config.MULTI_ROBOT_MAX_TIME, avoid
+        )
+
+    def conflict_based_search(self, starts, goals, heuristics):
+        """
+        Conflict-based search: plan robots independently, then branch on the
+        first conflict by forbidding it for one robot or the other.
+        """
+        counter = itertools.count()
+        constraints = [frozenset() for _ in starts]
+        paths = []
+        for start, goal, heuristic in zip(starts, goals, heuristics):
+            path = self._constrained_path(start, goal, heuristic, (), paths)
+            if path is None:
+                return None
+            paths.append(path)
+
+        open_set = [(sum(len(p) for p in paths), next(counter), constraints, paths)]
+        self.nodes_expanded = 0
+        while open_set and self.nodes_expanded < self.config.CBS_MAX_NODES:
+            _, _, constraints, paths = heapq.heappop(open_set)
+            self.nodes_expanded += 1
+            conflict = find_conflict(paths, self.blocked.shape[1])
+            if conflict is None:
+                return paths
+            robot_a, robot_b, t, cell_a, cell_b = conflict
+            if cell_a == cell_b:
+                branches = [(robot_a, ("vertex", t, cell_a, cell_a)), (robot_b, ("vertex", t, cell_a, cell_a))]
+            else:
+                # Forbid each robot's own move: the reverse for a swap, the other diagonal for a crossing
+                path_b = paths[robot_b]
+                move_b = (path_b[min(t - 1, len(path_b) - 1)], path_b[min(t, len(path_b) - 1)])
+                branches = [(robot_a, ("edge", t, cell_a, cell_b)), (robot_b, ("edge", t) + move_b)]
+            for robot, constraint in branches:
+                child = list(constraints)
+                child[robot] = constraints[robot] | {constraint}
+                others = paths[:robot] + paths[robot + 1:]
+                path = self._constrained_path(starts[robot], goals[robot], heuristics[robot], child[robot], others)
+                if path is None:
+                    continue
+                child_paths = list(paths)
+                child_paths[robot] = path
+                heapq.heappush(open_set, (sum(len(p) for p in child_paths), next(counter), child, child_paths))
+        print("Conflict-based search gave up")
+        return None
+
+
+def makespan(paths):
+    """Time steps until the last robot arrives."""
+    return max(len(p) for p in paths) - 1
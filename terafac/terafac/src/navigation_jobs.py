@@ -0,0 +1,129 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+
+class NavigationJob:
+    """One navigation request: a path to follow and a cancellation event."""
+
+    def __init__(self, job_id, path):
+        self.job_id = job_id
+        self.path = path
+        self.cancel_event = threading.Event()
+        self.status = "running"  # "running", "completed", "cancelled" or "preempted"
+        self.steps_done = 0
+        self.thread = None
+
+    def to_dict(self):
+        total = len(self.path)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "steps_done": self.steps_done,
+            "steps_total": total,
+            "progress": self.steps_done / total if total else 1.0,
+        }
+
+
+class NavigationJobManager:
+    """
+    Run navigation jobs one at a time for a single robot.
+
+    Starting a job preempts the running one: its cancel event is set and its
+    thread is joined before the new thread starts, so at most one mover
+    thread exists at any time. Workers wait on the cancel event between
+    simulation ticks instead of sleeping, so cancellation takes effect on the
+    next tick. Finished jobs are kept for status queries, newest `history`.
+    """
+
+    def __init__(self, step, tick=0.1, history=32, on_finish=None):
+        """
+        Args:
+            step (callable): Called with each path point to move the robot one tick
+            tick (float): Seconds between steps
+            history (int): Number of jobs kept for status queries
+            on_finish (callable): Called with a job once it stops, from its worker thread
+        """
+        self.step = step
+        self.tick = tick
+        self.history = history
+        self.on_finish = on_finish
+        self.lock = threading.Lock()
+        self.start_lock = threading.Lock()  # Serializes start() so preemption cannot interleave
+        self.jobs = OrderedDict()  # job_id -> NavigationJob
+        self.active = None
+        self.ids = itertools.count(1)
+
+    def start(self, path):
+        """Preempt the active job and start following `path`; returns the new job."""
+        with self.start_lock:
+            with self.lock:
+                previous = self.active
+                if previous is not None:
+                    previous.status = "preempted"
+                    previous.cancel_event.set()
+            if previous is not None:
+                previous.thread.join()
+
+            with self.lock:
+                job = NavigationJob(next(self.ids), path)
+                self.jobs[job.job_id] = job
+                while len(self.jobs) > self.history:
+                    self.jobs.popitem(last=False)
+                self.active = job
+                job.thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+                job.thread.start()
+            return job
+
+    def cancel(self, job_id=None, wait=False):
+        """
+        Cancel the active job, or only the given one if it is still active.
+
+        Args:
+            job_id (int): Job to cancel, None for whichever is active
+            wait (bool): Join the job's thread so the robot is still when this returns
+
+        Returns:
+            NavigationJob: The cancelled job, or None if nothing was cancelled
+        """
+        with self.lock:
+            job = self.active
+            if job is None or (job_id is not None and job.job_id != job_id):
+                return None
+            job.status = "cancelled"
+            job.cancel_event.set()
+        if wait:
+            job.thread.join()
+        return job
+
+    def status(self, job_id=None):
+        """Return the given job, the active job or the latest job, or None."""
+        with self.lock:
+            if job_id is not None:
+                return self.jobs.get(job_id)
+            if self.active is not None:
+                return self.active
+            return next(reversed(self.jobs.values()), None)
+
+    def active_threads(self):
+        """Number of mover threads still running (0 or 1)."""
+        with self.lock:
+            return sum(1 for job in self.jobs.values() if job.thread is not None and job.thread.is_alive())
+
+    def _run(self, job):
+        try:
+            for point in job.path:
+                if job.cancel_event.is_set():
+                    break
+                self.step(point)
+                job.steps_done += 1
+                if job.cancel_event.wait(self.tick):
+                    break
+        finally:
+            with self.lock:
+                if job.status == "running":
+                    job.status = "completed"
+                if self.active is job:
+                    self.active = None
+            if self.on_finish is not None:
+                self.on_finish(job)
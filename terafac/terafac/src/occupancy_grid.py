@@ -0,0 +1,335 @@
+import numpy as np
+
+
+class OccupancyGrid:
+    """
+    Bit-packed occupancy grid made of lazily allocated square tiles.
+
+    Cells are indexed as [x, y] like the dense obstacle maps. Each tile stores
+    tile_size x tile_size cells packed eight to a byte along y, and a tile is
+    only allocated once one of its cells is occupied, so large mostly-empty
+    maps cost little memory. The grid supports the subset of ndarray indexing
+    the planner and vision code use (`grid[x, y]` with integers or index
+    arrays, `grid[x0:x1, y0:y1]` reads and writes) and converts to a dense
+    array with np.asarray.
+    """
+
+    def __init__(self, shape, tile_size=64):
+        if tile_size % 8:
+            raise ValueError("tile_size must be a multiple of 8")
+        self.shape = tuple(shape)
+        self.ndim = 2
+        self.dtype = np.dtype(np.uint8)
+        self.tile_size = tile_size
+        self.tiles_shape = (-(-self.shape[0] // tile_size), -(-self.shape[1] // tile_size))
+        # Index into the tile pool for every tile, -1 while the tile is empty
+        self.tile_index = np.full(self.tiles_shape, -1, dtype=np.int32)
+        self.pool = np.zeros((4, tile_size, tile_size // 8), dtype=np.uint8)
+        self.free_slots = list(range(3, -1, -1))
+        self.dirty = set()  # Tiles whose contents changed since clear_dirty()
+
+    @classmethod
+    def from_dense(cls, array, tile_size=64):
+        """Build a grid from a dense array of occupied (non-zero) cells."""
+        grid = cls(np.shape(array), tile_size)
+        grid[0:grid.shape[0], 0:grid.shape[1]] = np.asarray(array) != 0
+        return grid
+
+    @property
+    def allocated_tiles(self):
+        """Number of tiles currently holding occupied cells."""
+        return int(np.count_nonzero(self.tile_index >= 0))
+
+    @property
+    def nbytes(self):
+        """Bytes used by the allocated tiles and the tile index."""
+        return self.allocated_tiles * self.pool[0].nbytes + self.tile_index.nbytes
+
+    def _allocate(self, tx, ty):
+        if not self.free_slots:
+            old = len(self.pool)
+            self.pool = np.concatenate([self.pool, np.zeros_like(self.pool)])
+            self.free_slots = list(range(len(self.pool) - 1, old - 1, -1))
+        slot = self.free_slots.pop()
+        self.pool[slot] = 0
+        self.tile_index[tx, ty] = slot
+        return slot
+
+    def _release(self, tx, ty):
+        self.free_slots.append(int(self.tile_index[tx, ty]))
+        self.tile_index[tx, ty] = -1
+
+    def _tile_ranges(self, start, stop, axis):
+        """Yield (tile, local start, local stop, offset into the query) along one axis."""
+        ts = self.tile_size
+        for tile in range(start // ts, (stop - 1) // ts + 1):
+            lo = max(start, tile * ts)
+            hi = min(stop, (tile + 1) * ts)
+            yield tile, lo - tile * ts, hi - tile * ts, lo - start
+
+    def get_cells(self, xs, ys):
+        """Return the occupancy (0 or 1) of the given cells in one vectorized gather."""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        ts = self.tile_size
+        slots = self.tile_index[xs // ts, ys // ts]
+        lx = xs % ts
+        ly = ys % ts
+        packed = self.pool[np.maximum(slots, 0), lx, ly >> 3]
+        bits = (packed >> (7 - (ly & 7))) & 1
+        return np.where(slots >= 0, bits, 0).astype(np.uint8)
+
+    def get_region(self, x0, x1, y0, y1):
+        """Return cells [x0:x1, y0:y1] as a dense uint8 array."""
+        out = np.zeros((max(0, x1 - x0), max(0, y1 - y0)), dtype=np.uint8)
+        if out.size == 0:
+            return out
+        for tx, lx0, lx1, ox in self._tile_ranges(x0, x1, 0):
+            for ty, ly0, ly1, oy in self._tile_ranges(y0, y1, 1):
+                slot = self.tile_index[tx, ty]
+                if slot < 0:
+                    continue
+                tile = np.unpackbits(self.pool[slot], axis=1)
+                out[ox:ox + lx1 - lx0, oy:oy + ly1 - ly0] = tile[lx0:lx1, ly0:ly1]
+        return out
+
+    def any_in_region(self, x0, x1, y0, y1):
+        """Return True if any cell in [x0:x1, y0:y1] is occupied."""
+        for tx, lx0, lx1, _ in self._tile_ranges(x0, x1, 0):
+            for ty, ly0, ly1, _ in self._tile_ranges(y0, y1, 1):
+                slot = self.tile_index[tx, ty]
+                if slot >= 0 and np.unpackbits(self.pool[slot], axis=1)[lx0:lx1, ly0:ly1].any():
+                    return True
+        return False
+
+    def set_region(self, x0, x1, y0, y1, value):
+        """
+        Set cells [x0:x1, y0:y1] to a scalar or an array of that shape.
+
+        Tiles are allocated on first occupancy and released when they become
+        empty. Only tiles whose contents actually change are marked dirty.
+        """
+        x0, x1 = max(0, x0), min(self.shape[0], x1)
+        y0, y1 = max(0, y0), min(self.shape[1], y1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        values = np.broadcast_to(np.asarray(value) != 0, (x1 - x0, y1 - y0))
+        for tx, lx0, lx1, ox in self._tile_ranges(x0, x1, 0):
+            for ty, ly0, ly1, oy in self._tile_ranges(y0, y1, 1):
+                block = values[ox:ox + lx1 - lx0, oy:oy + ly1 - ly0]
+                slot = self.tile_index[tx, ty]
+                if slot < 0:
+                    if not block.any():
+                        continue
+                    slot = self._allocate(tx, ty)
+                tile = np.unpackbits(self.pool[slot], axis=1)
+                if np.array_equal(tile[lx0:lx1, ly0:ly1], block):
+                    continue
+                tile[lx0:lx1, ly0:ly1] = block
+                self.pool[slot] = np.packbits(tile, axis=1)
+                self.dirty.add((tx, ty))
+                if not self.pool[slot].any():
+                    self._release(tx, ty)
+
+    def set_cells(self, xs, ys, value):
+        """Set individual cells to 0 or 1 with vectorized bit operations."""
+        xs = np.asarray(xs, dtype=np.intp).ravel()
+        ys = np.asarray(ys, dtype=np.intp).ravel()
+        values = np.broadcast_to(np.asarray(value) != 0, xs.shape)
+        if xs.size == 0:
+            return
+        ts = self.tile_size
+        tx, ty = xs // ts, ys // ts
+        # Allocate tiles that receive their first occupied cell
+        for tile_x, tile_y in set(zip(tx[values].tolist(), ty[values].tolist())):
+            if self.tile_index[tile_x, tile_y] < 0:
+                self._allocate(tile_x, tile_y)
+
+        slots = self.tile_index[tx, ty]
+        present = slots >= 0  # Clearing cells of empty tiles is a no-op
+        slots, xs, ys, values = slots[present], xs[present], ys[present], values[present]
+        tx, ty = tx[present], ty[present]
+        lx, byte = xs % ts, (ys % ts) >> 3
+        masks = (0x80 >> (ys & 7)).astype(np.uint8)
+
+        before = self.pool[slots, lx, byte].copy()
+        np.bitwise_or.at(self.pool, (slots[values], lx[values], byte[values]), masks[values])
+        np.bitwise_and.at(self.pool, (slots[~values], lx[~values], byte[~values]), ~masks[~values])
+        changed = self.pool[slots, lx, byte] != before
+        for tile_x, tile_y in set(zip(tx[changed].tolist(), ty[changed].tolist())):
+            self.dirty.add((tile_x, tile_y))
+            if not self.pool[self.tile_index[tile_x, tile_y]].any():
+                self._release(tile_x, tile_y)
+
+    def clear_dirty(self):
+        """Return the set of changed tiles and start tracking afresh."""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def count_nonzero(self):
+        """Number of occupied cells."""
+        slots = self.tile_index[self.tile_index >= 0]
+        return int(np.unpackbits(self.pool[slots]).sum())
+
+    def copy(self):
+        """Return an independent copy of the grid."""
+        grid = OccupancyGrid(self.shape, self.tile_size)
+        grid.tile_index = self.tile_index.copy()
+        grid.pool = self.pool.copy()
+        grid.free_slots = list(self.free_slots)
+        return grid
+
+    def to_dense(self):
+        """Return the whole grid as a dense uint8 array."""
+        return self.get_region(0, self.shape[0], 0, self.shape[1])
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def _slice_bounds(self, key, axis):
+        start, stop, step = key.indices(self.shape[axis])
+        if step != 1:
+            raise IndexError("OccupancyGrid only supports contiguous slices")
+        return start, stop
+
+    def __getitem__(self, key):
+        x, y = key
+        if isinstance(x, slice) and isinstance(y, slice):
+            return self.get_region(*self._slice_bounds(x, 0), *self._slice_bounds(y, 1))
+        if isinstance(x, slice) or isinstance(y, slice):
+            raise IndexError("OccupancyGrid does not support mixed slice and index access")
+        values = self.get_cells(x, y)
+        return values[()] if values.ndim == 0 else values
+
+    def __setitem__(self, key, value):
+        x, y = key
+        if isinstance(x, slice) and isinstance(y, slice):
+            self.set_region(*self._slice_bounds(x, 0), *self._slice_bounds(y, 1), value)
+        elif np.ndim(x) == 0 and np.ndim(y) == 0:
+            self.set_region(int(x), int(x) + 1, int(y), int(y) + 1, value)
+        elif isinstance(x, slice) or isinstance(y, slice):
+            raise IndexError("OccupancyGrid does not support mixed slice and index assignment")
+        else:
+            self.set_cells(x, y, value)
+
+
+class LogOddsGrid:
+    """
+    Probabilistic occupancy map that fuses repeated observations in log-odds form.
+
+    Each observation adds `hit` to the cells seen occupied and `miss` to the
+    cells seen free inside the observed window only, clamped so the map can
+    recover from bad detections. A thresholded binary view is kept as an
+    OccupancyGrid for the planner; after an update only the tiles in which a
+    cell crossed the threshold are rewritten.
+    """
+
+    def __init__(self, shape, tile_size=64, hit=0.85, miss=-0.4, clamp_min=-2.0, clamp_max=3.5, threshold=0.0):
+        self.shape = tuple(shape)
+        self.log_odds = np.zeros(self.shape, dtype=np.float32)
+        self.hit = hit
+        self.miss = miss
+        self.clamp_min = clamp_min
+        self.clamp_max = clamp_max
+        self.threshold = threshold
+        self.binary = OccupancyGrid(self.shape, tile_size)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a grid using the log-odds settings of a Config."""
+        return cls(
+            config.MAP_SIZE, config.OCCUPANCY_TILE_SIZE,
+            config.LOG_ODDS_HIT, config.LOG_ODDS_MISS,
+            config.LOG_ODDS_MIN, config.LOG_ODDS_MAX, config.LOG_ODDS_THRESHOLD
+        )
+
+    def probability(self):
+        """Return the occupancy probability of every cell."""
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
+
+    def update(self, x0, y0, occupied):
+        """
+        Fuse one observation of the window starting at (x0, y0).
+
+        Args:
+            x0 (int): First observed column
+            y0 (int): First observed row
+            occupied (numpy.ndarray): Boolean array, True where the observation saw an obstacle
+
+        Returns:
+            int: Number of tiles whose binary view changed
+        """
+        occupied = np.asarray(occupied, dtype=bool)
+        x1 = min(self.shape[0], x0 + occupied.shape[0])
+        y1 = min(self.shape[1], y0 + occupied.shape[1])
+        occupied = occupied[:x1 - x0, :y1 - y0]
+        region = self.log_odds[x0:x1, y0:y1]
+
+        before = region > self.threshold
+        region += np.where(occupied, np.float32(self.hit), np.float32(self.miss))
+        np.clip(region, self.clamp_min, self.clamp_max, out=region)
+        after = region > self.threshold
+
+        crossed = before != after
+        if not crossed.any():
+            return 0
+
+        # Reduce the crossings to one flag per tile overlapping the window
+        ts = self.binary.tile_size
+        x_edges = np.arange(x0 - x0 % ts, x1, ts)
+        y_edges = np.arange(y0 - y0 % ts, y1, ts)
+        x_starts = np.maximum(x_edges, x0) - x0
+        y_starts = np.maximum(y_edges, y0) - y0
+        tile_crossed = np.logical_or.reduceat(np.logical_or.reduceat(crossed, x_starts, axis=0), y_starts, axis=1)
+
+        tiles = np.argwhere(tile_crossed)
+        for i, j in tiles:
+            bx0, by0 = x_starts[i], y_starts[j]
+            bx1 = x_starts[i + 1] if i + 1 < len(x_starts) else x1 - x0
+            by1 = y_starts[j + 1] if j + 1 < len(y_starts) else y1 - y0
+            self.binary.set_region(x0 + bx0, x0 + bx1, y0 + by0, y0 + by1, after[bx0:bx1, by0:by1])
+        return len(tiles)
+
+    def update_cells(self, free_xs, free_ys, hit_xs, hit_ys):
+        """
+        Fuse an observation given as lists of free and occupied cells.
+
+        Used for range scans, where only the cells along each ray were seen.
+        Cells may repeat; each occurrence adds its hit or miss once.
+
+        Returns:
+            int: Number of cells whose binary state changed
+        """
+        xs = np.concatenate([np.asarray(free_xs, dtype=np.intp), np.asarray(hit_xs, dtype=np.intp)])
+        ys = np.concatenate([np.asarray(free_ys, dtype=np.intp), np.asarray(hit_ys, dtype=np.intp)])
+        if xs.size == 0:
+            return 0
+        deltas = np.concatenate([
+            np.full(len(free_xs), self.miss, dtype=np.float32),
+            np.full(len(hit_xs), self.hit, dtype=np.float32),
+        ])
+        before = self.log_odds[xs, ys] > self.threshold
+        np.add.at(self.log_odds, (xs, ys), deltas)
+        values = np.clip(self.log_odds[xs, ys], self.clamp_min, self.clamp_max)
+        self.log_odds[xs, ys] = values
+        after = values > self.threshold
+
+        crossed = before != after
+        if crossed.any():
+            self.binary.set_cells(xs[crossed], ys[crossed], after[crossed])
+        return int(np.count_nonzero(crossed))
+
+    # The binary view is what planners index into
+    def __getitem__(self, key):
+        return self.binary[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.binary.__array__(dtype)
+
+
+def count_occupied(obstacle_map):
+    """Count occupied cells in a dense obstacle map or an OccupancyGrid."""
+    if isinstance(obstacle_map, OccupancyGrid):
+        return obstacle_map.count_nonzero()
+    return int(np.count_nonzero(obstacle_map))
@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class PathFollower:
+    """
+    Follow a planned path and re-plan only when it is no longer usable.
+
+    The current plan is kept between steps. Before every move the remaining
+    part of it is checked against the obstacle map with a single gather, and a
+    new plan is computed only if the last move failed, the map changed along
+    the remaining path, or the robot drifted too far away from it.
+    """
+
+    def __init__(self, config, path_planner, instrumentation, step_policy=None):
+        self.config = config
+        self.path_planner = path_planner
+        self.instrumentation = instrumentation
+        self.step_policy = step_policy  # Sizes moves from clearance when a clearance field is given
+        self.path = None  # (N, 2) array of path cells
+        self.arc_length = None  # Cumulative distance along the path
+        self.index = 0  # Path point the robot is currently at
+        self.map_version = None
+        self.replans = 0
+        self.replans_avoided = 0
+
+    def reset(self):
+        """Forget the current plan."""
+        self.path = None
+        self.arc_length = None
+        self.index = 0
+        self.map_version = None
+
+    def replan(self, position, goal, obstacle_map, map_version):
+        """Plan a new path from the current position."""
+        with self.instrumentation.span("plan"):
+            path = self.path_planner.plan_path(position, goal, obstacle_map, map_version)
+        self.instrumentation.observe("plan_expansions", self.path_planner.last_expansions)
+        self.replans += 1
+        self.instrumentation.increment("replans")
+
+        if len(path) < 2:
+            self.reset()
+            return False
+        self.path = np.asarray(path, dtype=np.intp)
+        steps = np.hypot(*np.diff(self.path, axis=0).T)
+        self.arc_length = np.concatenate(([0.0], np.cumsum(steps)))
+        self.index = 0
+        self.map_version = map_version
+        return True
+
+    def replan_reason(self, position, obstacle_map, map_version, move_failed):
+        """Return why the current plan cannot be followed, or None if it can."""
+        if self.path is None:
+            return "no_plan"
+        if move_failed:
+            return "move_failed"
+
+        # Advance to the nearest path point in a window ahead of the robot
+        lookahead = max(self.config.STEP_SIZE, self.config.MAX_STEP_SIZE)
+        window = self.path[self.index:self.index + 4 * lookahead]
+        distances = np.hypot(window[:, 0] - position[0], window[:, 1] - position[1])
+        nearest = int(np.argmin(distances))
+        self.index += nearest
+        if distances[nearest] > self.config.REPLAN_DEVIATION_TOLERANCE:
+            return "deviation"
+
+        if map_version != self.map_version:
+            remaining = self.path[self.index:]
+            if obstacle_map[remaining[:, 0], remaining[:, 1]].any():
+                return "path_blocked"
+            self.map_version = map_version
+        return None
+
+    def next_waypoint(self, position, goal, obstacle_map, map_version, move_failed=False, clearance=None):
+        """
+        Return the next point to move towards, re-planning only when needed.
+
+        Args:
+            position (tuple): Current robot position
+            goal (tuple): Goal cell
+            obstacle_map (numpy.ndarray): The obstacle map
+            map_version (int): Changes whenever the obstacle map changes
+            move_failed (bool): Whether the previous move was rejected
+            clearance (numpy.ndarray): Distance to the nearest obstacle per cell, enables adaptive steps
+
+        Returns:
+            tuple: The waypoint along the path, or None if no path exists
+        """
+        reason = self.replan_reason(position, obstacle_map, map_version, move_failed)
+        if reason is None:
+            self.replans_avoided += 1
+            self.instrumentation.increment("replans_avoided")
+        else:
+            self.instrumentation.increment(f"replan_{reason}")
+            if not self.replan(position, goal, obstacle_map, map_version):
+                return None
+
+        if clearance is not None and self.step_policy is not None:
+            target = self.step_policy.choose_target(self.path, self.arc_length, self.index, clearance, position)
+            return tuple(int(v) for v in self.path[target])
+
+        # Look ahead as far along the path as one step allows
+        target = np.searchsorted(self.arc_length, self.arc_length[self.index] + self.config.STEP_SIZE, side="right") - 1
+        target = max(target, min(self.index + 1, len(self.path) - 1))
+        return tuple(int(v) for v in self.path[target])
@@ -1,10 +1,134 @@
 import math
+import time
 import numpy as np
 from queue import PriorityQueue
 
+from src.anytime_planning import AnytimePlanner
+from src.artifact_cache import world_key
+from src.bidirectional_search import BidirectionalPlanner
+from src.grid_search import GridGraph
+from src.prm import PRMPlanner, densify
+from src.quantization import GridQuantizer
+from src.visibility_graph import VisibilityGraphPlanner
+from src.world import World
+
 class PathPlanner:
-    def __init__(self, config):
+    def __init__(self, config, cache=None, world=None):
         self.config = config
+        self.cache = cache  # Optional ArtifactCache for planner artifacts
+        self.world = world  # Rectangle obstacles for the visibility planner; WORLD_FILE if not given
+        self.last_expansions = 0  # Nodes expanded by the most recent search
+        self.prm = None
+        self.visibility = None
+        self.anytime = AnytimePlanner(config)
+        self.bidirectional = BidirectionalPlanner(config)
+        self.graph = None  # GridGraph of the last map, reused while its version is unchanged
+        self.graph_version = None
+        self.quantizer = GridQuantizer.from_config(config)
+
+    def plan_path(self, start, goal, obstacle_map, map_version=None):
+        """
+        Plan a path between two world positions with the planner selected by PLANNER_MODE.
+
+        Continuous planners (PRM, visibility graph) take the positions as they
+        are. The visibility graph plans around the world's rectangles rather
+        than `obstacle_map`; apply_map_changes() keeps it in step with the
+        world. Grid planners work on cells: the positions are snapped to the
+        planning grid by the quantizer, and the cells of the resulting path
+        are mapped back to world positions.
+        """
+        if self.config.PLANNER_MODE == "prm":
+            return self.plan_path_prm(start, goal, obstacle_map, map_version)
+        if self.config.PLANNER_MODE == "visibility":
+            return densify(self.plan_waypoints_visibility(start, goal))
+
+        quantizer = self.quantizer
+        grid = quantizer.planning_grid(obstacle_map, map_version)
+        start_cell = quantizer.snap(start, grid)
+        goal_cell = quantizer.snap(goal, grid)
+        if start_cell is None or goal_cell is None:
+            print("Start or goal is inside an obstacle")
+            self.last_expansions = 0
+            return []
+        if self.config.PLANNER_MODE == "anytime":
+            cells = self.plan_path_anytime(start_cell, goal_cell, grid, map_version)
+        elif self.config.PLANNER_MODE == "bidirectional":
+            cells = self.plan_path_bidirectional(start_cell, goal_cell, grid, map_version)
+        else:
+            cells = self.plan_path_astar(start_cell, goal_cell, grid)
+        return quantizer.to_world_path(cells)
+
+    def plan_path_prm(self, start, goal, obstacle_map, map_version=None):
+        """Plan a path over a probabilistic roadmap, building the roadmap on first use."""
+        if self.prm is None:
+            self.prm = PRMPlanner(self.config, self.cache)
+            key = world_key(obstacle_map, self.config.ROBOT_RADIUS, 1) if self.cache is not None else None
+            self.prm.build(obstacle_map, key, map_version)
+        path = self.prm.plan(start, goal, obstacle_map, map_version)
+        self.last_expansions = self.prm.last_expansions
+        if not path:
+            print("No path found using PRM")
+        return path
+
+    def grid_graph(self, obstacle_map, map_version=None):
+        """Return the array-backed graph of a map, rebuilding it when the map version changes."""
+        if self.graph is None or map_version is None or map_version != self.graph_version:
+            self.graph = GridGraph(obstacle_map, self.config.DIAGONAL_MOVEMENT)
+            self.graph_version = map_version
+        return self.graph
+
+    def apply_map_changes(self, changes, regions, obstacle_map, from_version, to_version):
+        """
+        Patch planning state after world changes instead of rebuilding it.
+
+        Args:
+            changes (list): Changes recorded by World.apply_change(), already applied to the world
+            regions (list): Map regions (x_start, x_end, y_start, y_end) the changes touched
+            obstacle_map (numpy.ndarray): The patched obstacle map
+            from_version (int): Map version before the changes
+            to_version (int): Map version after the changes
+        """
+        quantizer = self.quantizer
+        if quantizer.grid is not None and quantizer.grid_version == from_version:
+            for region in regions:
+                quantizer.update_region(obstacle_map, region, to_version)
+        if self.graph is not None and self.graph_version == from_version:
+            # The graph is built on the planning grid, so patch it from there in grid cells
+            grid = quantizer.planning_grid(obstacle_map, to_version)
+            for region in regions:
+                self.graph.update_region(grid, quantizer.cell_region(region))
+            self.graph_version = to_version
+        if self.visibility is not None:
+            for change in changes:
+                self.visibility.apply_change(change)
+
+    def plan_path_anytime(self, start, goal, obstacle_map, map_version=None, deadline=None):
+        """Plan with ARA*, improving the path until the deadline (PLANNING_TIME_BUDGET from now by default)."""
+        if deadline is None:
+            deadline = time.perf_counter() + self.config.PLANNING_TIME_BUDGET
+        graph = self.grid_graph(obstacle_map, map_version)
+        path = self.anytime.plan(start, goal, obstacle_map, deadline, graph)
+        self.last_expansions = self.anytime.last_expansions
+        return path
+
+    def plan_path_bidirectional(self, start, goal, obstacle_map, map_version=None):
+        """Plan a shortest path with bidirectional A*, meeting in the middle."""
+        graph = self.grid_graph(obstacle_map, map_version)
+        path = self.bidirectional.plan(start, goal, obstacle_map, graph)
+        self.last_expansions = self.bidirectional.last_expansions
+        return path
+
+    def plan_waypoints_visibility(self, start, goal):
+        """Return the shortest corner-to-corner waypoint list around the world's rectangles."""
+        if self.visibility is None:
+            if self.world is None:
+                self.world = World.load(self.config.WORLD_FILE)
+            self.visibility = VisibilityGraphPlanner.from_world(self.world, self.config.ROBOT_RADIUS)
+        waypoints = self.visibility.plan(start, goal)
+        self.last_expansions = self.visibility.last_expansions
+        if not waypoints:
+            print("No path found using the visibility graph")
+        return [(int(round(x)), int(round(y))) for x, y in waypoints]
 
     def heuristic(self, a, b):
         """Calculate the heuristic (Euclidean distance) between two points."""
@@ -25,7 +149,7 @@ class PathPlanner:
             nx, ny = x + dx, y + dy
 
             # Check if the neighbor is within the map bounds
-            if 0 <= nx < self.config.MAP_SIZE[0] and 0 <= ny < self.config.MAP_SIZE[1]:
+            if 0 <= nx < obstacle_map.shape[0] and 0 <= ny < obstacle_map.shape[1]:
                 # Check if the neighbor is not an obstacle
                 if obstacle_map[nx, ny] == 0:
                     neighbors.append((nx, ny))
@@ -41,10 +165,12 @@ class PathPlanner:
         g_score = {start: 0}
         f_score = {start: self.heuristic(start, goal)}
         open_set_hash = {start}
+        self.last_expansions = 0
 
         while not open_set.empty():
             current = open_set.get()[1]
             open_set_hash.remove(current)
+            self.last_expansions += 1
 
             # If we've reached the goal, reconstruct the path
             if current == goal:
@@ -0,0 +1,187 @@
+import threading
+import numpy as np
+
+from src.transport import ReplayExhausted
+
+
+class Plan:
+    """A planned path tagged with the map and pose it was computed from."""
+
+    def __init__(self, path, generation, map_version, pose_generation):
+        self.path = path
+        self.generation = generation
+        self.map_version = map_version
+        self.pose_generation = pose_generation
+
+
+class PipelinedNavigator:
+    """
+    Overlap the sense, plan and act stages of the navigation loop.
+
+    A perception worker keeps capturing frames and publishing new map
+    snapshots, a planning worker keeps re-planning against the newest map and
+    pose, and the calling thread drives the robot along the latest plan that
+    is still valid for the current map. Every plan carries the map version and
+    pose generation it was computed from so stale plans can be discarded
+    explicitly.
+    """
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.config = robot.config
+        self.metrics = robot.instrumentation
+        self.stop_event = threading.Event()
+        self.condition = threading.Condition()
+
+        self.map_snapshot = robot.obstacle_map.copy()
+        self.map_version = 0
+        self.pose = None
+        self.pose_generation = 0
+        self.plan = None
+        self.plan_generation = 0
+
+    def perception_worker(self):
+        """Capture frames and publish a new map snapshot whenever it changes."""
+        working_map = self.map_snapshot.copy()
+        while not self.stop_event.is_set():
+            try:
+                with self.metrics.span("capture"):
+                    image = self.robot.robot_controller.capture_image()
+            except ReplayExhausted:
+                # The replayed log has no frames left; the driving loop ends the episode
+                return
+            if image is None:
+                self.metrics.increment("http_retries")
+                self.stop_event.wait(1)
+                continue
+
+            with self.metrics.span("detect"):
+                self.robot.computer_vision.detect_obstacles(image, working_map)
+
+            with self.condition:
+                if not np.array_equal(working_map, self.map_snapshot):
+                    self.map_snapshot = working_map.copy()
+                    self.map_version += 1
+                    self.condition.notify_all()
+
+            # Capture at roughly the same rate as the actuator moves
+            self.stop_event.wait(0.05)
+
+    def planning_worker(self):
+        """Re-plan whenever the map or the robot pose has changed."""
+        planned_for = None
+        while not self.stop_event.is_set():
+            with self.condition:
+                while (not self.stop_event.is_set() and
+                       (self.pose is None or planned_for == (self.map_version, self.pose_generation))):
+                    self.condition.wait(0.1)
+                if self.stop_event.is_set():
+                    return
+                obstacle_map = self.map_snapshot
+                map_version = self.map_version
+                pose = self.pose
+                pose_generation = self.pose_generation
+
+            with self.metrics.span("plan"):
+                path = self.robot.path_planner.plan_path(pose, self.robot.goal_position, obstacle_map, map_version)
+            self.metrics.observe("plan_expansions", self.robot.path_planner.last_expansions)
+            planned_for = (map_version, pose_generation)
+
+            with self.condition:
+                self.plan_generation += 1
+                self.plan = Plan(path, self.plan_generation, map_version, pose_generation)
+                self.condition.notify_all()
+
+    def publish_pose(self, position):
+        """Make a new robot pose available to the planning worker."""
+        # The planner works on pixel cells, so plan from the nearest one
+        cell = (int(round(position[0])), int(round(position[1])))
+        with self.condition:
+            self.pose = cell
+            self.pose_generation += 1
+            self.condition.notify_all()
+
+    def latest_waypoint(self, position):
+        """
+        Return the next waypoint from the latest valid plan, or None.
+
+        A plan is valid only for the current map version. It may have been
+        computed from an earlier pose as long as the robot is still on it.
+        """
+        with self.condition:
+            plan = self.plan
+            map_version = self.map_version
+        if plan is None or not plan.path:
+            return None
+        if plan.map_version != map_version:
+            self.metrics.increment("stale_plans")
+            return None
+
+        path = np.asarray(plan.path, dtype=float)
+        distances = np.hypot(path[:, 0] - position[0], path[:, 1] - position[1])
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > self.config.STEP_SIZE or nearest + 1 >= len(path):
+            return None
+        return plan.path[nearest + 1]
+
+    def run(self, max_steps=None):
+        """Drive the robot to the goal. Returns the number of steps taken."""
+        controller = self.robot.robot_controller
+        workers = [
+            threading.Thread(target=self.perception_worker, daemon=True),
+            threading.Thread(target=self.planning_worker, daemon=True),
+        ]
+        self.publish_pose(controller.current_position)
+        for worker in workers:
+            worker.start()
+
+        step_count = 0
+        last_plan_generation = 0
+        try:
+            while np.linalg.norm(np.array(controller.current_position) - np.array(self.robot.goal_position)) > 10:
+                if max_steps is not None and step_count >= max_steps:
+                    break
+
+                waypoint = self.latest_waypoint(controller.current_position)
+                if waypoint is None:
+                    with self.condition:
+                        plan = self.plan
+                        no_path = (plan is not None and not plan.path and
+                                   plan.map_version == self.map_version and
+                                   plan.pose_generation == self.pose_generation)
+                        if not no_path and self.plan_generation == last_plan_generation:
+                            # No usable plan yet; wait for the planner instead of spinning
+                            self.condition.wait(0.05)
+                        last_plan_generation = self.plan_generation
+                    if no_path:
+                        print("No path found. Trying to move randomly...")
+                        self.robot.random_escape()
+                        self.publish_pose(controller.current_position)
+                    continue
+
+                step_count += 1
+                self.metrics.increment("steps")
+                dx = waypoint[0] - controller.current_position[0]
+                dy = waypoint[1] - controller.current_position[1]
+                distance = np.sqrt(dx**2 + dy**2)
+                if distance > 0:
+                    dx = dx / distance * min(distance, self.config.STEP_SIZE)
+                    dy = dy / distance * min(distance, self.config.STEP_SIZE)
+                    with self.metrics.span("move"):
+                        moved = controller.move_robot_relative(dx, dy)
+                    if not moved:
+                        print("Move failed, trying random direction")
+                        self.metrics.increment("failed_moves")
+                        self.robot.random_escape()
+                    self.publish_pose(controller.current_position)
+
+                # Small delay to prevent overwhelming the server
+                controller.sleep(0.05)
+        finally:
+            self.stop_event.set()
+            with self.condition:
+                self.condition.notify_all()
+            for worker in workers:
+                worker.join(timeout=5)
+
+        return step_count
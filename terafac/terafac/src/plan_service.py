@@ -0,0 +1,108 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised when the plan queue is full; `retry_after` is a suggested wait in seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Planning queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PlanService:
+    """
+    Answer path queries for many clients from one shared planner.
+
+    Queries run on a fixed pool of worker threads. A query whose key is
+    already being planned joins that computation instead of starting a new
+    one, finished results are kept in an LRU cache, and once `max_pending`
+    distinct queries are queued or running, new ones are rejected with
+    Overloaded instead of waiting, so latency stays bounded under load.
+    """
+
+    def __init__(self, plan, workers=4, max_pending=32, cache_size=256):
+        """
+        Args:
+            plan (callable): Computes a result from the arguments given to submit()
+            workers (int): Worker threads
+            max_pending (int): Distinct queries queued or running before new ones are rejected
+            cache_size (int): Finished results kept
+        """
+        self.plan = plan
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="plan")
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # key -> result
+        self.in_flight = {}  # key -> Future shared by every caller of that key
+        self.plan_seconds = 0.0  # Moving average of one plan's duration
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "rejected": 0, "planned": 0}
+
+    def submit(self, key, *args):
+        """
+        Return a Future for the result of plan(*args), identified by `key`.
+
+        Raises:
+            Overloaded: If `max_pending` queries are already queued or running
+        """
+        with self.lock:
+            self.stats["requests"] += 1
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                future = Future()
+                future.set_result(self.cache[key])
+                return future
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future
+            if len(self.in_flight) >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise Overloaded(self._retry_after())
+            future = Future()
+            self.in_flight[key] = future
+        self.executor.submit(self._run, key, args, future)
+        return future
+
+    def clear(self):
+        """Drop cached results, e.g. after the map changes."""
+        with self.lock:
+            self.cache.clear()
+
+    def pending(self):
+        """Distinct queries queued or running."""
+        with self.lock:
+            return len(self.in_flight)
+
+    def _retry_after(self):
+        # Time for the workers to drain the current queue, in whole seconds
+        return max(1, math.ceil(self.plan_seconds * len(self.in_flight) / self.workers))
+
+    def _run(self, key, args, future):
+        start = time.perf_counter()
+        try:
+            result = self.plan(*args)
+        except Exception as e:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_exception(e)
+            return
+        elapsed = time.perf_counter() - start
+        # Cache before leaving the in-flight table so no caller misses both
+        with self.lock:
+            self.stats["planned"] += 1
+            if self.stats["planned"] == 1:
+                self.plan_seconds = elapsed
+            else:
+                self.plan_seconds += 0.1 * (elapsed - self.plan_seconds)
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            del self.in_flight[key]
+        future.set_result(result)
@@ -0,0 +1,283 @@
+import heapq
+import math
+from collections import OrderedDict
+import numpy as np
+
+from src.kdtree import KDTree
+
+
+def segments_free(obstacle_map, starts, ends):
+    """
+    Check many straight segments against the obstacle map at once.
+
+    Every segment is sampled at one-pixel spacing and all samples are looked
+    up in a single gather.
+
+    Args:
+        obstacle_map (numpy.ndarray): Map with non-zero obstacle cells
+        starts (numpy.ndarray): (E, 2) segment start points
+        ends (numpy.ndarray): (E, 2) segment end points
+
+    Returns:
+        numpy.ndarray: Boolean array, True for segments that cross no obstacle
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+    if len(starts) == 0:
+        return np.zeros(0, dtype=bool)
+    lengths = np.hypot(*(ends - starts).T)
+    samples = int(np.ceil(lengths.max())) + 1
+    t = np.linspace(0.0, 1.0, samples)
+    points = starts[:, None, :] + (ends - starts)[:, None, :] * t[None, :, None]
+    xs = np.clip(np.rint(points[..., 0]).astype(np.intp), 0, obstacle_map.shape[0] - 1)
+    ys = np.clip(np.rint(points[..., 1]).astype(np.intp), 0, obstacle_map.shape[1] - 1)
+    return ~np.asarray(obstacle_map[xs, ys]).astype(bool).any(axis=1)
+
+
+class Roadmap:
+    """Sampled free-space points connected by collision-free edges, stored as a CSR graph."""
+
+    def __init__(self, points, indptr, indices, weights):
+        self.points = points
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.tree = KDTree(points)
+
+    def arrays(self):
+        """Return the arrays needed to persist the roadmap."""
+        return {"points": self.points, "indptr": self.indptr, "indices": self.indices, "weights": self.weights}
+
+
+class PRMPlanner:
+    """
+    Probabilistic roadmap planner for large, mostly open maps.
+
+    The roadmap is built once per map: free points are sampled, connected to
+    their nearest neighbors (found with a k-d tree) when the straight segment
+    between them is free, and stored as a compact graph. Queries only connect
+    the start and goal to nearby roadmap nodes and run A* over that graph.
+    """
+
+    def __init__(self, config, cache=None):
+        self.config = config
+        self.cache = cache  # Optional ArtifactCache used to persist roadmaps
+        self.roadmap = None
+        self.built_version = None  # Map version the roadmap's edges were checked against
+        self.map_version = None
+        self.disabled = set()  # Roadmap edges found blocked on the current map
+        self.results = OrderedDict()  # LRU of (start, goal) -> path for the current map
+        self.last_expansions = 0
+
+    def artifact_name(self, part):
+        """Name of a cached roadmap array; includes the parameters the roadmap depends on."""
+        c = self.config
+        return f"prm-{part}-{c.PRM_SAMPLES}-{c.PRM_NEIGHBORS}-{c.PRM_CONNECTION_RADIUS}-{c.PRM_SEED}"
+
+    def build(self, obstacle_map, key=None, map_version=None):
+        """
+        Build (or load from the cache) the roadmap for a map.
+
+        Args:
+            obstacle_map (numpy.ndarray): Map with non-zero obstacle cells
+            key (str): World hash used to look the roadmap up in the cache
+            map_version (int): Version of the map the roadmap is built from
+        """
+        self.built_version = map_version
+        self.map_version = map_version
+        self.disabled = set()
+        self.results.clear()
+        if self.cache is not None and key is not None:
+            parts = {part: self.cache.load(self.artifact_name(part), key)
+                     for part in ("points", "indptr", "indices", "weights")}
+            if all(array is not None for array in parts.values()):
+                self.roadmap = Roadmap(**parts)
+                return self.roadmap
+
+        self.roadmap = self._build(obstacle_map)
+        if self.cache is not None and key is not None:
+            for part, array in self.roadmap.arrays().items():
+                self.cache.store(self.artifact_name(part), key, array)
+        return self.roadmap
+
+    def _build(self, obstacle_map):
+        config = self.config
+        width, height = obstacle_map.shape
+        rng = np.random.default_rng(config.PRM_SEED)
+
+        # Sample in batches and keep only free points
+        points = np.zeros((0, 2), dtype=np.intp)
+        for _ in range(20):
+            needed = config.PRM_SAMPLES - len(points)
+            if needed <= 0:
+                break
+            candidates = np.column_stack([
+                rng.integers(0, width, 2 * needed),
+                rng.integers(0, height, 2 * needed),
+            ])
+            free = np.asarray(obstacle_map[candidates[:, 0], candidates[:, 1]]) == 0
+            points = np.vstack([points, candidates[free][:needed]])
+        points = np.unique(points, axis=0).astype(float)
+        tree = KDTree(points)
+
+        # Candidate edges to each point's nearest neighbors, deduplicated
+        sources, targets = [], []
+        for i, point in enumerate(points):
+            _, neighbors = tree.query(point, k=config.PRM_NEIGHBORS + 1, max_distance=config.PRM_CONNECTION_RADIUS)
+            neighbors = neighbors[neighbors > i]
+            sources.extend([i] * len(neighbors))
+            targets.extend(neighbors.tolist())
+        sources = np.array(sources, dtype=np.intp)
+        targets = np.array(targets, dtype=np.intp)
+        edges = np.unique(np.column_stack([sources, targets]).reshape(-1, 2), axis=0)
+
+        free = np.zeros(len(edges), dtype=bool)
+        for chunk in range(0, len(edges), 4096):
+            part = edges[chunk:chunk + 4096]
+            free[chunk:chunk + 4096] = segments_free(obstacle_map, points[part[:, 0]], points[part[:, 1]])
+        edges = edges[free]
+
+        # Store both directions in CSR form
+        both = np.vstack([edges, edges[:, ::-1]])
+        both = both[np.lexsort((both[:, 1], both[:, 0]))]
+        indptr = np.searchsorted(both[:, 0], np.arange(len(points) + 1)).astype(np.int32)
+        indices = both[:, 1].astype(np.int32)
+        weights = np.hypot(*(points[both[:, 0]] - points[both[:, 1]]).T).astype(np.float32)
+        return Roadmap(points, indptr, indices, weights)
+
+    def _connect(self, point, obstacle_map):
+        """Return (node ids, distances) of roadmap nodes reachable in a straight line from a point."""
+        distances, nodes = self.roadmap.tree.query(point, k=self.config.PRM_NEIGHBORS)
+        if len(nodes) == 0:
+            return nodes, distances
+        free = segments_free(obstacle_map, np.repeat([point], len(nodes), axis=0), self.roadmap.points[nodes])
+        return nodes[free], distances[free]
+
+    def plan(self, start, goal, obstacle_map, map_version=None):
+        """
+        Plan from start to goal over the roadmap.
+
+        Roadmap edges are checked against the map they were built from. When
+        the map has changed since, the edges of a found route are re-checked
+        and blocked ones are disabled before searching again (lazy PRM), so
+        newly detected obstacles do not force a rebuild.
+
+        Args:
+            start (tuple): Start cell
+            goal (tuple): Goal cell
+            obstacle_map (numpy.ndarray): Current obstacle map
+            map_version (int): Changes whenever the obstacle map changes
+
+        Returns:
+            list: Cells of the path from start to goal at one-pixel spacing, or [] if none was found
+        """
+        start = (int(start[0]), int(start[1]))
+        goal = (int(goal[0]), int(goal[1]))
+        if map_version != self.map_version:
+            self.map_version = map_version
+            self.disabled = set()
+            self.results.clear()
+
+        query = (start, goal)
+        if query in self.results:
+            self.results.move_to_end(query)
+            self.last_expansions = 0
+            return self.results[query]
+
+        path = densify(self._plan(start, goal, obstacle_map))
+        self.results[query] = path
+        if len(self.results) > self.config.PRM_QUERY_CACHE_SIZE:
+            self.results.popitem(last=False)
+        return path
+
+    def _plan(self, start, goal, obstacle_map):
+        self.last_expansions = 0
+        if segments_free(obstacle_map, [start], [goal])[0]:
+            return [start, goal]
+
+        start_nodes, start_costs = self._connect(start, obstacle_map)
+        goal_nodes, goal_costs = self._connect(goal, obstacle_map)
+        if len(start_nodes) == 0 or len(goal_nodes) == 0:
+            return []
+
+        points = self.roadmap.points
+        while True:
+            nodes = self._search(start_nodes, start_costs, goal_nodes, goal_costs, goal)
+            if not nodes:
+                return []
+            if self.map_version == self.built_version or len(nodes) < 2:
+                break
+            # The map changed since the roadmap was built: validate the route's edges
+            pairs = np.column_stack([nodes[:-1], nodes[1:]])
+            blocked = ~segments_free(obstacle_map, points[pairs[:, 0]], points[pairs[:, 1]])
+            if not blocked.any():
+                break
+            for u, v in pairs[blocked].tolist():
+                self.disabled.add((u, v))
+                self.disabled.add((v, u))
+
+        return [start] + [tuple(int(v) for v in points[n]) for n in nodes] + [goal]
+
+    def _search(self, start_nodes, start_costs, goal_nodes, goal_costs, goal):
+        """A* over the roadmap graph; returns the node ids of the best route."""
+        roadmap = self.roadmap
+        points = roadmap.points
+        disabled = self.disabled
+        goal_cost = dict(zip(goal_nodes.tolist(), goal_costs.tolist()))
+        gx, gy = float(goal[0]), float(goal[1])
+
+        def heuristic(node):
+            return math.hypot(points[node, 0] - gx, points[node, 1] - gy)
+
+        g_score = {}
+        came_from = {}
+        open_set = []
+        for node, cost in zip(start_nodes.tolist(), start_costs.tolist()):
+            g_score[node] = cost
+            came_from[node] = None
+            heapq.heappush(open_set, (cost + heuristic(node), node))
+
+        best_cost, best_last = math.inf, None
+        closed = set()
+        while open_set:
+            f, node = heapq.heappop(open_set)
+            if f >= best_cost:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            self.last_expansions += 1
+            g = g_score[node]
+            if node in goal_cost and g + goal_cost[node] < best_cost:
+                best_cost, best_last = g + goal_cost[node], node
+            for edge in range(roadmap.indptr[node], roadmap.indptr[node + 1]):
+                neighbor = int(roadmap.indices[edge])
+                if disabled and (node, neighbor) in disabled:
+                    continue
+                tentative = g + float(roadmap.weights[edge])
+                if tentative < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = node
+                    heapq.heappush(open_set, (tentative + heuristic(neighbor), neighbor))
+
+        nodes = []
+        node = best_last
+        while node is not None:
+            nodes.append(node)
+            node = came_from[node]
+        nodes.reverse()
+        return nodes
+
+
+def densify(waypoints):
+    """Expand a list of waypoints into consecutive cells along the straight segments between them."""
+    if len(waypoints) < 2:
+        return list(waypoints)
+    path = [tuple(waypoints[0])]
+    for (x0, y0), (x1, y1) in zip(waypoints[:-1], waypoints[1:]):
+        steps = max(abs(x1 - x0), abs(y1 - y0))
+        for i in range(1, steps + 1):
+            cell = (int(round(x0 + (x1 - x0) * i / steps)), int(round(y0 + (y1 - y0) * i / steps)))
+            if cell != path[-1]:
+                path.append(cell)
+    return path
@@ -0,0 +1,44 @@
+import struct
+
+# Media type of the fixed-layout binary control messages below
+BINARY_MIME = "application/x-robot-control"
+
+# Little-endian, unpadded layouts
+_MOVE = struct.Struct("<ff")  # dx, dy
+_POSE = struct.Struct("<ffhB")  # x, y, orientation in degrees, moving
+_MOVE_RESULT = struct.Struct("<BffhB")  # success, then the pose after the move
+
+
+def is_binary(response):
+    """Whether a response (requests or Flask) carries a binary control message."""
+    return str(response.headers.get("Content-Type", "")).startswith(BINARY_MIME)
+
+
+def encode_move(dx, dy):
+    return _MOVE.pack(dx, dy)
+
+
+def decode_move(data):
+    """Return (dx, dy) from a /move_rel request body."""
+    return _MOVE.unpack(data)
+
+
+def encode_pose(state):
+    """Pack a robot state dict (x, y, orientation, moving)."""
+    return _POSE.pack(state["x"], state["y"], int(state["orientation"]), bool(state["moving"]))
+
+
+def decode_pose(data):
+    """Return the robot state dict packed by encode_pose()."""
+    x, y, orientation, moving = _POSE.unpack(data)
+    return {"x": x, "y": y, "orientation": orientation, "moving": bool(moving)}
+
+
+def encode_move_result(success, state):
+    return _MOVE_RESULT.pack(bool(success), state["x"], state["y"], int(state["orientation"]), bool(state["moving"]))
+
+
+def decode_move_result(data):
+    """Return (success, robot state dict) from a /move_rel response body."""
+    success, x, y, orientation, moving = _MOVE_RESULT.unpack(data)
+    return bool(success), {"x": x, "y": y, "orientation": orientation, "moving": bool(moving)}
@@ -0,0 +1,94 @@
+import numpy as np
+
+from src.tour_planning import downsample
+
+
+class GridQuantizer:
+    """
+    Map continuous robot poses to planning-grid cells and back.
+
+    The simulator reports float positions, while the grid planners need
+    integer cells and an exact goal cell to terminate. Poses are snapped to
+    cells of `resolution` pixels; a start or goal that falls on a blocked cell
+    is moved to the nearest free cell within `tolerance` pixels (the goal
+    region), and planned cells are mapped back to world coordinates.
+    """
+
+    def __init__(self, resolution=1, tolerance=10):
+        self.resolution = max(1, int(resolution))
+        self.tolerance = tolerance
+        self.grid = None  # Planning grid of the last map, reused while its version is unchanged
+        self.grid_version = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.PLANNING_RESOLUTION, config.GOAL_TOLERANCE)
+
+    def planning_grid(self, obstacle_map, map_version=None):
+        """Return the obstacle map at planning resolution; the map itself at resolution 1."""
+        if self.resolution == 1:
+            return obstacle_map
+        if self.grid is None or map_version is None or map_version != self.grid_version:
+            self.grid = downsample(obstacle_map, self.resolution).astype(np.uint8)
+            self.grid_version = map_version
+        return self.grid
+
+    def cell_region(self, region):
+        """Grid cells (x_start, x_end, y_start, y_end) covering a pixel region."""
+        r = self.resolution
+        x0, x1, y0, y1 = region
+        return (max(x0, 0) // r, -(-x1 // r), max(y0, 0) // r, -(-y1 // r))
+
+    def update_region(self, obstacle_map, region, map_version=None):
+        """Recompute the coarse cells covering a changed pixel region (x_start, x_end, y_start, y_end)."""
+        if self.resolution == 1 or self.grid is None:
+            return
+        r = self.resolution
+        cx0, cx1, cy0, cy1 = self.cell_region(region)
+        cx1, cy1 = min(cx1, self.grid.shape[0]), min(cy1, self.grid.shape[1])
+        if cx0 < cx1 and cy0 < cy1:
+            pixels = obstacle_map[cx0 * r:cx1 * r, cy0 * r:cy1 * r]
+            self.grid[cx0:cx1, cy0:cy1] = downsample(pixels, r)
+        self.grid_version = map_version
+
+    def to_cell(self, position, shape):
+        """Integer cell for a world position, clamped to the grid."""
+        if self.resolution == 1:
+            # Pixel cells are addressed by their center, so round to the nearest one
+            x, y = int(round(float(position[0]))), int(round(float(position[1])))
+        else:
+            x, y = int(float(position[0]) // self.resolution), int(float(position[1]) // self.resolution)
+        return (min(max(x, 0), shape[0] - 1), min(max(y, 0), shape[1] - 1))
+
+    def to_world(self, cell):
+        """World position of a cell: the cell itself at resolution 1, otherwise its center."""
+        if self.resolution == 1:
+            return (int(cell[0]), int(cell[1]))
+        half = self.resolution // 2
+        return (int(cell[0]) * self.resolution + half, int(cell[1]) * self.resolution + half)
+
+    def snap(self, position, grid):
+        """
+        Return the free cell for a position, or None if there is none in the goal region.
+
+        Returns the position's own cell when it is free, otherwise the nearest
+        free cell within `tolerance` pixels.
+        """
+        cx, cy = self.to_cell(position, grid.shape)
+        if not grid[cx, cy]:
+            return (cx, cy)
+        radius = int(np.ceil(self.tolerance / self.resolution))
+        x0, y0 = max(cx - radius, 0), max(cy - radius, 0)
+        window = np.asarray(grid[x0:cx + radius + 1, y0:cy + radius + 1])
+        free = np.argwhere(window == 0)
+        if len(free) == 0:
+            return None
+        distances = np.hypot(free[:, 0] + x0 - cx, free[:, 1] + y0 - cy)
+        best = int(np.argmin(distances))
+        if distances[best] * self.resolution > self.tolerance:
+            return None
+        return (int(free[best, 0]) + x0, int(free[best, 1]) + y0)
+
+    def to_world_path(self, cells):
+        """Map a path of cells back to world positions."""
+        return [self.to_world(c) for c in cells]
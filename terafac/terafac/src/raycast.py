@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def ray_angles(num_rays):
+    """Return the world-frame angles of an evenly spaced scan, starting at 0 radians."""
+    return np.linspace(0.0, 2.0 * np.pi, num_rays, endpoint=False)
+
+
+def cast_rays(origin, angles, rects, max_range, bounds=None):
+    """
+    Cast rays against axis-aligned rectangles in one broadcasting pass.
+
+    Uses the slab method: for every ray/rectangle pair the entry distance is
+    the largest of the per-axis near intersections and the exit distance the
+    smallest of the far ones; the ray hits if it enters before it exits.
+
+    Args:
+        origin (tuple): Ray origin (x, y)
+        angles (numpy.ndarray): Ray angles in radians
+        rects (numpy.ndarray): (M, 4) array of x, y, width, height
+        max_range (float): Distance reported for rays that hit nothing
+        bounds (tuple): Optional map size (width, height); its edges stop rays too
+
+    Returns:
+        numpy.ndarray: float32 distance per ray
+    """
+    ox, oy = float(origin[0]), float(origin[1])
+    dx = np.cos(angles)
+    dy = np.sin(angles)
+    # Avoid 0 * inf for rays parallel to an axis
+    dx = np.where(np.abs(dx) < 1e-12, 1e-12, dx)
+    dy = np.where(np.abs(dy) < 1e-12, 1e-12, dy)
+    inv_x = (1.0 / dx)[:, None]
+    inv_y = (1.0 / dy)[:, None]
+
+    distances = np.full(len(angles), float(max_range))
+    if len(rects):
+        rects = np.asarray(rects, dtype=float)
+        tx1 = (rects[:, 0] - ox) * inv_x
+        tx2 = (rects[:, 0] + rects[:, 2] - ox) * inv_x
+        ty1 = (rects[:, 1] - oy) * inv_y
+        ty2 = (rects[:, 1] + rects[:, 3] - oy) * inv_y
+        t_enter = np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2))
+        t_exit = np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2))
+        hit = t_exit >= np.maximum(t_enter, 0.0)
+        # A ray starting inside a rectangle hits it immediately
+        t_hit = np.where(hit, np.maximum(t_enter, 0.0), np.inf)
+        distances = np.minimum(distances, t_hit.min(axis=1))
+
+    if bounds is not None:
+        # Distance to leave the map through its far edge on each axis
+        wall_x = np.where(dx > 0, (bounds[0] - ox) / dx, -ox / dx)
+        wall_y = np.where(dy > 0, (bounds[1] - oy) / dy, -oy / dy)
+        distances = np.minimum(distances, np.maximum(np.minimum(wall_x, wall_y), 0.0))
+
+    return distances.astype(np.float32)
@@ -1,10 +1,21 @@
-import requests
 import numpy as np
+from src import protocol
+from src.transport import HttpTransport, ReplayExhausted
 # import cv2  # Temporarily disabled
 
 class RobotController:
-    def __init__(self, simulator_url):
+    def __init__(self, simulator_url, transport=None, binary=True):
+        """
+        Args:
+            simulator_url (str): Base URL of the simulator
+            transport: Sends the requests; HttpTransport(simulator_url) by default,
+                or a RecordingTransport / ReplayTransport from src/transport.py
+            binary (bool): Use the binary control messages of src/protocol.py for
+                /position and /move_rel, falling back to JSON if the simulator lacks them
+        """
         self.simulator_url = simulator_url
+        self.transport = transport if transport is not None else HttpTransport(simulator_url)
+        self.binary = binary
         self.current_position = None
         self.current_orientation = None
         self.collision_count = 0
@@ -12,7 +23,7 @@ class RobotController:
     def capture_image(self):
         """Capture an image from the robot's camera using the /capture endpoint."""
         try:
-            response = requests.get(f"{self.simulator_url}/capture", timeout=5)
+            response = self.transport.get("/capture")
             if response.status_code == 200:
                 # For now, return a dummy image since we simplified the camera
                 # Create a simple 480x640x3 image
@@ -21,22 +32,53 @@ class RobotController:
             else:
                 print(f"Error capturing image: {response.status_code}")
                 return None
+        except ReplayExhausted:
+            raise
         except Exception as e:
             print(f"Exception capturing image: {str(e)}")
             return None
 
+    def scan(self, num_rays=360, max_range=300.0):
+        """
+        Read the range sensor using the /scan endpoint.
+
+        Returns:
+            tuple: (origin (x, y), max_range, float32 distances per ray) or None on failure
+        """
+        try:
+            response = self.transport.get("/scan", params={"rays": num_rays, "max_range": max_range})
+            if response.status_code == 200:
+                # View the response body directly instead of copying it
+                distances = np.frombuffer(response.content, dtype='<f4')
+                origin = tuple(float(v) for v in response.headers['X-Scan-Origin'].split(','))
+                return origin, float(response.headers.get('X-Scan-Max-Range', max_range)), distances
+            else:
+                print(f"Error reading scan: {response.status_code}")
+                return None
+        except ReplayExhausted:
+            raise
+        except Exception as e:
+            print(f"Exception reading scan: {str(e)}")
+            return None
+
     def get_robot_position(self):
         """Get the current position and orientation of the robot."""
         try:
-            response = requests.get(f"{self.simulator_url}/position", timeout=5)
+            headers = {"Accept": protocol.BINARY_MIME} if self.binary else None
+            response = self.transport.get("/position", headers=headers)
             if response.status_code == 200:
-                position_data = response.json()
+                if protocol.is_binary(response):
+                    position_data = protocol.decode_pose(response.content)
+                else:
+                    position_data = response.json()
                 self.current_position = (position_data['x'], position_data['y'])
                 self.current_orientation = position_data['orientation']
                 return self.current_position + (self.current_orientation,)
             else:
                 print(f"Error getting robot position: {response.status_code}")
                 return None
+        except ReplayExhausted:
+            raise
         except Exception as e:
             print(f"Exception getting robot position: {str(e)}")
             return None
@@ -44,11 +86,26 @@ class RobotController:
     def move_robot_relative(self, dx, dy):
         """Move the robot by the specified relative distances."""
         try:
-            response = requests.post(
-                f"{self.simulator_url}/move_rel",
-                json={"dx": dx, "dy": dy},
-                timeout=5
-            )
+            if self.binary:
+                response = self.transport.post(
+                    "/move_rel",
+                    data=protocol.encode_move(dx, dy),
+                    headers={"Content-Type": protocol.BINARY_MIME, "Accept": protocol.BINARY_MIME}
+                )
+                if protocol.is_binary(response):
+                    # The reply carries the new pose, so no separate /position request is needed
+                    success, state = protocol.decode_move_result(response.content)
+                    self.current_position = (state["x"], state["y"])
+                    self.current_orientation = state["orientation"]
+                    if not success:
+                        print(f"Error moving robot: {response.status_code}")
+                        self.collision_count += 1
+                    return success
+                if response.status_code != 200:
+                    # The simulator does not speak the binary protocol; use JSON from now on
+                    self.binary = False
+            if not self.binary:
+                response = self.transport.post("/move_rel", json={"dx": dx, "dy": dy})
 
             if response.status_code == 200:
                 self.get_robot_position()  # Update the current position
@@ -57,7 +114,79 @@ class RobotController:
                 print(f"Error moving robot: {response.status_code}")
                 self.collision_count += 1
                 return False
+        except ReplayExhausted:
+            raise
         except Exception as e:
             print(f"Exception moving robot: {str(e)}")
             self.collision_count += 1
             return False
+
+    def get_obstacle_changes(self, since):
+        """
+        Read the obstacle changes made after world version `since`.
+
+        Returns:
+            dict: {"version": current version, "changes": list, or None if the simulator
+                no longer has all of them}, or None on failure
+        """
+        try:
+            response = self.transport.get("/obstacles/changes", params={"since": since})
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 410:
+                return {"version": None, "changes": None}
+            print(f"Error reading obstacle changes: {response.status_code}")
+            return None
+        except ReplayExhausted:
+            raise
+        except Exception as e:
+            print(f"Exception reading obstacle changes: {str(e)}")
+            return None
+
+    def get_obstacles(self):
+        """Read every obstacle with its id. Returns {"version", "obstacles"} or None on failure."""
+        try:
+            response = self.transport.get("/obstacles")
+            if response.status_code == 200:
+                return response.json()
+            print(f"Error reading obstacles: {response.status_code}")
+            return None
+        except ReplayExhausted:
+            raise
+        except Exception as e:
+            print(f"Exception reading obstacles: {str(e)}")
+            return None
+
+    def plan_path(self, start, goal, attempts=3):
+        """
+        Ask the simulator's /plan service for a collision-free path.
+
+        When the service is overloaded it answers 429; the request is retried
+        after the Retry-After delay, up to `attempts` times in total.
+
+        Returns:
+            list: Waypoints (x, y) after the start, [] if no path exists, or None on failure
+        """
+        body = {"start": {"x": start[0], "y": start[1]}, "end": {"x": goal[0], "y": goal[1]}}
+        try:
+            for attempt in range(attempts):
+                response = self.transport.post("/plan", json=body)
+                if response.status_code == 200:
+                    return [(p["x"], p["y"]) for p in response.json()["path"]]
+                if response.status_code == 400:
+                    return []
+                if response.status_code != 429:
+                    break
+                if attempt + 1 < attempts:
+                    self.sleep(float(response.headers.get("Retry-After", 1)))
+            print(f"Error planning path: {response.status_code}")
+            return None
+        except ReplayExhausted:
+            raise
+        except Exception as e:
+            print(f"Exception planning path: {str(e)}")
+            return None
+
+    def sleep(self, seconds):
+        """Wait between commands; replays skip the wait."""
+        self.transport.sleep(seconds)
@@ -0,0 +1,240 @@
+import heapq
+import math
+import numpy as np
+
+from src.prm import densify
+
+_SQRT2 = math.sqrt(2.0)
+
+
+def downsample(obstacle_map, resolution):
+    """
+    Reduce a map to cells of `resolution` x `resolution` pixels.
+
+    A coarse cell is blocked if any pixel in it is, so every free coarse cell
+    is entirely free at full resolution.
+    """
+    obstacle_map = np.asarray(obstacle_map)
+    if resolution == 1:
+        return obstacle_map != 0
+    width, height = obstacle_map.shape
+    cols, rows = -(-width // resolution), -(-height // resolution)
+    padded = np.zeros((cols * resolution, rows * resolution), dtype=bool)
+    padded[:width, :height] = obstacle_map != 0
+    return padded.reshape(cols, resolution, rows, resolution).any(axis=(1, 3))
+
+
+def dijkstra(grid, source, targets=None):
+    """
+    Single-source shortest paths over an 8-connected grid.
+
+    Diagonal moves may not cut the corner of a blocked cell. The search stops
+    early once every target has been settled.
+
+    Args:
+        grid (numpy.ndarray): Boolean map, True for blocked cells
+        source (tuple): Start cell
+        targets (iterable): Cells whose distances are needed, None for all
+
+    Returns:
+        tuple: (distance, parent) flat arrays over the grid; parent is -1 for
+        the source and unreached cells
+    """
+    cols, rows = grid.shape
+    # A blocked border removes bounds checks from the inner loop
+    stride = rows + 2
+    padded = np.ones((cols + 2, stride), dtype=bool)
+    padded[1:-1, 1:-1] = grid
+    blocked = padded.ravel().tolist()
+    distance = [math.inf] * len(blocked)
+    parent = [-1] * len(blocked)
+    closed = [False] * len(blocked)
+
+    def index(cell):
+        return (cell[0] + 1) * stride + cell[1] + 1
+
+    start = index(source)
+    if not blocked[start]:
+        remaining = None
+        if targets is not None:
+            remaining = {i for i in map(index, targets) if not blocked[i]}
+        straight = [(stride, 1.0), (-stride, 1.0), (1, 1.0), (-1, 1.0)]
+        # Diagonal offset and the two orthogonal offsets it must not cut between
+        diagonal = [(sx + sy, sx, sy) for sx in (stride, -stride) for sy in (1, -1)]
+
+        distance[start] = 0.0
+        open_set = [(0.0, start)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        while open_set:
+            d, cell = heappop(open_set)
+            if closed[cell]:
+                continue
+            closed[cell] = True
+            if remaining is not None:
+                remaining.discard(cell)
+                if not remaining:
+                    break
+            for offset, cost in straight:
+                neighbor = cell + offset
+                if not blocked[neighbor] and d + cost < distance[neighbor]:
+                    distance[neighbor] = d + cost
+                    parent[neighbor] = cell
+                    heappush(open_set, (d + cost, neighbor))
+            nd = d + _SQRT2
+            for offset, ox, oy in diagonal:
+                neighbor = cell + offset
+                if (not blocked[neighbor] and nd < distance[neighbor]
+                        and not blocked[cell + ox] and not blocked[cell + oy]):
+                    distance[neighbor] = nd
+                    parent[neighbor] = cell
+                    heappush(open_set, (nd, neighbor))
+
+    # Convert back to the unpadded flat layout
+    distance = np.array(distance).reshape(cols + 2, stride)[1:-1, 1:-1].ravel()
+    parent = np.array(parent, dtype=np.int64)
+    reached = parent >= 0
+    px, py = np.divmod(parent, stride)
+    parent = np.where(reached, (px - 1) * rows + (py - 1), -1).reshape(cols + 2, stride)[1:-1, 1:-1].ravel()
+    return distance, parent
+
+
+def tour_length(order, matrix):
+    """Length of an open tour visiting points in the given order."""
+    order = np.asarray(order)
+    return float(matrix[order[:-1], order[1:]].sum())
+
+
+def nearest_neighbor_tour(matrix, start=0):
+    """Greedy open tour from `start`, always visiting the closest unvisited point next."""
+    visited = np.zeros(len(matrix), dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(len(matrix) - 1):
+        candidates = np.where(visited, np.inf, matrix[order[-1]])
+        order.append(int(np.argmin(candidates)))
+        visited[order[-1]] = True
+    return order
+
+
+def two_opt(order, matrix, max_rounds=100):
+    """
+    Improve an open tour with 2-opt moves, keeping its first point fixed.
+
+    Reversing order[i:j + 1] replaces the edges (i-1, i) and (j, j+1) with
+    (i-1, j) and (i, j+1); all j for a given i are evaluated at once.
+    """
+    order = np.array(order)
+    n = len(order)
+    for _ in range(max_rounds):
+        improved = False
+        for i in range(1, n - 1):
+            j = np.arange(i + 1, n)
+            a, b = order[i - 1], order[i]
+            c = order[j]
+            # The last point has no successor in an open tour
+            d = order[np.minimum(j + 1, n - 1)]
+            has_next = j + 1 < n
+            delta = matrix[a, c] - matrix[a, b]
+            delta = delta + np.where(has_next, matrix[b, d] - matrix[c, d], 0.0)
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                order[i:j[best] + 1] = order[i:j[best] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return order.tolist()
+
+
+class TourPlanner:
+    """
+    Plan a route that visits several goals in a short order.
+
+    Distances between all points come from one Dijkstra search per point on
+    a downsampled grid (K searches rather than K^2 point-to-point queries).
+    The visiting order is found with nearest neighbor followed by 2-opt, and
+    the legs are stitched from the search trees kept by each search.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.resolution = config.TOUR_RESOLUTION
+
+    def to_cell(self, point):
+        return (int(point[0]) // self.resolution, int(point[1]) // self.resolution)
+
+    def to_pixel(self, cell):
+        """Center of a coarse cell in map pixels."""
+        half = self.resolution // 2
+        return (cell[0] * self.resolution + half, cell[1] * self.resolution + half)
+
+    def distance_matrix(self, points, obstacle_map):
+        """
+        Compute path lengths between every pair of points.
+
+        Paths are symmetric, so the search from point i only has to settle
+        the points after it; the legs between i < j are taken from tree i.
+
+        Returns:
+            tuple: (K x K matrix in pixels, inf where unreachable; list of
+            parent arrays, one per source, for stitching legs)
+        """
+        grid = downsample(obstacle_map, self.resolution)
+        rows = grid.shape[1]
+        cells = [self.to_cell(p) for p in points]
+        flat = np.array([x * rows + y for x, y in cells])
+        matrix = np.full((len(points), len(points)), np.inf)
+        parents = []
+        for i, cell in enumerate(cells):
+            if i == len(cells) - 1:
+                parents.append(None)  # Every leg to the last point is in an earlier tree
+                break
+            distance, parent = dijkstra(grid, cell, cells[i + 1:])
+            matrix[i] = distance[flat] * self.resolution
+            parents.append(parent)
+        upper = np.triu(np.ones_like(matrix, dtype=bool), 1)
+        matrix = np.where(upper, matrix, matrix.T)
+        np.fill_diagonal(matrix, np.where(grid[tuple(np.array(cells).T)], np.inf, 0.0))
+        return matrix, parents
+
+    def leg(self, parent, source, target, rows):
+        """Reconstruct the cells from source to target out of a search tree."""
+        cell = target[0] * rows + target[1]
+        end = source[0] * rows + source[1]
+        cells = []
+        while cell != end:
+            cells.append(divmod(int(cell), rows))
+            cell = parent[cell]
+        cells.append(source)
+        cells.reverse()
+        return cells
+
+    def plan_tour(self, start, goals, obstacle_map):
+        """
+        Order goals into a short tour from start and build the path through them.
+
+        Goals that cannot be reached from the start are left out. The start and
+        goals are snapped to whole pixels, so float poses from the simulator work.
+
+        Returns:
+            tuple: (ordered list of reachable goals, path cells at one-pixel spacing)
+        """
+        points = [(int(round(p[0])), int(round(p[1]))) for p in [start] + list(goals)]
+        matrix, parents = self.distance_matrix(points, obstacle_map)
+        reachable = np.flatnonzero(np.isfinite(matrix[0]))
+        if len(reachable) < 2:
+            return [], []
+
+        sub = matrix[np.ix_(reachable, reachable)]
+        order = two_opt(nearest_neighbor_tour(sub), sub)
+        order = [int(reachable[i]) for i in order]
+
+        rows = -(-np.asarray(obstacle_map).shape[1] // self.resolution)
+        waypoints = [points[order[0]]]
+        for a, b in zip(order[:-1], order[1:]):
+            source, target = min(a, b), max(a, b)
+            cells = self.leg(parents[source], self.to_cell(points[source]), self.to_cell(points[target]), rows)
+            if a > b:
+                cells.reverse()
+            waypoints.extend(self.to_pixel(c) for c in cells)
+            waypoints.append(points[b])
+        return [points[i] for i in order[1:]], densify(waypoints)
@@ -0,0 +1,75 @@
+import io
+import threading
+import numpy as np
+
+# Commands that move the robot, stored as their index in this tuple
+COMMANDS = ("none", "move_rel", "navigate", "set_position", "reset")
+
+# Little-endian and packed so the raw export can be read back anywhere with
+# np.frombuffer(data, dtype=TRAJECTORY_DTYPE)
+TRAJECTORY_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("orientation", "<i2"),
+    ("command", "u1"),
+    ("collision", "?"),
+])
+
+
+class TrajectoryRecorder:
+    """
+    Fixed-capacity ring buffer of robot poses in a NumPy structured array.
+
+    Appends overwrite the oldest record once the buffer is full, so memory
+    stays at `capacity` records however long the robot runs. Every record has
+    a sequence number (its position in the full history); ranges are read by
+    sequence number and only the records still held are returned.
+    """
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=TRAJECTORY_DTYPE)
+        self.total = 0  # Records written so far; the next record's sequence number
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def first(self):
+        """Sequence number of the oldest record still held."""
+        return self.total - len(self)
+
+    def record(self, t, x, y, orientation=0, command="none", collision=False):
+        """Append one record, overwriting the oldest if the buffer is full."""
+        with self.lock:
+            self.records[self.total % self.capacity] = (
+                t, x, y, orientation, COMMANDS.index(command), collision
+            )
+            self.total += 1
+
+    def range(self, start=None, stop=None):
+        """
+        Return records with sequence numbers in [start, stop), oldest first.
+
+        Args:
+            start (int): First sequence number, default the oldest held record
+            stop (int): Sequence number to stop before, default the next one to be written
+
+        Returns:
+            tuple: (first sequence number returned, structured array copy)
+        """
+        with self.lock:
+            first = self.first
+            start = first if start is None else min(max(start, first), self.total)
+            stop = self.total if stop is None else min(max(stop, start), self.total)
+            slots = np.arange(start, stop) % self.capacity
+            return start, self.records[slots]
+
+
+def to_npy(records):
+    """Serialize a record array in the .npy format."""
+    buffer = io.BytesIO()
+    np.save(buffer, records, allow_pickle=False)
+    return buffer.getvalue()
@@ -0,0 +1,139 @@
+import json
+import struct
+import time
+from collections import defaultdict, deque
+import requests
+
+# Each log frame is this prefix (header and body lengths), a JSON header and the raw body
+_FRAME = struct.Struct("<II")
+
+
+class ReplayExhausted(Exception):
+    """Raised when a replay has no recorded response left for a request."""
+
+
+class ReplayResponse:
+    """The parts of a requests.Response that RobotController reads, rebuilt from a log."""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpTransport:
+    """Send requests to the simulator over HTTP."""
+
+    def __init__(self, base_url, timeout=5):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def get(self, path, params=None, headers=None):
+        return requests.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout)
+
+    def post(self, path, json=None, data=None, headers=None):
+        return requests.post(f"{self.base_url}{path}", json=json, data=data, headers=headers, timeout=self.timeout)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class RecordingTransport:
+    """
+    Pass requests through to another transport and log every exchange.
+
+    The log is append-only: one frame per request with the method, path,
+    arguments, status and headers as JSON and the response body as raw
+    bytes, so binary bodies such as scans are stored without re-encoding.
+    """
+
+    def __init__(self, inner, log_path):
+        self.inner = inner
+        self.log = open(log_path, "ab")
+
+    def get(self, path, params=None, headers=None):
+        response = self.inner.get(path, params=params, headers=headers)
+        self._write("GET", path, params, response)
+        return response
+
+    def post(self, path, json=None, data=None, headers=None):
+        response = self.inner.post(path, json=json, data=data, headers=headers)
+        self._write("POST", path, json if data is None else data.hex(), response)
+        return response
+
+    def sleep(self, seconds):
+        self.inner.sleep(seconds)
+
+    def _write(self, method, path, arguments, response):
+        header = json.dumps({
+            "method": method,
+            "path": path,
+            "arguments": arguments,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+        }, separators=(",", ":")).encode()
+        body = response.content or b""
+        self.log.write(_FRAME.pack(len(header), len(body)) + header + body)
+        self.log.flush()
+
+    def close(self):
+        self.log.close()
+
+
+def read_log(log_path):
+    """Yield (header dict, body bytes) for every frame of a recorded log."""
+    with open(log_path, "rb") as log:
+        data = log.read()
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        header_length, body_length = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        yield header, data[offset:offset + body_length]
+        offset += body_length
+
+
+class ReplayTransport:
+    """
+    Serve responses from a recorded log without a simulator.
+
+    Responses are queued per method and path and handed out in recorded
+    order, so each endpoint sees the same sequence of answers on every run.
+    Sleeps return immediately. A request with no recorded response left
+    raises ReplayExhausted, which ends the episode.
+    """
+
+    def __init__(self, log_path):
+        self.responses = defaultdict(deque)
+        for header, body in read_log(log_path):
+            response = ReplayResponse(header["status"], body, header["headers"])
+            self.responses[(header["method"], header["path"])].append(response)
+
+    def get(self, path, params=None, headers=None):
+        return self._next("GET", path)
+
+    def post(self, path, json=None, data=None, headers=None):
+        return self._next("POST", path)
+
+    def sleep(self, seconds):
+        pass
+
+    def _next(self, method, path):
+        queue = self.responses.get((method, path))
+        if not queue:
+            raise ReplayExhausted(f"No recorded response left for {method} {path}")
+        return queue.popleft()
+
+
+def transport_from_config(config):
+    """Build the transport selected by ROBOT_REPLAY_PATH / ROBOT_RECORD_PATH, HTTP by default."""
+    if config.ROBOT_REPLAY_PATH:
+        return ReplayTransport(config.ROBOT_REPLAY_PATH)
+    transport = HttpTransport(config.SIMULATOR_URL)
+    if config.ROBOT_RECORD_PATH:
+        transport = RecordingTransport(transport, config.ROBOT_RECORD_PATH)
+    return transport
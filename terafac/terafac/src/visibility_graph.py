@@ -0,0 +1,270 @@
+import heapq
+import numpy as np
+
+
+def segments_blocked_count(starts, ends, rects, chunk=4096):
+    """
+    Count how many rectangles each segment passes through.
+
+    A segment is blocked by a rectangle only if it crosses the rectangle's
+    open interior; touching a corner or sliding along an edge is allowed,
+    which is what lets shortest paths run through inflated corners.
+
+    Args:
+        starts (numpy.ndarray): (E, 2) segment start points
+        ends (numpy.ndarray): (E, 2) segment end points
+        rects (numpy.ndarray): (M, 4) array of x, y, width, height
+
+    Returns:
+        numpy.ndarray: uint16 number of blocking rectangles per segment
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+    rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+    counts = np.zeros(len(starts), dtype=np.uint16)
+    if len(rects) == 0:
+        return counts
+
+    for begin in range(0, len(starts), chunk):
+        p = starts[begin:begin + chunk]
+        d = ends[begin:begin + chunk] - p
+        t_enter = np.zeros((len(p), len(rects)))
+        t_exit = np.ones((len(p), len(rects)))
+        for axis in range(2):
+            lo = rects[:, axis]
+            hi = lo + rects[:, axis + 2]
+            pa = p[:, axis, None]
+            moving = d[:, axis] != 0
+            inv = (1.0 / np.where(moving, d[:, axis], 1.0))[:, None]
+            t1 = (lo - pa) * inv
+            t2 = (hi - pa) * inv
+            np.maximum(t_enter, np.where(moving[:, None], np.minimum(t1, t2), -np.inf), out=t_enter)
+            np.minimum(t_exit, np.where(moving[:, None], np.maximum(t1, t2), np.inf), out=t_exit)
+            # Segments parallel to this axis overlap its slab everywhere or nowhere
+            t_exit[~moving[:, None] & ((pa <= lo) | (pa >= hi))] = -np.inf
+        counts[begin:begin + chunk] = (t_exit - t_enter > 1e-9).sum(axis=1)
+    return counts
+
+
+class VisibilityGraphPlanner:
+    """
+    Exact shortest-path planner for worlds made of axis-aligned rectangles.
+
+    Obstacles are grown by the robot radius, and the graph nodes are the
+    corners of the grown rectangles. For every pair of corners the number of
+    rectangles blocking the straight segment between them is kept in a
+    matrix, so a pair is visible when its count is zero and obstacles can be
+    added or removed later by adjusting counts instead of rebuilding.
+    """
+
+    def __init__(self, rects, inflate=0, bounds=None, margin=1.0):
+        """
+        Args:
+            rects (numpy.ndarray): (M, 4) array of x, y, width, height
+            inflate (float): Distance obstacles are grown by, usually the robot radius
+            bounds (tuple): Optional (x_min, y_min, x_max, y_max) the robot must stay within
+            margin (float): Extra distance corners are pushed out so paths clear the grown obstacles
+        """
+        rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        self.inflate = inflate
+        self.margin = margin
+        self.rects = self._grow(rects)
+        self.bounds = bounds
+        self.last_expansions = 0
+
+        self.nodes = self._corners(self.rects)
+        self.active = self.free_points(self.nodes)
+
+        n = len(self.nodes)
+        self.lengths = np.hypot(
+            self.nodes[:, None, 0] - self.nodes[None, :, 0], self.nodes[:, None, 1] - self.nodes[None, :, 1]
+        )
+        self.blocking = np.zeros((n, n), dtype=np.uint16)
+        rows, cols = np.triu_indices(n, 1)
+        counts = segments_blocked_count(self.nodes[rows], self.nodes[cols], self.rects)
+        self.blocking[rows, cols] = counts
+        self.blocking[cols, rows] = counts
+        self._adjacency = None
+
+    def _grow(self, rects):
+        """Grow rectangles (x, y, width, height) by the inflation distance on every side."""
+        inflate = self.inflate
+        return np.asarray(rects, dtype=float) + np.array([-inflate, -inflate, 2 * inflate, 2 * inflate])
+
+    def _corners(self, grown_rects):
+        """The four corners of each grown rectangle, pushed out by the margin."""
+        margin = self.margin
+        grown = grown_rects + np.array([-margin, -margin, 2 * margin, 2 * margin])
+        x0, y0 = grown[:, 0], grown[:, 1]
+        x1, y1 = x0 + grown[:, 2], y0 + grown[:, 3]
+        return np.stack([
+            np.column_stack([x0, y0]), np.column_stack([x1, y0]),
+            np.column_stack([x1, y1]), np.column_stack([x0, y1]),
+        ], axis=1).reshape(-1, 2)
+
+    @classmethod
+    def from_world(cls, world, inflate=0, border=0):
+        """Build the planner for a World, keeping `border` pixels away from the map edges."""
+        bounds = (border, border, world.size[0] - border, world.size[1] - border)
+        return cls(world.obstacle_array(), inflate, bounds)
+
+    def apply_change(self, change):
+        """Apply a change recorded by World.apply_change()."""
+        rect = None
+        if change["new"] is not None:
+            new = change["new"]
+            rect = (new["x"], new["y"], new["width"], new["height"])
+        if change["op"] == "add":
+            self.add_rect(rect)
+        elif change["op"] == "update":
+            self.replace_rect(change["index"], rect)
+        else:
+            self.remove_rect(change["index"])
+
+    def add_rect(self, rect):
+        """Add an obstacle (x, y, width, height), updating only the counts it changes."""
+        grown = self._grow(rect)
+        self._count_pairs(grown, 1)
+        n = len(self.nodes)
+        self.rects = np.vstack([self.rects, grown])
+        self.nodes = np.vstack([self.nodes, self._corners(grown[None])])
+        self.blocking = np.pad(self.blocking, ((0, 4), (0, 4)))
+        self.lengths = np.pad(self.lengths, ((0, 4), (0, 4)))
+        self._refresh_nodes(np.arange(n, n + 4))
+
+    def replace_rect(self, index, rect):
+        """Move or resize obstacle `index` in place."""
+        own = np.arange(4 * index, 4 * index + 4)
+        self._count_pairs(self.rects[index], -1, own)
+        self.rects[index] = self._grow(rect)
+        self.nodes[own] = self._corners(self.rects[index][None])
+        self._count_pairs(self.rects[index], 1, own)
+        self._refresh_nodes(own)
+
+    def remove_rect(self, index):
+        """Remove obstacle `index`; the obstacles after it move down by one."""
+        own = np.arange(4 * index, 4 * index + 4)
+        self._count_pairs(self.rects[index], -1, own)
+        keep = np.ones(len(self.nodes), dtype=bool)
+        keep[own] = False
+        self.rects = np.delete(self.rects, index, axis=0)
+        self.nodes = self.nodes[keep]
+        self.blocking = self.blocking[np.ix_(keep, keep)]
+        self.lengths = self.lengths[np.ix_(keep, keep)]
+        self.active = self.free_points(self.nodes)
+        self._adjacency = None
+
+    def _count_pairs(self, grown_rect, sign, skip=()):
+        """Add (sign 1) or remove (sign -1) one grown rectangle's blocking counts, except for nodes in `skip`."""
+        rows, cols = np.triu_indices(len(self.nodes), 1)
+        if len(skip):
+            keep = ~(np.isin(rows, skip) | np.isin(cols, skip))
+            rows, cols = rows[keep], cols[keep]
+        counts = segments_blocked_count(self.nodes[rows], self.nodes[cols], grown_rect[None])
+        hit = counts > 0
+        rows, cols = rows[hit], cols[hit]
+        if sign > 0:
+            self.blocking[rows, cols] += counts[hit]
+        else:
+            self.blocking[rows, cols] -= counts[hit]
+        self.blocking[cols, rows] = self.blocking[rows, cols]
+
+    def _refresh_nodes(self, indices):
+        """Recompute lengths and blocking counts of the segments touching the given nodes."""
+        n = len(self.nodes)
+        starts = np.repeat(self.nodes[indices], n, axis=0)
+        ends = np.tile(self.nodes, (len(indices), 1))
+        counts = segments_blocked_count(starts, ends, self.rects).reshape(len(indices), n)
+        counts[np.arange(len(indices)), indices] = 0
+        self.blocking[indices, :] = counts
+        self.blocking[:, indices] = counts.T
+        lengths = np.hypot(starts[:, 0] - ends[:, 0], starts[:, 1] - ends[:, 1]).reshape(len(indices), n)
+        self.lengths[indices, :] = lengths
+        self.lengths[:, indices] = lengths.T
+        self.active = self.free_points(self.nodes)
+        self._adjacency = None
+
+    def free_points(self, points):
+        """Return which points lie outside every grown obstacle and inside the bounds."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        lo = self.rects[:, :2]
+        hi = lo + self.rects[:, 2:]
+        inside = ((points[:, None, :] > lo) & (points[:, None, :] < hi)).all(axis=2).any(axis=1)
+        free = ~inside
+        if self.bounds is not None:
+            x_min, y_min, x_max, y_max = self.bounds
+            free &= (points[:, 0] >= x_min) & (points[:, 0] <= x_max)
+            free &= (points[:, 1] >= y_min) & (points[:, 1] <= y_max)
+        return free
+
+    def adjacency(self):
+        """Boolean matrix of mutually visible active corners."""
+        if self._adjacency is None:
+            visible = (self.blocking == 0) & self.active[:, None] & self.active[None, :]
+            np.fill_diagonal(visible, False)
+            self._adjacency = visible
+        return self._adjacency
+
+    def _visible_from(self, point):
+        """Return which active corners are visible from a point."""
+        n = len(self.nodes)
+        counts = segments_blocked_count(np.repeat([point], n, axis=0), self.nodes, self.rects)
+        return (counts == 0) & self.active
+
+    def plan(self, start, goal):
+        """
+        Find the shortest path between two points.
+
+        Returns:
+            list: Waypoints [start, corner, ..., goal], or [] if no path exists
+        """
+        self.last_expansions = 0
+        start = (float(start[0]), float(start[1]))
+        goal = (float(goal[0]), float(goal[1]))
+        if not self.free_points([start, goal]).all():
+            return []
+        if segments_blocked_count([start], [goal], self.rects)[0] == 0:
+            return [start, goal]
+
+        adjacency = self.adjacency()
+        from_start = self._visible_from(start)
+        to_goal = self._visible_from(goal)
+        heuristic = np.hypot(self.nodes[:, 0] - goal[0], self.nodes[:, 1] - goal[1])
+        exit_cost = np.where(to_goal, heuristic, np.inf)
+
+        g = np.full(len(self.nodes), np.inf)
+        g[from_start] = np.hypot(self.nodes[from_start, 0] - start[0], self.nodes[from_start, 1] - start[1])
+        parent = np.full(len(self.nodes), -1)
+        closed = np.zeros(len(self.nodes), dtype=bool)
+        open_set = [(g[i] + heuristic[i], int(i)) for i in np.flatnonzero(from_start)]
+        heapq.heapify(open_set)
+
+        best_cost, best_last = np.inf, -1
+        while open_set:
+            f, node = heapq.heappop(open_set)
+            if f >= best_cost:
+                break
+            if closed[node]:
+                continue
+            closed[node] = True
+            self.last_expansions += 1
+            if g[node] + exit_cost[node] < best_cost:
+                best_cost, best_last = g[node] + exit_cost[node], node
+
+            # Relax every visible corner at once
+            candidates = g[node] + self.lengths[node]
+            improved = np.flatnonzero(adjacency[node] & ~closed & (candidates < g))
+            g[improved] = candidates[improved]
+            parent[improved] = node
+            for neighbor in improved.tolist():
+                heapq.heappush(open_set, (g[neighbor] + heuristic[neighbor], neighbor))
+
+        if best_last < 0:
+            return []
+        corners = []
+        node = best_last
+        while node >= 0:
+            corners.append(tuple(self.nodes[node].tolist()))
+            node = parent[node]
+        corners.reverse()
+        return [start] + corners + [goal]
@@ -0,0 +1,215 @@
+import json
+import struct
+from collections import deque
+import numpy as np
+
+# Binary world layout: header followed by one float32 (x, y, width, height) row per obstacle
+_BINARY_MAGIC = b"WRLD"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sIIIffI")  # magic, version, width, height, start x, start y, count
+
+
+def obstacle_extent(obstacle, inflate=0):
+    """Return the pixels (x_start, x_end, y_start, y_end) covered by an obstacle grown by `inflate`."""
+    return (
+        int(np.floor(obstacle["x"] - inflate)), int(np.ceil(obstacle["x"] + obstacle["width"] + inflate)),
+        int(np.floor(obstacle["y"] - inflate)), int(np.ceil(obstacle["y"] + obstacle["height"] + inflate)),
+    )
+
+
+class World:
+    """
+    Map size, start position and rectangular obstacles of a simulated environment.
+
+    Obstacles can be added, updated and removed at runtime. Each obstacle has
+    a stable id, every change bumps `version`, and the most recent changes
+    are kept so replicas can catch up with changes_since() and
+    apply_change() instead of reloading the whole world. Obstacles loaded
+    from a file get ids 0..M-1 in file order.
+    """
+
+    CHANGE_LOG_SIZE = 1024  # Changes kept for changes_since()
+
+    def __init__(self, size, obstacles, start=None):
+        self.size = (int(size[0]), int(size[1]))
+        self.obstacles = [
+            {"x": o["x"], "y": o["y"], "width": o["width"], "height": o["height"]} for o in obstacles
+        ]
+        # Plain Python numbers, so NumPy starts from the generators can be saved as JSON
+        self.start = tuple(_plain(v) for v in start) if start is not None else (self.size[0] // 2, self.size[1] // 2)
+        self.ids = list(range(len(self.obstacles)))  # Id of each obstacle, in the same order
+        self.next_id = len(self.obstacles)
+        self.version = 0
+        self.changes = deque(maxlen=self.CHANGE_LOG_SIZE)
+
+    @classmethod
+    def from_array(cls, size, rects, start=None):
+        """Create a world from an (M, 4) array of x, y, width, height."""
+        obstacles = [
+            {"x": _plain(x), "y": _plain(y), "width": _plain(w), "height": _plain(h)}
+            for x, y, w, h in np.asarray(rects).tolist()
+        ]
+        return cls(size, obstacles, start)
+
+    def index_of(self, obstacle_id):
+        """Position of an obstacle in `obstacles`; raises KeyError for unknown ids."""
+        try:
+            return self.ids.index(obstacle_id)
+        except ValueError:
+            raise KeyError(obstacle_id) from None
+
+    def add_obstacle(self, obstacle):
+        """Add an obstacle and return its id."""
+        return self.apply_change({"op": "add", "id": self.next_id, "new": obstacle})["id"]
+
+    def update_obstacle(self, obstacle_id, obstacle):
+        """Move or resize an obstacle."""
+        self.apply_change({"op": "update", "id": obstacle_id, "new": obstacle})
+
+    def remove_obstacle(self, obstacle_id):
+        self.apply_change({"op": "remove", "id": obstacle_id})
+
+    def apply_change(self, change):
+        """
+        Apply one change and record it in the change log.
+
+        A change is {"op": "add" | "update" | "remove", "id": obstacle id,
+        "new": obstacle for add and update}. The recorded change also carries
+        the new world version, the obstacle before the change ("old") and its
+        position in `obstacles` ("index").
+
+        Returns:
+            dict: The recorded change
+        """
+        op, obstacle_id = change["op"], change["id"]
+        new = change.get("new")
+        if new is not None:
+            new = {"x": new["x"], "y": new["y"], "width": new["width"], "height": new["height"]}
+        old = None
+        if op == "add":
+            if obstacle_id in self.ids:
+                raise KeyError(obstacle_id)
+            index = len(self.obstacles)
+            self.obstacles.append(new)
+            self.ids.append(obstacle_id)
+            self.next_id = max(self.next_id, obstacle_id + 1)
+        elif op == "update":
+            index = self.index_of(obstacle_id)
+            old = self.obstacles[index]
+            self.obstacles[index] = new
+        elif op == "remove":
+            index = self.index_of(obstacle_id)
+            old = self.obstacles.pop(index)
+            self.ids.pop(index)
+        else:
+            raise ValueError(f"Unknown obstacle change {op!r}")
+        self.version = change.get("version", self.version + 1)
+        recorded = {"version": self.version, "op": op, "id": obstacle_id, "index": index, "old": old, "new": new}
+        self.changes.append(recorded)
+        return recorded
+
+    def changes_since(self, version):
+        """
+        Return the changes made after `version`, oldest first.
+
+        Returns:
+            list: Recorded changes, or None if some of them are no longer in the log
+        """
+        if version >= self.version:
+            return []
+        if not self.changes or self.changes[0]["version"] > version + 1:
+            return None
+        return [c for c in self.changes if c["version"] > version]
+
+    def changes_to(self, obstacles, version):
+        """
+        Return the changes that turn this world into a snapshot of another one.
+
+        Used to catch up when changes_since() can no longer reach back far enough.
+
+        Args:
+            obstacles (list): Obstacle dicts with an "id" key
+            version (int): Version of the snapshot, given to the last change
+        """
+        target = {o["id"]: o for o in obstacles}
+        changes = [{"op": "remove", "id": i} for i in self.ids if i not in target]
+        for obstacle_id, o in target.items():
+            if obstacle_id not in self.ids:
+                changes.append({"op": "add", "id": obstacle_id, "new": o})
+            elif any(self.obstacles[self.index_of(obstacle_id)][k] != o[k] for k in ("x", "y", "width", "height")):
+                changes.append({"op": "update", "id": obstacle_id, "new": o})
+        if changes:
+            changes[-1]["version"] = version
+        return changes
+
+    def obstacle_array(self):
+        """Return the obstacles as an (M, 4) float array of x, y, width, height."""
+        if not self.obstacles:
+            return np.zeros((0, 4))
+        return np.array([[o["x"], o["y"], o["width"], o["height"]] for o in self.obstacles], dtype=float)
+
+    def centers(self):
+        """Return the integer center of every obstacle."""
+        return [(int(o["x"] + o["width"] // 2), int(o["y"] + o["height"] // 2)) for o in self.obstacles]
+
+    def rasterize(self, obstacle_map, inflate=0):
+        """Mark every obstacle, grown by `inflate` pixels, in an obstacle map indexed [x, y]."""
+        return self.rasterize_region(obstacle_map, (0, obstacle_map.shape[0], 0, obstacle_map.shape[1]), inflate)
+
+    def rasterize_region(self, obstacle_map, region, inflate=0):
+        """Like rasterize(), but only mark cells inside region (x_start, x_end, y_start, y_end)."""
+        rx0, rx1, ry0, ry1 = region
+        rx0, ry0 = max(rx0, 0), max(ry0, 0)
+        rx1, ry1 = min(rx1, obstacle_map.shape[0]), min(ry1, obstacle_map.shape[1])
+        for o in self.obstacles:
+            x_start, x_end, y_start, y_end = obstacle_extent(o, inflate)
+            x_start, x_end = max(rx0, x_start), min(rx1, x_end)
+            y_start, y_end = max(ry0, y_start), min(ry1, y_end)
+            if x_start < x_end and y_start < y_end:
+                obstacle_map[x_start:x_end, y_start:y_end] = 1
+        return obstacle_map
+
+    def to_dict(self):
+        """Return the compact JSON representation."""
+        return {
+            "size": list(self.size),
+            "start": list(self.start),
+            "obstacles": [[o["x"], o["y"], o["width"], o["height"]] for o in self.obstacles],
+        }
+
+    def save(self, path):
+        """Write the world as JSON, or in the binary format for .bin files."""
+        if path.endswith(".bin"):
+            rects = self.obstacle_array().astype("<f4")
+            with open(path, "wb") as f:
+                f.write(_BINARY_HEADER.pack(
+                    _BINARY_MAGIC, _BINARY_VERSION, self.size[0], self.size[1],
+                    self.start[0], self.start[1], len(rects)
+                ))
+                f.write(rects.tobytes())
+        else:
+            with open(path, "w") as f:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        """Read a world written by save()."""
+        if path.endswith(".bin"):
+            with open(path, "rb") as f:
+                header = f.read(_BINARY_HEADER.size)
+                magic, version, width, height, start_x, start_y, count = _BINARY_HEADER.unpack(header)
+                if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+                    raise ValueError(f"{path} is not a version {_BINARY_VERSION} world file")
+                rects = np.frombuffer(f.read(count * 16), dtype="<f4").reshape(count, 4)
+            return cls.from_array((width, height), rects, (_plain(start_x), _plain(start_y)))
+
+        with open(path) as f:
+            data = json.load(f)
+        obstacles = [{"x": x, "y": y, "width": w, "height": h} for x, y, w, h in data["obstacles"]]
+        return cls(data["size"], obstacles, data.get("start"))
+
+
+def _plain(value):
+    """Return whole numbers as int so worlds round-trip without float noise."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Seeded generators for large synthetic worlds used as performance workloads.
+
+Example:
+    python -m src.world_generator maze --size 4000 3000 --seed 7 -o worlds/maze.bin
+"""
+import argparse
+import numpy as np
+
+from src.world import World
+
+
+def random_rectangles(size, count, min_side=10, max_side=60, seed=0, clearance=40):
+    """
+    Scatter axis-aligned rectangles uniformly over the map.
+
+    Rectangles covering the area within `clearance` pixels of the start
+    position (the map center) are dropped so the robot can always be placed.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    sides = rng.uniform(min_side, max_side, (count, 2)).round()
+    corners = (rng.uniform(0, 1, (count, 2)) * (np.array([width, height]) - sides)).round()
+    rects = np.hstack([corners, sides])
+
+    start = np.array([width // 2, height // 2])
+    # Distance from the start to the nearest point of each rectangle
+    nearest = np.clip(start, rects[:, :2], rects[:, :2] + rects[:, 2:])
+    keep = np.hypot(*(nearest - start).T) > clearance
+    return World.from_array(size, rects[keep], tuple(start))
+
+
+def maze(size, cell_size=40, wall_thickness=6, seed=0):
+    """
+    Generate a perfect maze with an iterative recursive-backtracker.
+
+    Walls are merged into maximal straight runs so the world stays compact.
+    """
+    rng = np.random.default_rng(seed)
+    cols, rows = size[0] // cell_size, size[1] // cell_size
+    # Open passages to the right of and below every cell
+    open_right = np.zeros((cols, rows), dtype=bool)
+    open_down = np.zeros((cols, rows), dtype=bool)
+    visited = np.zeros((cols, rows), dtype=bool)
+
+    stack = [(cols // 2, rows // 2)]
+    visited[stack[0]] = True
+    while stack:
+        x, y = stack[-1]
+        neighbors = [(nx, ny) for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                     if 0 <= nx < cols and 0 <= ny < rows and not visited[nx, ny]]
+        if not neighbors:
+            stack.pop()
+            continue
+        nx, ny = neighbors[rng.integers(len(neighbors))]
+        if nx != x:
+            open_right[min(x, nx), y] = True
+        else:
+            open_down[x, min(y, ny)] = True
+        visited[nx, ny] = True
+        stack.append((nx, ny))
+
+    t = wall_thickness
+    rects = [
+        (0, 0, cols * cell_size + t, t),  # Outer border
+        (0, rows * cell_size, cols * cell_size + t, t),
+        (0, 0, t, rows * cell_size + t),
+        (cols * cell_size, 0, t, rows * cell_size + t),
+    ]
+    # Vertical walls on the right of cells, merged down each column of boundaries
+    for x in range(cols - 1):
+        rects.extend(
+            ((x + 1) * cell_size, y0 * cell_size, t, (y1 - y0) * cell_size + t)
+            for y0, y1 in _runs(~open_right[x])
+        )
+    # Horizontal walls below cells, merged along each row of boundaries
+    for y in range(rows - 1):
+        rects.extend(
+            (x0 * cell_size, (y + 1) * cell_size, (x1 - x0) * cell_size + t, t)
+            for x0, x1 in _runs(~open_down[:, y])
+        )
+
+    start = (cols // 2 * cell_size + cell_size // 2 + t // 2, rows // 2 * cell_size + cell_size // 2 + t // 2)
+    return World.from_array(size, np.array(rects, dtype=float), start)
+
+
+def warehouse(size, shelf_depth=20, aisle_width=40, shelf_length=200, cross_aisle=40, seed=0, gap_probability=0.1):
+    """
+    Generate rows of shelving separated by aisles, with periodic cross aisles.
+
+    Each shelf block is dropped with `gap_probability` to create shortcuts.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    margin = aisle_width
+    rects = []
+    y = margin
+    while y + shelf_depth <= height - margin:
+        x = margin
+        while x < width - margin:
+            length = min(shelf_length, width - margin - x)
+            if length > 0 and rng.random() >= gap_probability:
+                rects.append((x, y, length, shelf_depth))
+            x += shelf_length + cross_aisle
+        y += shelf_depth + aisle_width
+
+    # Start in the first aisle
+    start = (margin // 2, margin // 2)
+    return World.from_array(size, np.array(rects, dtype=float).reshape(-1, 4), start)
+
+
+def _runs(mask):
+    """Return (start, stop) of each run of True values in a 1D boolean array."""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+GENERATORS = {
+    "random": random_rectangles,
+    "maze": maze,
+    "warehouse": warehouse,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a world file")
+    parser.add_argument("kind", choices=sorted(GENERATORS))
+    parser.add_argument("--size", type=int, nargs=2, default=[800, 600], metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=200, help="Number of rectangles (random only)")
+    parser.add_argument("-o", "--output", required=True, help="Output path (.json or .bin)")
+    args = parser.parse_args()
+
+    if args.kind == "random":
+        world = random_rectangles(tuple(args.size), args.count, seed=args.seed)
+    else:
+        world = GENERATORS[args.kind](tuple(args.size), seed=args.seed)
+    world.save(args.output)
+    print(f"Wrote {args.kind} world with {len(world.obstacles)} obstacles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
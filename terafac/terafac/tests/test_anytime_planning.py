@@ -0,0 +1,60 @@
+import time
+import unittest
+import numpy as np
+from src.anytime_planning import AnytimePlanner
+from src.grid_search import GridGraph, ReverseFlood
+from src.path_planning import PathPlanner
+from src.world import World
+from config.config import Config
+
+def path_length(path):
+    return np.hypot(*np.diff(np.array(path), axis=0).T).sum()
+
+class TestAnytimePlanner(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.config.MAP_SIZE = self.world.size
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8))
+        self.planner = AnytimePlanner(self.config)
+
+    def assert_valid_path(self, path, start, goal):
+        cells = np.array(path)
+        self.assertEqual(tuple(cells[0]), start)
+        self.assertEqual(tuple(cells[-1]), goal)
+        self.assertTrue(np.all(np.abs(np.diff(cells, axis=0)) <= 1))
+        self.assertFalse(self.obstacle_map[cells[:, 0], cells[:, 1]].any())
+
+    def test_without_deadline_matches_astar_cost(self):
+        start, goal = (400, 300), (600, 420)
+        path = self.planner.plan(start, goal, self.obstacle_map)
+        self.assert_valid_path(path, start, goal)
+        self.assertEqual(self.planner.last_status, "optimal")
+        optimal = PathPlanner(self.config).plan_path_astar(start, goal, self.obstacle_map)
+        self.assertAlmostEqual(path_length(path), path_length(optimal), places=6)
+
+    def test_deadline_returns_bounded_path(self):
+        start, goal = (400, 300), (700, 500)
+        path = self.planner.plan(start, goal, self.obstacle_map, deadline=time.perf_counter())
+        self.assert_valid_path(path, start, goal)
+        self.assertEqual(self.planner.last_status, "deadline")
+        self.assertGreater(self.planner.last_epsilon, 1.0)
+
+    def test_enclosed_goal_is_reported_early(self):
+        self.obstacle_map[690:711, 490] = 1
+        self.obstacle_map[690:711, 510] = 1
+        self.obstacle_map[690, 490:511] = 1
+        self.obstacle_map[710, 490:511] = 1
+        self.assertEqual(self.planner.plan((400, 300), (700, 500), self.obstacle_map), [])
+        self.assertEqual(self.planner.last_status, "unreachable")
+        self.assertLess(self.planner.last_expansions, 1000)
+
+    def test_reverse_flood_reaches_start(self):
+        graph = GridGraph(self.obstacle_map)
+        flood = ReverseFlood(graph, (410, 300), (400, 300))
+        flood.advance(10000)
+        self.assertTrue(flood.reached_start)
+        self.assertFalse(flood.exhausted)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.artifact_cache import ArtifactCache, world_key
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(self.tmpdir.name, max_bytes=10 * 1024 * 1024)
+        self.obstacle_map = np.zeros((50, 40), dtype=np.uint8)
+        self.obstacle_map[10:20, 5:8] = 1
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_world_key(self):
+        key = world_key(self.obstacle_map, 8, 1)
+        self.assertEqual(key, world_key(self.obstacle_map.copy(), 8, 1))
+        self.assertNotEqual(key, world_key(self.obstacle_map, 9, 1))
+        self.assertNotEqual(key, world_key(self.obstacle_map, 8, 2))
+        changed = self.obstacle_map.copy()
+        changed[0, 0] = 1
+        self.assertNotEqual(key, world_key(changed, 8, 1))
+
+    def test_get_or_compute_maps_read_only(self):
+        key = world_key(self.obstacle_map, 8, 1)
+        calls = []
+        def compute():
+            calls.append(1)
+            return np.arange(12, dtype=np.float32).reshape(3, 4)
+
+        first = self.cache.get_or_compute("grid", key, compute)
+        second = self.cache.get_or_compute("grid", key, compute)
+        self.assertEqual(len(calls), 1)
+        np.testing.assert_array_equal(first, second)
+        self.assertIsInstance(second, np.memmap)
+        self.assertFalse(second.flags.writeable)
+
+    def test_eviction(self):
+        cache = ArtifactCache(self.tmpdir.name, max_bytes=3000)
+        cache.store("a", "1", np.zeros(1000, dtype=np.uint8))
+        old = time.time() - 100
+        os.utime(cache.path("a", "1"), (old, old))
+        cache.store("b", "1", np.zeros(1000, dtype=np.uint8))
+        cache.store("c", "1", np.zeros(1000, dtype=np.uint8))
+        self.assertIsNone(cache.load("a", "1"))
+        self.assertIsNotNone(cache.load("c", "1"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from src.batch_planning import attach_arrays, plan_many, share_arrays
+from src.path_planning import PathPlanner
+from src.world import World
+from config.config import Config
+
+class TestBatchPlanning(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.config.MAP_SIZE = self.world.size
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8))
+
+    def test_shared_arrays_round_trip(self):
+        blocks, specs = share_arrays({"map": self.obstacle_map})
+        try:
+            attached, arrays = attach_arrays(specs)
+            np.testing.assert_array_equal(arrays["map"], self.obstacle_map)
+            del arrays
+            for block in attached:
+                block.close()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def test_plan_many_matches_serial_planning(self):
+        queries = [((400, 300), (400 + 10 * i, 330)) for i in range(6)]
+        results = dict(plan_many(queries, self.obstacle_map, self.config, workers=2, chunk_size=2))
+        self.assertEqual(sorted(results), list(range(len(queries))))
+        planner = PathPlanner(self.config)
+        for i, (start, goal) in enumerate(queries):
+            self.assertEqual(results[i], planner.plan_path(start, goal, self.obstacle_map))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from src.bidirectional_search import BidirectionalPlanner
+from src.path_planning import PathPlanner
+from src.world import World
+from src.world_generator import maze
+from config.config import Config
+
+def path_length(path):
+    return np.hypot(*np.diff(np.array(path), axis=0).T).sum()
+
+class TestBidirectionalPlanner(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.planner = BidirectionalPlanner(self.config)
+
+    def check_against_astar(self, world, start, goal):
+        self.config.MAP_SIZE = world.size
+        obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+        path = self.planner.plan(start, goal, obstacle_map)
+        cells = np.array(path)
+        self.assertEqual(tuple(cells[0]), start)
+        self.assertEqual(tuple(cells[-1]), goal)
+        self.assertTrue(np.all(np.abs(np.diff(cells, axis=0)) <= 1))
+        self.assertFalse(obstacle_map[cells[:, 0], cells[:, 1]].any())
+        optimal = PathPlanner(self.config).plan_path_astar(start, goal, obstacle_map)
+        self.assertAlmostEqual(path_length(path), path_length(optimal), places=6)
+
+    def test_shortest_on_default_world(self):
+        self.check_against_astar(World.load(self.config.WORLD_FILE), (400, 300), (620, 150))
+
+    def test_shortest_in_maze(self):
+        self.check_against_astar(maze((200, 160), cell_size=40, seed=3), (26, 26), (146, 106))
+
+    def test_enclosed_goal_ends_quickly(self):
+        obstacle_map = np.zeros((800, 600), dtype=np.uint8)
+        obstacle_map[690:711, 490] = 1
+        obstacle_map[690:711, 510] = 1
+        obstacle_map[690, 490:511] = 1
+        obstacle_map[710, 490:511] = 1
+        self.assertEqual(self.planner.plan((100, 100), (700, 500), obstacle_map), [])
+        self.assertLess(self.planner.last_expansions, 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from src.clearance import distance_transform, ClearanceStepPolicy
+from config.config import Config
+
+class TestClearance(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.policy = ClearanceStepPolicy(self.config)
+
+    def test_distance_transform_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        obstacle_map = (rng.random((30, 20)) < 0.05).astype(np.uint8)
+        obstacle_map[0, 0] = 1
+        clearance = distance_transform(obstacle_map)
+
+        obstacles = np.argwhere(obstacle_map)
+        cells = np.indices(obstacle_map.shape).reshape(2, -1).T
+        expected = np.sqrt(((cells[:, None, :] - obstacles[None]) ** 2).sum(-1).min(1))
+        np.testing.assert_allclose(clearance.ravel(), expected, atol=1e-4)
+
+    def test_step_length_grows_with_clearance(self):
+        obstacle_map = np.zeros((200, 200), dtype=np.uint8)
+        obstacle_map[0:20, :] = 1
+        clearance = distance_transform(obstacle_map)
+        self.assertEqual(self.policy.step_length(clearance, (22, 100)), self.config.MIN_STEP_SIZE)
+        self.assertEqual(self.policy.step_length(clearance, (150, 100)), self.config.MAX_STEP_SIZE)
+
+    def test_choose_target_stops_at_bend(self):
+        clearance = np.full((200, 200), 100.0, dtype=np.float32)
+        path = np.array([(x, 10) for x in range(10, 40)] + [(39, y) for y in range(11, 60)])
+        arc_length = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(path, axis=0).T))))
+        target = self.policy.choose_target(path, arc_length, 0, clearance, (10, 10))
+        self.assertEqual(tuple(path[target]), (39, 10))
+
+if __name__ == '__main__':
+    unittest.main()
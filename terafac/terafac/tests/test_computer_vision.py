@@ -19,5 +19,11 @@ class TestComputerVision(unittest.TestCase):
         self.assertEqual(len(obstacles), 1)
         self.assertEqual(obstacles[0], (50, 50))
 
+    def test_map_changed_only_when_cells_are_marked(self):
+        self.computer_vision.detect_obstacles(None, self.obstacle_map)
+        self.assertTrue(self.computer_vision.map_changed)
+        self.computer_vision.detect_obstacles(None, self.obstacle_map)
+        self.assertFalse(self.computer_vision.map_changed)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import json
+import unittest
+from src.instrumentation import Instrumentation, RollingHistogram, HdrHistogram
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation(window=4)
+
+    def test_rolling_histogram(self):
+        histogram = RollingHistogram(window=3)
+        for value in [10, 1, 2, 3]:
+            histogram.observe(value)
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["sum"], 16)
+        self.assertEqual(summary["max"], 3)  # 10 fell out of the window
+        self.assertEqual(summary["p50"], 2)
+
+    def test_hdr_histogram(self):
+        histogram = HdrHistogram(lowest=1e-6, highest=10.0, significant_digits=2)
+        for i in range(1, 1001):
+            histogram.record(i * 1e-3)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 * 0.01)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 * 0.01)
+        self.assertEqual(histogram.percentile(100), 1.0)
+
+    def test_span_and_counters(self):
+        with self.instrumentation.span("plan"):
+            pass
+        self.instrumentation.increment("failed_moves")
+        self.instrumentation.increment("failed_moves")
+
+        data = json.loads(self.instrumentation.to_json())
+        self.assertEqual(data["histograms"]["plan"]["count"], 1)
+        self.assertEqual(data["counters"]["failed_moves"], 2)
+
+        text = self.instrumentation.to_prometheus()
+        self.assertIn('robot_plan{quantile="0.5"}', text)
+        self.assertIn("robot_failed_moves_total 2", text)
+
+    def test_disabled(self):
+        instrumentation = Instrumentation(enabled=False)
+        with instrumentation.span("plan"):
+            pass
+        instrumentation.increment("steps")
+        self.assertEqual(instrumentation.snapshot()["counters"], {})
+        self.assertEqual(instrumentation.snapshot()["histograms"], {})
+
+if __name__ == '__main__':
+    unittest.main()
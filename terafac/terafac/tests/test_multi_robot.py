@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from src.multi_robot import MultiRobotPlanner, ReservationTable, find_conflict, makespan, space_time_astar, step_distances
+from src.world import World
+from config.config import Config
+
+class TestMultiRobot(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8), inflate=8)
+        self.planner = MultiRobotPlanner(self.config)
+        # Two pairs of robots swapping places through the center of the map
+        self.starts = [(170, 300), (630, 300), (400, 170), (400, 430)]
+        self.goals = [(630, 300), (170, 300), (400, 430), (400, 170)]
+
+    def flat_paths(self, paths):
+        rows = self.planner.blocked.shape[1]
+        return [[x * rows + y for x, y in map(self.planner.to_cell, path)] for path in paths]
+
+    def test_independent_plans_conflict(self):
+        self.planner.plan(self.starts, self.goals, self.obstacle_map)
+        blocked = self.planner.blocked
+        paths = []
+        for start, goal in zip(self.starts, self.goals):
+            start, goal = self.planner.to_cell(start), self.planner.to_cell(goal)
+            table = ReservationTable(blocked.size, blocked.shape[1])
+            paths.append(space_time_astar(blocked, start, goal, table, step_distances(blocked, goal), 600))
+        self.assertIsNotNone(find_conflict(paths, blocked.shape[1]))
+
+    def test_reservation_table_blocks_swaps(self):
+        table = ReservationTable(100, 10)
+        table.reserve_path([1, 2, 3])
+        self.assertFalse(table.is_free(0, 2, 1))
+        self.assertFalse(table.is_free(2, 1, 1))  # Swapping with the robot moving 1 -> 2
+        self.assertTrue(table.is_free(2, 1, 2))
+        self.assertFalse(table.is_free(4, 3, 10))  # Parked on its goal
+        self.assertFalse(table.free_after(2, 1))
+
+    def test_crossing_diagonals_conflict(self):
+        # Cells (0, 0) -> (1, 1) and (1, 0) -> (0, 1) on a grid with 10 rows
+        self.assertEqual(find_conflict([[0, 11], [10, 1]], 10), (0, 1, 1, 0, 11))
+        table = ReservationTable(100, 10)
+        table.reserve_path([0, 11])
+        self.assertFalse(table.is_free(10, 1, 1))
+        self.assertFalse(table.is_free(1, 10, 1))
+        self.assertTrue(table.is_free(10, 20, 1))
+
+    def test_robots_do_not_cross_diagonally(self):
+        # Each robot's shortest move is one diagonal of the same square
+        starts, goals = [(410, 410), (430, 410)], [(430, 430), (410, 430)]
+        for method in ("prioritized", "cbs"):
+            paths = self.planner.plan(starts, goals, self.obstacle_map, method)
+            self.assertIsNone(find_conflict(self.flat_paths(paths), self.planner.blocked.shape[1]))
+            for path, goal in zip(paths, goals):
+                self.assertEqual(path[-1], goal)
+            # At mid-step the robot centers stay at least one cell apart
+            for t in range(1, max(len(p) for p in paths)):
+                a = [np.add(p[min(t - 1, len(p) - 1)], p[min(t, len(p) - 1)]) / 2 for p in paths]
+                self.assertGreaterEqual(np.hypot(*(a[0] - a[1])), self.config.MULTI_ROBOT_RESOLUTION / 2)
+
+    def test_prioritized_plans_are_conflict_free(self):
+        paths = self.planner.plan(self.starts, self.goals, self.obstacle_map, "prioritized")
+        self.assertIsNone(find_conflict(self.flat_paths(paths), self.planner.blocked.shape[1]))
+        for path, goal in zip(paths, self.goals):
+            self.assertEqual(self.planner.to_cell(path[-1]), self.planner.to_cell(goal))
+
+    def test_cbs_is_no_worse_than_prioritized(self):
+        prioritized = self.planner.plan(self.starts, self.goals, self.obstacle_map, "prioritized")
+        cbs = self.planner.plan(self.starts, self.goals, self.obstacle_map, "cbs")
+        self.assertIsNone(find_conflict(self.flat_paths(cbs), self.planner.blocked.shape[1]))
+        self.assertLessEqual(sum(len(p) for p in cbs), sum(len(p) for p in prioritized))
+        self.assertGreater(makespan(cbs), 0)
+
+if __name__ == '__main__':
+    unittest.main()
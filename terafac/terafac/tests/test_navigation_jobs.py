@@ -0,0 +1,53 @@
+import threading
+import unittest
+from src.navigation_jobs import NavigationJobManager
+
+class TestNavigationJobManager(unittest.TestCase):
+    def setUp(self):
+        self.steps = []
+        self.finished = []
+        self.manager = NavigationJobManager(self.steps.append, tick=0.001, on_finish=self.finished.append)
+
+    def test_job_completes(self):
+        job = self.manager.start([1, 2, 3])
+        job.thread.join(1)
+        self.assertEqual(self.steps, [1, 2, 3])
+        self.assertEqual(job.to_dict()["status"], "completed")
+        self.assertEqual(job.to_dict()["progress"], 1.0)
+        self.assertEqual(self.finished, [job])
+        self.assertEqual(self.manager.active_threads(), 0)
+
+    def test_new_job_preempts_previous(self):
+        self.manager.tick = 10
+        first = self.manager.start(list(range(100)))
+        second = self.manager.start(["b"])
+        self.assertFalse(first.thread.is_alive())
+        self.assertEqual(first.status, "preempted")
+        self.assertEqual(first.steps_done, 1)
+        self.assertLessEqual(self.manager.active_threads(), 1)
+        self.manager.cancel(wait=True)
+        self.assertEqual(second.status, "cancelled")
+        self.assertIs(self.manager.status(), second)
+        self.assertIs(self.manager.status(first.job_id), first)
+
+    def test_cancel_ignores_other_job_ids(self):
+        self.manager.tick = 10
+        job = self.manager.start([1, 2])
+        self.assertIsNone(self.manager.cancel(job.job_id + 1))
+        self.assertIs(self.manager.cancel(job.job_id, wait=True), job)
+        self.assertEqual(job.to_dict()["progress"], 0.5)
+
+    def test_rapid_starts_keep_one_thread(self):
+        self.manager.tick = 10
+        threads = [threading.Thread(target=self.manager.start, args=([i] * 5,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.manager.active_threads(), 1)
+        self.manager.cancel(wait=True)
+        self.assertEqual(self.manager.active_threads(), 0)
+        self.assertEqual(sum(job.status == "preempted" for job in self.manager.jobs.values()), 19)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+from src.occupancy_grid import OccupancyGrid, LogOddsGrid
+from src.computer_vision import ComputerVision
+from src.path_planning import PathPlanner
+from config.config import Config
+
+class TestOccupancyGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = OccupancyGrid((200, 150), tile_size=32)
+
+    def test_matches_dense_array(self):
+        rng = np.random.default_rng(2)
+        dense = np.zeros((200, 150), dtype=np.uint8)
+        for _ in range(20):
+            x0, y0 = rng.integers(0, 180), rng.integers(0, 130)
+            x1, y1 = x0 + rng.integers(1, 40), y0 + rng.integers(1, 40)
+            value = int(rng.integers(0, 2))
+            dense[x0:x1, y0:y1] = value
+            self.grid[x0:x1, y0:y1] = value
+        np.testing.assert_array_equal(np.asarray(self.grid), dense)
+        xs, ys = rng.integers(0, 200, 500), rng.integers(0, 150, 500)
+        np.testing.assert_array_equal(self.grid[xs, ys], dense[xs, ys])
+        self.assertEqual(self.grid.count_nonzero(), np.count_nonzero(dense))
+        np.testing.assert_array_equal(self.grid[10:90, 20:70], dense[10:90, 20:70])
+
+    def test_tiles_allocated_lazily(self):
+        self.assertEqual(self.grid.allocated_tiles, 0)
+        self.grid[5, 5] = 1
+        self.assertEqual(self.grid.allocated_tiles, 1)
+        self.assertEqual(self.grid[5, 5], 1)
+        self.grid[5, 5] = 0
+        self.assertEqual(self.grid.allocated_tiles, 0)
+
+    def test_dirty_tracking(self):
+        self.grid[0:40, 0:10] = 1
+        self.assertEqual(self.grid.clear_dirty(), {(0, 0), (1, 0)})
+        self.grid[0:40, 0:10] = 1  # No change, nothing becomes dirty
+        self.assertEqual(self.grid.clear_dirty(), set())
+        self.assertTrue(self.grid.any_in_region(35, 50, 5, 6))
+        self.assertFalse(self.grid.any_in_region(50, 60, 0, 10))
+
+    def test_planner_and_vision_accept_grid(self):
+        config = Config()
+        grid = OccupancyGrid(config.MAP_SIZE)
+        ComputerVision(config).detect_obstacles(None, grid)
+        dense = np.zeros(config.MAP_SIZE, dtype=np.uint8)
+        ComputerVision(config).detect_obstacles(None, dense)
+        np.testing.assert_array_equal(np.asarray(grid), dense)
+
+        path = PathPlanner(config).plan_path_astar((10, 10), (30, 20), grid)
+        self.assertEqual(path[-1], (30, 20))
+
+class TestLogOddsGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = LogOddsGrid((128, 128), tile_size=32, hit=1.0, miss=-0.5, clamp_min=-1.0, clamp_max=2.0)
+
+    def test_update_only_touches_window(self):
+        occupied = np.zeros((20, 20), dtype=bool)
+        occupied[5:10, 5:10] = True
+        changed_tiles = self.grid.update(40, 40, occupied)
+        self.assertEqual(changed_tiles, 1)
+        self.assertEqual(self.grid.log_odds[45, 45], 1.0)
+        self.assertEqual(self.grid.log_odds[40, 40], -0.5)
+        self.assertEqual(self.grid.log_odds[0, 0], 0.0)
+        self.assertEqual(self.grid.binary.count_nonzero(), 25)
+        self.assertEqual(self.grid[45, 45], 1)
+
+    def test_clamping_and_recovery(self):
+        occupied = np.ones((10, 10), dtype=bool)
+        for _ in range(10):
+            self.grid.update(0, 0, occupied)
+        self.assertEqual(self.grid.log_odds.max(), 2.0)
+        # A bad detection is cleared again after enough free observations
+        for _ in range(4):
+            self.grid.update(0, 0, ~occupied)
+        self.assertFalse(self.grid.log_odds[:10, :10].max() > 0)
+        self.assertEqual(self.grid.binary.count_nonzero(), 0)
+
+    def test_binary_view_matches_threshold_across_tiles(self):
+        rng = np.random.default_rng(3)
+        for _ in range(30):
+            x0, y0 = rng.integers(0, 100), rng.integers(0, 100)
+            self.grid.update(x0, y0, rng.random((40, 40)) < 0.3)
+        np.testing.assert_array_equal(np.asarray(self.grid.binary), self.grid.log_odds > 0)
+
+    def test_vision_observes_field_of_view(self):
+        config = Config()
+        grid = LogOddsGrid.from_config(config)
+        ComputerVision(config).detect_obstacles(None, grid, position=(125, 200))
+        self.assertEqual(grid[125, 110], 1)  # Inside the view
+        self.assertEqual(grid[625, 490], 0)  # Outside the view
+        self.assertEqual(grid.log_odds[700, 500], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
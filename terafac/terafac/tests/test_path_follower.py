@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from src.path_follower import PathFollower
+from src.path_planning import PathPlanner
+from src.instrumentation import Instrumentation
+from config.config import Config
+
+class TestPathFollower(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.MAP_SIZE = (100, 100)
+        self.follower = PathFollower(self.config, PathPlanner(self.config), Instrumentation())
+        self.obstacle_map = np.zeros(self.config.MAP_SIZE, dtype=np.uint8)
+
+    def test_follow_without_replanning(self):
+        waypoint = self.follower.next_waypoint((10, 10), (90, 10), self.obstacle_map, 0)
+        self.assertEqual(waypoint, (10 + self.config.STEP_SIZE, 10))
+        waypoint = self.follower.next_waypoint(waypoint, (90, 10), self.obstacle_map, 0)
+        self.assertEqual(waypoint, (10 + 2 * self.config.STEP_SIZE, 10))
+        self.assertEqual(self.follower.replans, 1)
+        self.assertEqual(self.follower.replans_avoided, 1)
+
+    def test_replan_when_path_blocked(self):
+        self.follower.next_waypoint((10, 10), (90, 10), self.obstacle_map, 0)
+        self.obstacle_map[60, 0:20] = 1
+        self.follower.next_waypoint((50, 10), (90, 10), self.obstacle_map, 1)
+        self.assertEqual(self.follower.replans, 2)
+        self.assertFalse(self.obstacle_map[self.follower.path[:, 0], self.follower.path[:, 1]].any())
+
+    def test_unrelated_map_change_keeps_plan(self):
+        self.follower.next_waypoint((10, 10), (90, 10), self.obstacle_map, 0)
+        self.obstacle_map[50, 80:90] = 1
+        self.follower.next_waypoint((50, 10), (90, 10), self.obstacle_map, 1)
+        self.assertEqual(self.follower.replans, 1)
+
+    def test_replan_on_deviation_and_failed_move(self):
+        self.follower.next_waypoint((10, 10), (90, 10), self.obstacle_map, 0)
+        self.follower.next_waypoint((30, 50), (90, 10), self.obstacle_map, 0)
+        self.follower.next_waypoint((30, 50), (90, 10), self.obstacle_map, 0, move_failed=True)
+        self.assertEqual(self.follower.replans, 3)
+
+if __name__ == '__main__':
+    unittest.main()
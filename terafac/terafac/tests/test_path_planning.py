@@ -1,6 +1,11 @@
 import unittest
 import numpy as np
+from src.computer_vision import ComputerVision
+from src.grid_search import GridGraph
 from src.path_planning import PathPlanner
+from src.tour_planning import downsample
+from src.visibility_graph import VisibilityGraphPlanner
+from src.world import World
 from config.config import Config
 
 class TestPathPlanner(unittest.TestCase):
@@ -29,5 +34,40 @@ class TestPathPlanner(unittest.TestCase):
         self.assertEqual(path[0], start)
         self.assertEqual(path[-1], goal)
 
+    def test_visibility_mode_without_world(self):
+        # With no world given, the visibility planner loads WORLD_FILE
+        self.config.PLANNER_MODE = "visibility"
+        world = World.load(self.config.WORLD_FILE)
+        obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+        path = self.path_planner.plan_path((30, 300), (770, 300), obstacle_map)
+        self.assertEqual((path[0], path[-1]), ((30, 300), (770, 300)))
+        cells = np.array(path)
+        self.assertFalse(obstacle_map[cells[:, 0], cells[:, 1]].any())
+
+    def test_apply_map_changes_matches_rebuild(self):
+        world = World.load(self.config.WORLD_FILE)
+        vision = ComputerVision(self.config, world)
+        obstacle_map = world.rasterize(np.zeros(world.size, dtype=np.uint8))
+        self.config.PLANNING_RESOLUTION = 4
+        planner = PathPlanner(self.config, world=world)
+        grid = planner.quantizer.planning_grid(obstacle_map, 0)
+        planner.grid_graph(grid, 0)
+        planner.plan_waypoints_visibility((30, 300), (770, 300))
+
+        recorded, regions = vision.apply_changes([
+            {"op": "add", "id": 21, "new": {"x": 380, "y": 380, "width": 41, "height": 40}},
+            {"op": "remove", "id": 9},
+            # Overlaps obstacle 0, whose cells must survive the move
+            {"op": "update", "id": 1, "new": {"x": 120, "y": 100, "width": 50, "height": 60}},
+        ], obstacle_map)
+        np.testing.assert_array_equal(obstacle_map, world.rasterize(np.zeros(world.size, dtype=np.uint8)))
+        planner.apply_map_changes(recorded, regions, obstacle_map, 0, 1)
+
+        np.testing.assert_array_equal(planner.quantizer.planning_grid(obstacle_map, 1), downsample(obstacle_map, 4))
+        rebuilt = GridGraph(downsample(obstacle_map, 4), self.config.DIAGONAL_MOVEMENT)
+        self.assertEqual(planner.grid_graph(grid, 1).blocked, rebuilt.blocked)
+        rebuilt_visibility = VisibilityGraphPlanner.from_world(world, self.config.ROBOT_RADIUS)
+        np.testing.assert_array_equal(planner.visibility.blocking, rebuilt_visibility.blocking)
+
 if __name__ == '__main__':
     unittest.main()
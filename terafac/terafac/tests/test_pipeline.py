@@ -0,0 +1,51 @@
+import time
+import unittest
+import numpy as np
+from src.autonomous_robot import AutonomousRobot
+from src.pipeline import PipelinedNavigator, Plan
+
+class FakeController:
+    """In-memory stand-in for RobotController."""
+    def __init__(self, position):
+        self.current_position = position
+        self.current_orientation = 0
+        self.collision_count = 0
+
+    def capture_image(self):
+        return np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get_robot_position(self):
+        return self.current_position + (self.current_orientation,)
+
+    def move_robot_relative(self, dx, dy):
+        self.current_position = (self.current_position[0] + dx, self.current_position[1] + dy)
+        return True
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+class TestPipelinedNavigator(unittest.TestCase):
+    def setUp(self):
+        self.robot = AutonomousRobot()
+        self.robot.config.MAP_SIZE = (100, 100)
+        self.robot.obstacle_map = np.zeros(self.robot.config.MAP_SIZE, dtype=np.uint8)
+        self.robot.robot_controller = FakeController((20, 20))
+        self.robot.goal_position = (60, 60)
+
+    def test_run_moves_towards_goal(self):
+        navigator = PipelinedNavigator(self.robot)
+        steps = navigator.run(max_steps=5)
+        self.assertEqual(steps, 5)
+        self.assertEqual(self.robot.robot_controller.current_position, (25, 25))
+        self.assertGreaterEqual(navigator.plan_generation, 1)
+
+    def test_stale_plan_is_rejected(self):
+        navigator = PipelinedNavigator(self.robot)
+        navigator.map_version = 1
+        navigator.plan = Plan([(20, 20), (21, 21)], 1, 0, 0)
+        self.assertIsNone(navigator.latest_waypoint((20, 20)))
+        navigator.plan.map_version = 1
+        self.assertEqual(navigator.latest_waypoint((20, 20)), (21, 21))
+
+if __name__ == '__main__':
+    unittest.main()
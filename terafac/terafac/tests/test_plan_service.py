@@ -0,0 +1,58 @@
+import threading
+import unittest
+from src.plan_service import Overloaded, PlanService
+
+class TestPlanService(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.service = PlanService(self.plan, workers=2, max_pending=3, cache_size=2)
+        self.addCleanup(self.release.set)
+
+    def plan(self, value):
+        self.calls.append(value)
+        self.release.wait(1)
+        if value < 0:
+            raise ValueError("negative")
+        return value * 2
+
+    def test_identical_queries_are_coalesced(self):
+        futures = [self.service.submit("a", 1) for _ in range(5)]
+        self.release.set()
+        self.assertEqual([f.result(1) for f in futures], [2] * 5)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(self.service.stats["coalesced"], 4)
+
+    def test_results_are_cached(self):
+        self.release.set()
+        self.service.submit("a", 1).result(1)
+        self.assertEqual(self.service.submit("a", 1).result(1), 2)
+        self.assertEqual((self.calls, self.service.stats["cache_hits"]), ([1], 1))
+        self.service.submit("b", 2).result(1)
+        self.service.submit("c", 3).result(1)
+        self.assertNotIn("a", self.service.cache)
+        self.service.clear()
+        self.assertEqual(len(self.service.cache), 0)
+
+    def test_full_queue_is_rejected(self):
+        futures = [self.service.submit(key, key) for key in range(3)]
+        with self.assertRaises(Overloaded) as raised:
+            self.service.submit(3, 3)
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+        # A query that is already in flight still joins it
+        self.assertIs(self.service.submit(0, 0), futures[0])
+        self.release.set()
+        self.assertEqual([f.result(1) for f in futures], [0, 2, 4])
+        self.assertEqual(self.service.pending(), 0)
+        self.assertEqual(self.service.stats["rejected"], 1)
+
+    def test_errors_are_not_cached(self):
+        self.release.set()
+        with self.assertRaises(ValueError):
+            self.service.submit("neg", -1).result(1)
+        with self.assertRaises(ValueError):
+            self.service.submit("neg", -1).result(1)
+        self.assertEqual(self.calls, [-1, -1])
+
+if __name__ == '__main__':
+    unittest.main()
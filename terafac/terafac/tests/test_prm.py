@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+import numpy as np
+from src.artifact_cache import ArtifactCache
+from src.kdtree import KDTree
+from src.prm import PRMPlanner, densify, segments_free
+from src.world import World
+from config.config import Config
+
+class TestKDTree(unittest.TestCase):
+    def test_query_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        points = rng.uniform(0, 500, (1000, 2))
+        tree = KDTree(points)
+        for query in rng.uniform(0, 500, (20, 2)):
+            distances, indices = tree.query(query, k=5)
+            expected = np.argsort(np.hypot(*(points - query).T))[:5]
+            np.testing.assert_array_equal(indices, expected)
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+
+    def test_max_distance_limits_results(self):
+        tree = KDTree([(0, 0), (10, 0), (100, 0)])
+        _, indices = tree.query((0, 0), k=3, max_distance=20)
+        self.assertEqual(sorted(indices.tolist()), [0, 1])
+
+class TestPRMPlanner(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8))
+        self.planner = PRMPlanner(self.config)
+        self.planner.build(self.obstacle_map)
+
+    def assert_collision_free(self, path, start, goal):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], goal)
+        cells = np.array(path)
+        self.assertFalse(self.obstacle_map[cells[:, 0], cells[:, 1]].any())
+        # Consecutive cells are neighbors, as the path follower expects
+        self.assertTrue(np.all(np.abs(np.diff(cells, axis=0)) <= 1))
+
+    def test_segments_free(self):
+        free = segments_free(self.obstacle_map, [(400, 300), (50, 110)], [(420, 300), (200, 110)])
+        self.assertEqual(free.tolist(), [True, False])
+
+    def test_plan_around_obstacles(self):
+        start, goal = (400, 300), (50, 50)
+        path = self.planner.plan(start, goal, self.obstacle_map)
+        self.assert_collision_free(path, start, goal)
+
+    def test_repeated_query_is_cached(self):
+        first = self.planner.plan((400, 300), (750, 550), self.obstacle_map)
+        again = self.planner.plan((400, 300), (750, 550), self.obstacle_map)
+        self.assertIs(first, again)
+        self.assertEqual(self.planner.last_expansions, 0)
+
+    def test_new_obstacle_disables_blocked_edges(self):
+        start, goal = (400, 300), (50, 50)
+        self.planner.plan(start, goal, self.obstacle_map, map_version=0)
+        self.obstacle_map[300:420, 150:260] = 1
+        path = self.planner.plan(start, goal, self.obstacle_map, map_version=1)
+        self.assert_collision_free(path, start, goal)
+
+    def test_roadmap_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ArtifactCache(directory, 1 << 30)
+            built = PRMPlanner(self.config, cache).build(self.obstacle_map, "world")
+            loaded = PRMPlanner(self.config, cache).build(self.obstacle_map, "world")
+            np.testing.assert_array_equal(built.indices, loaded.indices)
+            np.testing.assert_array_equal(built.points, loaded.points)
+
+    def test_densify(self):
+        self.assertEqual(densify([(0, 0), (3, 1)]), [(0, 0), (1, 0), (2, 1), (3, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
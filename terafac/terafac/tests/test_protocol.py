@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+import simulator
+from src import protocol
+from src.robot_controller import RobotController
+from src.transport import ReplayResponse
+
+class SimulatorTransport:
+    """Transport that calls the simulator app in-process through Flask's test client."""
+    def __init__(self):
+        self.client = simulator.app.test_client()
+        self.requests = []
+
+    def _wrap(self, response):
+        return ReplayResponse(response.status_code, response.data, dict(response.headers))
+
+    def get(self, path, params=None, headers=None):
+        self.requests.append(("GET", path))
+        return self._wrap(self.client.get(path, query_string=params, headers=headers))
+
+    def post(self, path, json=None, data=None, headers=None):
+        self.requests.append(("POST", path))
+        return self._wrap(self.client.post(path, json=json, data=data, headers=headers))
+
+    def sleep(self, seconds):
+        pass
+
+class TestProtocol(unittest.TestCase):
+    def setUp(self):
+        self.transport = SimulatorTransport()
+        self.transport.client.post('/reset')
+
+    def test_round_trip(self):
+        state = {"x": 410.5, "y": 300.25, "orientation": -90, "moving": True}
+        self.assertEqual(protocol.decode_pose(protocol.encode_pose(state)), state)
+        self.assertEqual(protocol.decode_move(protocol.encode_move(2.5, -1.0)), (2.5, -1.0))
+        self.assertEqual(protocol.decode_move_result(protocol.encode_move_result(False, state)), (False, state))
+        self.assertEqual(len(protocol.encode_move_result(True, state)), 12)
+
+    def test_simulator_negotiates_encoding(self):
+        client = self.transport.client
+        self.assertEqual(client.get('/position').get_json()["x"], 400)
+        response = client.get('/position', headers={"Accept": protocol.BINARY_MIME})
+        self.assertEqual(response.mimetype, protocol.BINARY_MIME)
+        self.assertEqual(protocol.decode_pose(response.data)["x"], 400)
+
+    def test_controller_uses_binary_messages(self):
+        controller = RobotController("http://unused", self.transport)
+        self.assertEqual(controller.get_robot_position(), (400.0, 300.0, 0))
+        self.assertTrue(controller.move_robot_relative(10, 0))
+        self.assertEqual(controller.current_position, (410.0, 300.0))
+        # Moving into the obstacle at x=450 is rejected and leaves the pose unchanged
+        self.assertFalse(controller.move_robot_relative(40, 0))
+        self.assertEqual(controller.current_position, (410.0, 300.0))
+        self.assertEqual(controller.collision_count, 1)
+        self.assertEqual(self.transport.requests, [("GET", "/position"), ("POST", "/move_rel"), ("POST", "/move_rel")])
+
+    def test_controller_falls_back_to_json(self):
+        transport = MagicMock()
+        json_headers = {"Content-Type": "application/json"}
+        transport.post.side_effect = [ReplayResponse(500, b'{"success": false}', json_headers),
+                                      ReplayResponse(200, b'{"success": true}', json_headers)]
+        transport.get.return_value = ReplayResponse(200, b'{"x": 1, "y": 2, "orientation": 0}', json_headers)
+        controller = RobotController("http://unused", transport)
+        self.assertTrue(controller.move_robot_relative(1, 2))
+        self.assertFalse(controller.binary)
+        self.assertEqual(transport.post.call_args.kwargs, {"json": {"dx": 1, "dy": 2}})
+        self.assertEqual(controller.current_position, (1, 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src.path_planning import PathPlanner
+from src.quantization import GridQuantizer
+from src.world import World
+from config.config import Config
+
+class TestGridQuantizer(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.config.MAP_SIZE = self.world.size
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8))
+
+    def test_round_trip_at_coarse_resolution(self):
+        quantizer = GridQuantizer(resolution=4)
+        grid = quantizer.planning_grid(self.obstacle_map)
+        self.assertEqual(grid.shape, (200, 150))
+        cell = quantizer.to_cell((401.7, 299.2), grid.shape)
+        self.assertEqual(cell, (100, 74))
+        self.assertEqual(quantizer.to_world(cell), (402, 298))
+
+    def test_snap_moves_blocked_goal_into_region(self):
+        quantizer = GridQuantizer(resolution=1, tolerance=10)
+        # Just inside the left edge of the obstacle at x=100..150, y=80..140
+        self.assertEqual(quantizer.snap((103.4, 110.2), self.obstacle_map), (99, 110))
+        self.assertIsNone(quantizer.snap((125, 110), self.obstacle_map))
+
+    def test_float_poses_plan_without_exhausting_the_map(self):
+        planner = PathPlanner(self.config)
+        path = planner.plan_path((400.4, 300.6), (420.2, 309.7), self.obstacle_map)
+        self.assertEqual(path[0], (400, 301))
+        self.assertEqual(path[-1], (420, 310))
+        self.assertLess(planner.last_expansions, 1000)
+
+    def test_coarse_resolution_plans_in_world_coordinates(self):
+        self.config.PLANNING_RESOLUTION = 5
+        planner = PathPlanner(self.config)
+        path = planner.plan_path((400.0, 300.0), (700.5, 500.5), self.obstacle_map)
+        cells = np.array(path)
+        self.assertLessEqual(np.abs(cells[-1] - (700, 500)).max(), 5)
+        self.assertFalse(self.obstacle_map[cells[:, 0], cells[:, 1]].any())
+        self.assertTrue(np.all(np.abs(np.diff(cells, axis=0)) <= 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src.raycast import cast_rays, ray_angles
+from src.computer_vision import ComputerVision
+from src.occupancy_grid import LogOddsGrid, OccupancyGrid
+from config.config import Config
+
+class TestRaycast(unittest.TestCase):
+    def setUp(self):
+        self.rects = np.array([[50, 0, 10, 100], [0, 70, 40, 5]], dtype=float)
+
+    def test_axis_aligned_rays(self):
+        distances = cast_rays((20, 20), ray_angles(4), self.rects, 100.0, bounds=(100, 100))
+        # Right hits the wall at x=50, down hits the bar at y=70, left and up hit the map edge
+        np.testing.assert_allclose(distances, [30, 50, 20, 20], atol=1e-4)
+
+    def test_max_range_and_inside(self):
+        distances = cast_rays((20, 20), ray_angles(4), self.rects, 10.0)
+        np.testing.assert_allclose(distances, [10, 10, 10, 10])
+        distances = cast_rays((55, 20), ray_angles(8), self.rects, 10.0)
+        np.testing.assert_allclose(distances, np.zeros(8))
+
+    def test_diagonal_ray(self):
+        rects = np.array([[30, 30, 10, 10]], dtype=float)
+        distance = cast_rays((0, 0), np.array([np.pi / 4]), rects, 100.0)[0]
+        self.assertAlmostEqual(distance, 30 * np.sqrt(2), places=3)
+
+    def test_integrate_scan(self):
+        config = Config()
+        config.MAP_SIZE = (100, 100)
+        vision = ComputerVision(config)
+        distances = cast_rays((20, 20), ray_angles(360), self.rects, 100.0)
+
+        grid = OccupancyGrid((100, 100), tile_size=32)
+        hits = vision.integrate_scan(grid, (20, 20), 100.0, distances)
+        self.assertGreater(hits, 0)
+        self.assertEqual(grid[50, 20], 1)
+
+        log_odds = LogOddsGrid((100, 100), tile_size=32)
+        vision.integrate_scan(log_odds, (20, 20), 100.0, distances)
+        self.assertEqual(log_odds[50, 20], 1)
+        self.assertLess(log_odds.log_odds[35, 20], 0)  # Seen free along the ray
+        self.assertEqual(log_odds.log_odds[80, 20], 0)  # Behind the wall, never observed
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from unittest.mock import patch, MagicMock
 from src.robot_controller import RobotController
 from config.config import Config
@@ -29,6 +30,19 @@ class TestRobotController(unittest.TestCase):
         position = self.robot_controller.get_robot_position()
         self.assertEqual(position, (100, 200, 90))
 
+    @patch('requests.get')
+    def test_scan(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = np.array([1.5, 300.0], dtype='<f4').tobytes()
+        mock_response.headers = {'X-Scan-Origin': '100,200', 'X-Scan-Max-Range': '300.0'}
+        mock_get.return_value = mock_response
+
+        origin, max_range, distances = self.robot_controller.scan(num_rays=2)
+        self.assertEqual(origin, (100.0, 200.0))
+        self.assertEqual(max_range, 300.0)
+        np.testing.assert_array_equal(distances, [1.5, 300.0])
+
     @patch('requests.post')
     @patch('requests.get')
     def test_move_robot_relative(self, mock_get, mock_post):
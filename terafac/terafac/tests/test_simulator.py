@@ -0,0 +1,185 @@
+import io
+import math
+import unittest
+import numpy as np
+import simulator
+from src.autonomous_robot import AutonomousRobot
+from src.robot_controller import RobotController
+from src.transport import ReplayResponse
+
+class ClientTransport:
+    """Transport that calls the simulator app in-process through Flask's test client."""
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, path, params=None, headers=None):
+        response = self.client.get(path, query_string=params, headers=headers)
+        return ReplayResponse(response.status_code, response.data, dict(response.headers))
+
+    def post(self, path, json=None, data=None, headers=None):
+        response = self.client.post(path, json=json, data=data, headers=headers)
+        return ReplayResponse(response.status_code, response.data, dict(response.headers))
+
+    def sleep(self, seconds):
+        pass
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.client = simulator.app.test_client()
+        self.client.post('/reset')
+
+    def test_metrics_json(self):
+        self.client.get('/position')
+        self.client.post('/move_rel', json={"dx": 10, "dy": 0})
+        data = self.client.get('/metrics').get_json()
+        self.assertGreaterEqual(data["routes"]["/position"]["count"], 1)
+        self.assertIn("200", data["routes"]["/move_rel"]["status"])
+        self.assertIn("movement_history_length", data["simulation"])
+        self.assertNotIn("/metrics", data["routes"])
+
+    def test_metrics_collision_rejections(self):
+        before = self.client.get('/metrics').get_json()["simulation"]["collision_rejections"]
+        self.client.post('/set_position', json={"x": 230, "y": 260})
+        response = self.client.post('/move_rel', json={"dx": 30, "dy": 0})
+        self.assertEqual(response.status_code, 400)
+        after = self.client.get('/metrics').get_json()["simulation"]["collision_rejections"]
+        self.assertEqual(after, before + 1)
+
+    def test_metrics_prometheus(self):
+        self.client.get('/position')
+        response = self.client.get('/metrics?format=prometheus')
+        text = response.get_data(as_text=True)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn('simulator_request_duration_seconds_count{route="/position"}', text)
+        self.assertIn('simulator_collision_rejections_total', text)
+
+    def test_index_renders_world(self):
+        html = self.client.get('/').get_data(as_text=True)
+        self.assertEqual(html.count('class="obstacle"'), len(simulator.obstacles))
+        self.assertIn('left: 250px; top: 220px; width: 50px; height: 80px;', html)
+
+    def test_scan(self):
+        self.client.post('/set_position', json={"x": 400, "y": 290})
+        response = self.client.get('/scan?rays=4&max_range=500')
+        self.assertEqual(response.content_type, 'application/octet-stream')
+        distances = np.frombuffer(response.data, dtype='<f4')
+        self.assertEqual(len(distances), 4)
+        self.assertEqual(response.headers['X-Scan-Origin'], '400,290')
+        # Looking right from the center the first obstacle starts at x=450
+        self.assertAlmostEqual(float(distances[0]), 50.0, places=3)
+        self.assertEqual(self.client.get('/scan?rays=0').status_code, 400)
+
+    def test_calculate_path_avoids_obstacles(self):
+        start, end = {"x": 40, "y": 400}, {"x": 760, "y": 150}
+        path = simulator.calculate_path(start, end)
+        points = [(start["x"], start["y"])] + [(p["x"], p["y"]) for p in path]
+        self.assertEqual(points[-1], (760, 150))
+        self.assertLessEqual(max(math.dist(a, b) for a, b in zip(points, points[1:])), simulator.NAVIGATION_STEP)
+        self.assertFalse(any(simulator.check_point_collision(x, y) for x, y in points))
+        self.assertTrue(all(20 <= x <= 780 and 20 <= y <= 580 for x, y in points))
+
+    def test_calculate_path_is_cached(self):
+        before = self.client.get('/metrics').get_json()["simulation"]["navigation_cache_hits"]
+        first = simulator.calculate_path({"x": 60.2, "y": 60}, {"x": 740, "y": 540})
+        second = simulator.calculate_path({"x": 60, "y": 59.8}, {"x": 740, "y": 540})
+        self.assertIs(first, second)
+        after = self.client.get('/metrics').get_json()["simulation"]["navigation_cache_hits"]
+        self.assertEqual(after, before + 1)
+
+    def test_plan_service(self):
+        route = {"start": {"x": 40, "y": 400}, "end": {"x": 760, "y": 150}}
+        response = self.client.post('/plan', json=route)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["path"], simulator.calculate_path(route["start"], route["end"]))
+        self.assertEqual(self.client.post('/plan', json={"start": {"x": 40}}).status_code, 400)
+        blocked = {"start": {"x": 40, "y": 400}, "end": {"x": 120, "y": 320}}
+        self.assertEqual(self.client.post('/plan', json=blocked).status_code, 400)
+
+        controller = RobotController("", transport=ClientTransport(self.client))
+        self.assertEqual(controller.plan_path((40, 400), (760, 150))[-1], (760, 150))
+
+        # With no room in the queue, new queries are turned away but cached ones are still answered
+        original = simulator.plan_service.max_pending
+        simulator.plan_service.max_pending = 0
+        self.addCleanup(setattr, simulator.plan_service, "max_pending", original)
+        response = self.client.post('/plan', json={"start": {"x": 41, "y": 400}, "end": {"x": 760, "y": 150}})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+        self.assertEqual(self.client.post('/plan', json=route).status_code, 200)
+        self.assertIsNone(controller.plan_path((42, 400), (760, 150)))
+        self.assertIn("plan_requests_rejected", self.client.get('/metrics').get_json()["simulation"])
+
+    def test_start_navigation_rejects_blocked_end(self):
+        response = self.client.post('/start_navigation', json={"start": {"x": 40, "y": 400}, "end": {"x": 120, "y": 320}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(simulator.navigation_jobs.active_threads(), 0)
+
+    def test_navigation_status_and_preemption(self):
+        route = {"start": {"x": 40, "y": 400}, "end": {"x": 760, "y": 150}}
+        first = self.client.post('/start_navigation', json=route).get_json()["job_id"]
+        second = self.client.post('/start_navigation', json=route).get_json()["job_id"]
+        self.assertEqual(self.client.get(f'/navigation_status?job_id={first}').get_json()["status"], "preempted")
+        status = self.client.get('/navigation_status').get_json()
+        self.assertEqual((status["job_id"], status["status"]), (second, "running"))
+        self.assertEqual(self.client.get('/metrics').get_json()["simulation"]["active_navigation_threads"], 1)
+        self.client.post('/stop_navigation')
+        self.assertEqual(self.client.get(f'/navigation_status?job_id={second}').get_json()["status"], "cancelled")
+        self.assertEqual(self.client.get('/navigation_status?job_id=999999').status_code, 404)
+
+    def test_trajectory_export(self):
+        start = simulator.trajectory.total
+        self.client.post('/move_rel', json={"dx": 10, "dy": 0})
+        self.client.post('/set_position', json={"x": 230, "y": 260})
+        self.client.post('/move_rel', json={"dx": 30, "dy": 0})
+        response = self.client.get(f'/trajectory?start={start}')
+        self.assertEqual(response.headers['X-Trajectory-Start'], str(start))
+        records = np.frombuffer(response.data, dtype=simulator.TRAJECTORY_DTYPE)
+        self.assertEqual(records["x"].tolist(), [410, 230, 230])
+        self.assertEqual(records["collision"].tolist(), [False, False, True])
+        npy = self.client.get(f'/trajectory?start={start}&stop={start + 1}&format=npy')
+        self.assertEqual(np.load(io.BytesIO(npy.data))["x"].tolist(), [410])
+        self.assertEqual(self.client.get('/trajectory?start=x').status_code, 400)
+
+    def test_obstacle_crud_and_change_feed(self):
+        version = self.client.get('/obstacles').get_json()["version"]
+        response = self.client.post('/obstacles', json={"x": 380, "y": 380, "width": 40, "height": 40})
+        self.assertEqual(response.status_code, 201)
+        obstacle_id = response.get_json()["id"]
+        self.addCleanup(self.client.delete, f'/obstacles/{obstacle_id}')
+        self.assertTrue(simulator.check_point_collision(400, 400))
+        # The navigation planner routes around the new obstacle right away
+        path = simulator.calculate_path({"x": 400, "y": 360}, {"x": 400, "y": 440})
+        self.assertFalse(any(simulator.check_point_collision(p["x"], p["y"]) for p in path))
+
+        self.client.put(f'/obstacles/{obstacle_id}', json={"x": 380, "y": 390, "width": 40, "height": 30})
+        feed = self.client.get(f'/obstacles/changes?since={version}').get_json()
+        self.assertEqual(feed["version"], version + 2)
+        self.assertEqual([(c["op"], c["id"]) for c in feed["changes"]], [("add", obstacle_id), ("update", obstacle_id)])
+        self.assertEqual(self.client.get(f'/obstacles/changes?since={version + 2}').get_json()["changes"], [])
+
+        self.assertEqual(self.client.put('/obstacles/999', json={"x": 1, "y": 1, "width": 1, "height": 1}).status_code, 404)
+        self.assertEqual(self.client.post('/obstacles', json={"x": 1, "y": 1, "width": 0, "height": 1}).status_code, 400)
+        self.assertEqual(self.client.get('/obstacles/changes?since=-5000').status_code, 410)
+
+    def test_robot_follows_change_feed(self):
+        robot = AutonomousRobot()
+        robot.obstacle_map = np.zeros(robot.config.MAP_SIZE, dtype=np.uint8)
+        robot.world.rasterize(robot.obstacle_map)
+        robot.robot_controller = RobotController("http://unused", ClientTransport(self.client))
+        robot.world.version = self.client.get('/obstacles').get_json()["version"]
+
+        obstacle_id = self.client.post('/obstacles', json={"x": 380, "y": 380, "width": 40, "height": 40}).get_json()["id"]
+        self.addCleanup(self.client.delete, f'/obstacles/{obstacle_id}')
+        self.assertEqual(robot.sync_world(), 1)
+        self.assertEqual((robot.map_version, robot.obstacle_map[400, 400]), (1, 1))
+
+        # Falling behind the change log falls back to the full obstacle list
+        self.client.delete(f'/obstacles/{obstacle_id}')
+        robot.world.version -= 5000
+        self.assertEqual(robot.sync_world(), 1)
+        self.assertEqual(robot.obstacle_map[400, 400], 0)
+        self.assertEqual(robot.world.version, self.client.get('/obstacles').get_json()["version"])
+        self.assertEqual(robot.sync_world(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
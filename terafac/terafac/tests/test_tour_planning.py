@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from src.tour_planning import TourPlanner, dijkstra, downsample, nearest_neighbor_tour, tour_length, two_opt
+from src.world import World
+from config.config import Config
+
+class TestTourPlanning(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8), inflate=8)
+        self.planner = TourPlanner(self.config)
+
+    def test_downsample_blocks_partially_covered_cells(self):
+        grid = np.zeros((10, 10), dtype=np.uint8)
+        grid[4, 4] = 1
+        coarse = downsample(grid, 5)
+        self.assertEqual(coarse.shape, (2, 2))
+        self.assertEqual(coarse.tolist(), [[True, False], [False, False]])
+
+    def test_dijkstra_distances(self):
+        grid = np.zeros((5, 5), dtype=bool)
+        grid[2, 0:4] = True
+        distance, parent = dijkstra(grid, (0, 0))
+        self.assertEqual(distance[0], 0.0)
+        # Through the gap at y=4: one diagonal in, 3 down, 2 across the gap, one diagonal out, 3 up;
+        # cutting the wall's end corner diagonally is not allowed
+        self.assertAlmostEqual(distance[4 * 5 + 0], 8 + 2 * np.sqrt(2), places=6)
+        self.assertEqual(parent[0], -1)
+
+    def test_two_opt_never_lengthens_tour(self):
+        rng = np.random.default_rng(3)
+        points = rng.uniform(0, 100, (30, 2))
+        matrix = np.hypot(*(points[:, None] - points[None, :]).transpose(2, 0, 1))
+        greedy = nearest_neighbor_tour(matrix)
+        improved = two_opt(greedy, matrix)
+        self.assertEqual(improved[0], 0)
+        self.assertEqual(sorted(improved), list(range(30)))
+        self.assertLessEqual(tour_length(improved, matrix), tour_length(greedy, matrix))
+
+    def test_distance_matrix_is_symmetric(self):
+        points = [(400, 300), (50, 50), (750, 550), (50, 550)]
+        matrix, _ = self.planner.distance_matrix(points, self.obstacle_map)
+        np.testing.assert_array_equal(matrix, matrix.T)
+        self.assertTrue(np.isfinite(matrix).all())
+
+    def test_tour_path_is_connected_and_collision_free(self):
+        goals = [(50, 50), (750, 550), (750, 50), (50, 550)]
+        order, path = self.planner.plan_tour((400, 300), goals, self.obstacle_map)
+        self.assertEqual(sorted(order), sorted(goals))
+        cells = np.array(path)
+        self.assertEqual(tuple(cells[0]), (400, 300))
+        self.assertEqual(tuple(cells[-1]), order[-1])
+        self.assertTrue(np.all(np.abs(np.diff(cells, axis=0)) <= 1))
+        self.assertFalse(self.obstacle_map[cells[:, 0], cells[:, 1]].any())
+
+    def test_float_start_pose(self):
+        # Poses decoded from the simulator are float32 values
+        order, path = self.planner.plan_tour((400.0, 299.6), [(50, 50), (750.2, 550)], self.obstacle_map)
+        self.assertEqual(sorted(order), [(50, 50), (750, 550)])
+        self.assertEqual(path[0], (400, 300))
+        self.assertTrue(np.all(np.abs(np.diff(np.array(path), axis=0)) <= 1))
+
+    def test_unreachable_goal_is_skipped(self):
+        o = self.world.obstacles[0]
+        order, _ = self.planner.plan_tour((400, 300), [(50, 50), (o["x"] + 5, o["y"] + 5)], self.obstacle_map)
+        self.assertEqual(order, [(50, 50)])
+
+if __name__ == '__main__':
+    unittest.main()
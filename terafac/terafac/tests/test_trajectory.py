@@ -0,0 +1,40 @@
+import io
+import unittest
+import numpy as np
+from src.trajectory import TRAJECTORY_DTYPE, TrajectoryRecorder, to_npy
+
+class TestTrajectoryRecorder(unittest.TestCase):
+    def test_ring_buffer_keeps_latest_records(self):
+        recorder = TrajectoryRecorder(capacity=4)
+        for i in range(6):
+            recorder.record(float(i), i, 2 * i, orientation=90, command="move_rel", collision=i == 5)
+        self.assertEqual((len(recorder), recorder.total, recorder.first), (4, 6, 2))
+        first, records = recorder.range()
+        self.assertEqual(first, 2)
+        self.assertEqual(records["x"].tolist(), [2, 3, 4, 5])
+        self.assertEqual(records["collision"].tolist(), [False, False, False, True])
+        self.assertTrue((records["command"] == 1).all())
+
+    def test_range_is_clamped_to_held_records(self):
+        recorder = TrajectoryRecorder(capacity=4)
+        for i in range(6):
+            recorder.record(float(i), i, 0)
+        first, records = recorder.range(0, 4)
+        self.assertEqual((first, records["x"].tolist()), (2, [2, 3]))
+        first, records = recorder.range(5, 100)
+        self.assertEqual((first, records["x"].tolist()), (5, [5]))
+        self.assertEqual(len(recorder.range(6)[1]), 0)
+
+    def test_exports_round_trip(self):
+        recorder = TrajectoryRecorder(capacity=8)
+        recorder.record(1.5, 10, 20, 45, "navigate")
+        _, records = recorder.range()
+        self.assertEqual(TRAJECTORY_DTYPE.itemsize, 20)
+        raw = np.frombuffer(records.tobytes(), dtype=TRAJECTORY_DTYPE)
+        loaded = np.load(io.BytesIO(to_npy(records)))
+        for restored in (raw, loaded):
+            self.assertEqual(restored[0]["t"], 1.5)
+            self.assertEqual((restored[0]["x"], restored[0]["y"], restored[0]["orientation"]), (10, 20, 45))
+
+if __name__ == '__main__':
+    unittest.main()
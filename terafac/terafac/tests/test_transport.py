@@ -0,0 +1,92 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src import autonomous_robot
+from src.robot_controller import RobotController
+from src.transport import HttpTransport, RecordingTransport, ReplayExhausted, ReplayTransport, read_log
+
+def fake_response(status_code, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+class FakeTransport:
+    """Answers like the simulator for a robot that starts at (100, 200)."""
+    def __init__(self):
+        self.slept = 0
+
+    def get(self, path, params=None, headers=None):
+        if path == "/position":
+            return fake_response(200, b'{"x": 100, "y": 200, "orientation": 90}')
+        if path == "/scan":
+            return fake_response(200, np.array([1.5, 300.0], dtype='<f4').tobytes(),
+                                 {'X-Scan-Origin': '100,200', 'X-Scan-Max-Range': '300.0'})
+        return fake_response(200, b"Camera image placeholder")
+
+    def post(self, path, json=None, data=None, headers=None):
+        return fake_response(400 if json["dx"] > 50 else 200, b'{}')
+
+    def sleep(self, seconds):
+        self.slept += seconds
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        handle, self.log_path = tempfile.mkstemp(suffix=".log")
+        os.close(handle)
+        self.addCleanup(os.remove, self.log_path)
+
+    def record_episode(self):
+        recorder = RecordingTransport(FakeTransport(), self.log_path)
+        controller = RobotController("http://unused", recorder, binary=False)
+        controller.get_robot_position()
+        controller.scan(num_rays=2)
+        controller.move_robot_relative(10, 0)
+        controller.move_robot_relative(60, 0)
+        controller.sleep(1)
+        recorder.close()
+
+    def test_log_frames(self):
+        self.record_episode()
+        frames = list(read_log(self.log_path))
+        self.assertEqual([(h["method"], h["path"]) for h, _ in frames],
+                         [("GET", "/position"), ("GET", "/scan"), ("POST", "/move_rel"),
+                          ("GET", "/position"), ("POST", "/move_rel")])
+        self.assertEqual(frames[1][0]["arguments"], {"rays": 2, "max_range": 300.0})
+        self.assertEqual(len(frames[1][1]), 8)
+
+    def test_replay_matches_recording(self):
+        self.record_episode()
+        controller = RobotController("http://unused", ReplayTransport(self.log_path), binary=False)
+        self.assertEqual(controller.get_robot_position(), (100, 200, 90))
+        origin, max_range, distances = controller.scan(num_rays=2)
+        self.assertEqual(origin, (100.0, 200.0))
+        np.testing.assert_array_equal(distances, [1.5, 300.0])
+        self.assertTrue(controller.move_robot_relative(10, 0))
+        self.assertFalse(controller.move_robot_relative(60, 0))
+        self.assertEqual(controller.collision_count, 1)
+        controller.sleep(10)  # Returns at once
+        with self.assertRaises(ReplayExhausted):
+            controller.capture_image()
+
+    def test_main_reports_end_of_replay(self):
+        self.record_episode()
+        output = io.StringIO()
+        with patch.object(autonomous_robot.Config, "ROBOT_REPLAY_PATH", self.log_path), \
+                contextlib.redirect_stdout(output):
+            autonomous_robot.main()
+        self.assertIn("Episode ended", output.getvalue())
+
+    @patch('requests.get')
+    def test_http_transport_uses_requests(self, mock_get):
+        mock_get.return_value = fake_response(200)
+        HttpTransport("http://sim:5000").get("/scan", params={"rays": 4})
+        mock_get.assert_called_once_with("http://sim:5000/scan", params={"rays": 4}, headers=None, timeout=5)
+
+if __name__ == '__main__':
+    unittest.main()
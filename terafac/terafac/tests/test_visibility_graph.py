@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from src.path_planning import PathPlanner
+from src.prm import densify
+from src.visibility_graph import VisibilityGraphPlanner, segments_blocked_count
+from src.world import World
+from config.config import Config
+
+class TestVisibilityGraph(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.world = World.load(self.config.WORLD_FILE)
+        self.planner = VisibilityGraphPlanner.from_world(self.world, self.config.ROBOT_RADIUS)
+
+    def test_blocked_count_allows_edges_and_corners(self):
+        rect = [(10, 10, 10, 10)]
+        starts = [(0, 0), (0, 10), (10, 0), (0, 20)]
+        ends = [(30, 30), (30, 10), (10, 30), (20, 0)]
+        self.assertEqual(segments_blocked_count(starts, ends, rect).tolist(), [1, 0, 0, 0])
+
+    def test_direct_path_when_visible(self):
+        self.assertEqual(self.planner.plan((400, 300), (420, 300)), [(400.0, 300.0), (420.0, 300.0)])
+
+    def test_path_is_collision_free_and_shorter_than_grid(self):
+        start, goal = (400, 300), (700, 500)
+        waypoints = self.planner.plan(start, goal)
+        self.assertEqual(waypoints[0], start)
+        self.assertEqual(waypoints[-1], goal)
+
+        # Every cell along the path keeps the robot clear of every obstacle
+        cells = np.array(densify([(int(round(x)), int(round(y))) for x, y in waypoints]))
+        radius = self.config.ROBOT_RADIUS
+        for o in self.world.obstacles:
+            overlap = ((cells[:, 0] - radius < o["x"] + o["width"]) & (cells[:, 0] + radius > o["x"]) &
+                       (cells[:, 1] - radius < o["y"] + o["height"]) & (cells[:, 1] + radius > o["y"]))
+            self.assertFalse(overlap.any())
+
+        inflated = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8), inflate=radius)
+        self.config.MAP_SIZE = self.world.size
+        grid_path = PathPlanner(self.config).plan_path_astar(start, goal, inflated)
+        length = np.hypot(*np.diff(np.array(waypoints), axis=0).T).sum()
+        grid_length = np.hypot(*np.diff(np.array(grid_path), axis=0).T).sum()
+        self.assertLessEqual(length, grid_length)
+
+    def test_goal_inside_obstacle_has_no_path(self):
+        o = self.world.obstacles[0]
+        self.assertEqual(self.planner.plan((400, 300), (o["x"] + 5, o["y"] + 5)), [])
+
+    def test_incremental_changes_match_rebuild(self):
+        world = self.world
+        changes = [
+            world.apply_change({"op": "add", "id": world.next_id, "new": {"x": 380, "y": 380, "width": 40, "height": 40}}),
+            world.apply_change({"op": "update", "id": 3, "new": {"x": 100, "y": 500, "width": 30, "height": 30}}),
+            world.apply_change({"op": "remove", "id": 8}),
+        ]
+        for change in changes:
+            self.planner.apply_change(change)
+        rebuilt = VisibilityGraphPlanner.from_world(world, self.config.ROBOT_RADIUS)
+        np.testing.assert_array_equal(self.planner.blocking, rebuilt.blocking)
+        np.testing.assert_array_equal(self.planner.active, rebuilt.active)
+        np.testing.assert_allclose(self.planner.lengths, rebuilt.lengths)
+        self.assertEqual(self.planner.plan((30, 300), (770, 300)), rebuilt.plan((30, 300), (770, 300)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.world import World
+from src.world_generator import random_rectangles, maze, warehouse
+from config.config import Config
+
+def start_is_free(world, radius=8):
+    x, y = world.start
+    rects = world.obstacle_array()
+    return not np.any((x + radius > rects[:, 0]) & (x - radius < rects[:, 0] + rects[:, 2]) &
+                      (y + radius > rects[:, 1]) & (y - radius < rects[:, 1] + rects[:, 3]))
+
+class TestWorld(unittest.TestCase):
+    def setUp(self):
+        self.world = World.load(Config.WORLD_FILE)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_default_world(self):
+        self.assertEqual(self.world.size, (800, 600))
+        self.assertEqual(len(self.world.obstacles), 21)
+        self.assertIn((275, 260), self.world.centers())
+
+    def test_round_trip(self):
+        for name in ("world.json", "world.bin"):
+            path = os.path.join(self.tmpdir.name, name)
+            self.world.save(path)
+            loaded = World.load(path)
+            self.assertEqual(loaded.size, self.world.size)
+            self.assertEqual(loaded.start, self.world.start)
+            self.assertEqual(loaded.obstacles, self.world.obstacles)
+
+    def test_generated_worlds_round_trip(self):
+        for generate in (random_rectangles, maze, warehouse):
+            kwargs = {"count": 50} if generate is random_rectangles else {}
+            world = generate((1000, 800), seed=3, **kwargs)
+            for name in ("generated.json", "generated.bin"):
+                path = os.path.join(self.tmpdir.name, name)
+                world.save(path)
+                loaded = World.load(path)
+                self.assertEqual(loaded.start, world.start)
+                self.assertEqual(loaded.obstacles, world.obstacles)
+
+    def test_rasterize(self):
+        obstacle_map = self.world.rasterize(np.zeros(self.world.size, dtype=np.uint8))
+        self.assertEqual(obstacle_map.sum(), sum(o["width"] * o["height"] for o in self.world.obstacles))
+        self.assertEqual(obstacle_map[250, 220], 1)
+        self.assertEqual(obstacle_map[249, 220], 0)
+
+    def test_generators_are_seeded(self):
+        for generate in (random_rectangles, maze, warehouse):
+            kwargs = {"count": 300} if generate is random_rectangles else {}
+            first = generate((1200, 900), seed=5, **kwargs)
+            second = generate((1200, 900), seed=5, **kwargs)
+            self.assertEqual(first.obstacles, second.obstacles)
+            self.assertGreater(len(first.obstacles), 10)
+            self.assertTrue(start_is_free(first), generate.__name__)
+        self.assertNotEqual(maze((400, 400), seed=1).obstacles, maze((400, 400), seed=2).obstacles)
+
+    def test_obstacle_changes(self):
+        world = self.world
+        new_id = world.add_obstacle({"x": 380, "y": 380, "width": 40, "height": 40})
+        world.update_obstacle(0, {"x": 90, "y": 70, "width": 50, "height": 60})
+        world.remove_obstacle(5)
+        self.assertEqual((new_id, world.version, len(world.obstacles)), (21, 3, 21))
+        self.assertEqual(world.ids[-1], 21)
+        self.assertNotIn(5, world.ids)
+        self.assertEqual([c["op"] for c in world.changes_since(1)], ["update", "remove"])
+        self.assertEqual(world.changes_since(3), [])
+        self.assertEqual(world.changes_since(0)[2]["old"], {"x": 650, "y": 80, "width": 50, "height": 60})
+        with self.assertRaises(KeyError):
+            world.remove_obstacle(5)
+
+        # A replica that applies the feed ends up with the same obstacles
+        replica = World.load(Config.WORLD_FILE)
+        for change in world.changes_since(0):
+            replica.apply_change(change)
+        self.assertEqual((replica.ids, replica.obstacles, replica.version), (world.ids, world.obstacles, 3))
+
+        # Catching up from a snapshot when the log is gone
+        behind = World.load(Config.WORLD_FILE)
+        snapshot = [dict(o, id=i) for i, o in zip(world.ids, world.obstacles)]
+        for change in behind.changes_to(snapshot, world.version):
+            behind.apply_change(change)
+        self.assertEqual(sorted(zip(behind.ids, map(str, behind.obstacles))), sorted(zip(world.ids, map(str, world.obstacles))))
+        self.assertEqual(behind.version, 3)
+
+    def test_change_log_is_bounded(self):
+        world = World((100, 100), [])
+        world.CHANGE_LOG_SIZE = 4
+        world.changes = type(world.changes)(maxlen=4)
+        for i in range(6):
+            world.add_obstacle({"x": i, "y": 0, "width": 1, "height": 1})
+        self.assertIsNone(world.changes_since(1))
+        self.assertEqual([c["version"] for c in world.changes_since(2)], [3, 4, 5, 6])
+
+if __name__ == '__main__':
+    unittest.main()